@@ -0,0 +1,135 @@
+"""
+Benchmark - A*开放表
+对比旧版AStarPathfinder（每次降低g值都heapify整个开放表，每格一个Node对象）
+与当前实现（整数格子编号 + 扁平数组 + 惰性删除堆），
+200x200、约35%随机障碍的地图上随机起终点，比较耗时并确认路径代价一致
+
+用法:
+    python benchmarks/bench_astar_heap.py [--queries 60] [--density 0.35]
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from core.pathfinder import AStarPathfinder
+
+MAP_SIZE = 200
+
+
+@dataclass
+class Node:
+    """旧版A*节点"""
+    x: int
+    y: int
+    g: float = 0
+    h: float = 0
+    parent: Optional['Node'] = None
+
+    @property
+    def f(self) -> float:
+        return self.g + self.h
+
+    def __lt__(self, other):
+        return self.f < other.f
+
+
+class LegacyAStarPathfinder(AStarPathfinder):
+    """旧版：Node对象 + 降低g值时heapify"""
+
+    def find_path(self, start_x, start_y, end_x, end_y):
+        start = Node(int(start_x), int(start_y))
+        end = Node(int(end_x), int(end_y))
+        if not self.is_walkable(end.x, end.y):
+            nearest = self._find_nearest_walkable(end.x, end.y)
+            if nearest is None:
+                return []
+            end = Node(*nearest)
+
+        open_set = [start]
+        closed_set = set()
+        open_dict = {(start.x, start.y): start}
+        while open_set:
+            current = heapq.heappop(open_set)
+            if current.x == end.x and current.y == end.y:
+                path = []
+                while current:
+                    path.append((current.x, current.y))
+                    current = current.parent
+                return path[::-1]
+            closed_set.add((current.x, current.y))
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1),
+                           (-1, -1), (-1, 1), (1, -1), (1, 1)]:
+                nx, ny = current.x + dx, current.y + dy
+                if (nx, ny) in closed_set or not self.is_walkable(nx, ny):
+                    continue
+                if abs(dx) == 1 and abs(dy) == 1:
+                    if not self.is_walkable(current.x + dx, current.y) or \
+                       not self.is_walkable(current.x, current.y + dy):
+                        continue
+                new_g = current.g + (1.414 if abs(dx) == 1 and abs(dy) == 1 else 1.0)
+                neighbor = open_dict.get((nx, ny))
+                if neighbor is None:
+                    neighbor = Node(nx, ny, new_g, self.heuristic(nx, ny, end.x, end.y), current)
+                    heapq.heappush(open_set, neighbor)
+                    open_dict[(nx, ny)] = neighbor
+                elif new_g < neighbor.g:
+                    neighbor.g = new_g
+                    neighbor.parent = current
+                    heapq.heapify(open_set)
+        return []
+
+
+def path_cost(path):
+    return sum(1.414 if x0 != x1 and y0 != y1 else 1.0
+               for (x0, y0), (x1, y1) in zip(path, path[1:]))
+
+
+def run(pathfinder, queries):
+    paths = []
+    start = time.perf_counter()
+    for (sx, sy), (ex, ey) in queries:
+        paths.append(pathfinder.find_path(sx, sy, ex, ey))
+    return paths, (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--queries', type=int, default=60)
+    parser.add_argument('--density', type=float, default=0.35)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    obstacles = [(x, y) for x in range(MAP_SIZE) for y in range(MAP_SIZE)
+                 if rng.random() < args.density]
+    blocked = set(obstacles)
+    free = [(x, y) for x in range(MAP_SIZE) for y in range(MAP_SIZE) if (x, y) not in blocked]
+    queries = [(rng.choice(free), rng.choice(free)) for _ in range(args.queries)]
+
+    legacy = LegacyAStarPathfinder(MAP_SIZE, MAP_SIZE)
+    current = AStarPathfinder(MAP_SIZE, MAP_SIZE)
+    legacy.set_obstacles(obstacles)
+    current.set_obstacles(obstacles)
+
+    print(f"A*开放表基准: {MAP_SIZE}x{MAP_SIZE}, 障碍密度{args.density:.0%}, {args.queries} 次查询")
+    print("=" * 60)
+    legacy_paths, legacy_ms = run(legacy, queries)
+    current_paths, current_ms = run(current, queries)
+    found = sum(1 for p in current_paths if p)
+    mismatched = sum(1 for a, b in zip(legacy_paths, current_paths)
+                     if bool(a) != bool(b) or abs(path_cost(a) - path_cost(b)) > 1e-6)
+    print(f"旧版(heapify)   : {legacy_ms:>8.2f} ms/次")
+    print(f"惰性删除堆      : {current_ms:>8.2f} ms/次  ({legacy_ms / current_ms:.1f}x)")
+    print(f"找到路径 {found}/{len(queries)}, 代价不一致 {mismatched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark - 视野裁剪
+对比旧版get_render_chunks（固定32px、多一行一列）与culling模块：
+每帧返回的区块数、blit次数和裁剪耗时，覆盖多个缩放级别
+
+用法:
+    python benchmarks/bench_culling.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_manager import CHUNK_SIZE
+from core.culling import chunk_tile_rect, visible_chunk_coords
+
+SCREEN = (1400, 900)
+TILE_SIZE = 32
+ZOOMS = (2.0, 1.0, 0.5, 0.3, 0.1)
+
+
+def legacy_chunk_coords(camera_x, camera_y, screen_width, screen_height):
+    """旧版get_render_chunks的区块范围（忽略缩放）"""
+    start_cx = int(camera_x // (CHUNK_SIZE * 32))
+    end_cx = int((camera_x + screen_width) // (CHUNK_SIZE * 32)) + 1
+    start_cy = int(camera_y // (CHUNK_SIZE * 32))
+    end_cy = int((camera_y + screen_height) // (CHUNK_SIZE * 32)) + 1
+    return [(cx, cy) for cx in range(start_cx, end_cx + 1)
+            for cy in range(start_cy, end_cy + 1)]
+
+
+def legacy_tile_blits(coords, camera_x, camera_y, screen_width, screen_height):
+    """旧版render_world逐瓦片判断后实际执行的blit次数"""
+    blits = 0
+    for cx, cy in coords:
+        chunk_px = cx * CHUNK_SIZE * TILE_SIZE - int(camera_x)
+        chunk_py = cy * CHUNK_SIZE * TILE_SIZE - int(camera_y)
+        for y in range(CHUNK_SIZE):
+            pixel_y = chunk_py + y * TILE_SIZE
+            if not -TILE_SIZE < pixel_y < screen_height + TILE_SIZE:
+                continue
+            for x in range(CHUNK_SIZE):
+                pixel_x = chunk_px + x * TILE_SIZE
+                if -TILE_SIZE < pixel_x < screen_width + TILE_SIZE:
+                    blits += 1
+    return blits
+
+
+def time_per_call(func, *args, repeats: int = 2000) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(*args)
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    camera = (12345.0, 6789.0)
+    w, h = SCREEN
+    print(f"视野裁剪基准 屏幕{w}x{h} 相机{camera}")
+    print("=" * 72)
+    print(f"{'zoom':>6} | {'旧:区块':>7} {'旧:瓦片blit':>11} | {'新:区块':>7} {'新:可见瓦片':>11} {'新:blit':>7} | {'裁剪µs':>7}")
+
+    for zoom in ZOOMS:
+        legacy = legacy_chunk_coords(camera[0], camera[1], w, h)
+        legacy_blits = legacy_tile_blits(legacy, camera[0], camera[1], w, h)
+
+        coords = visible_chunk_coords(camera[0], camera[1], w, h, zoom, TILE_SIZE)
+        visible_tiles = 0
+        for cx, cy in coords:
+            _, _, tw, th = chunk_tile_rect(cx, cy, camera[0], camera[1], w, h, zoom, TILE_SIZE)
+            visible_tiles += tw * th
+
+        cull_us = time_per_call(visible_chunk_coords, camera[0], camera[1], w, h, zoom, TILE_SIZE)
+        print(f"{zoom:>6.1f} | {len(legacy):>7} {legacy_blits:>11} | {len(coords):>7} "
+              f"{visible_tiles:>11} {len(coords):>7} | {cull_us:>7.2f}")
+
+    print("旧版不随缩放变化（zoom<1时漏画，zoom>1时多画），新版每个区块一次blit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark - 跳点搜索
+在seed=42的区块地形上对比逐格A*与跳点搜索（JPS）：
+每次寻路的节点展开数、耗时、成功率和路径代价（相对A*）
+CollisionPathfinder关闭路径缓存测纯搜索；AStarPathfinder用同一片地形的不可行走格作为障碍
+
+用法:
+    python benchmarks/bench_jps.py [--samples 40]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from core.chunk_manager import ChunkManager
+from core.collision_pathfinder import CollisionPathfinder
+from core.pathfinder import AStarPathfinder
+
+# (最小距离, 最大距离, max_distance)
+BANDS = ((10, 30, 50), (30, 60, 100), (60, 120, 200))
+WORLD_RADIUS = 120
+GRID_SIZE = 2 * WORLD_RADIUS
+
+
+def sample_pairs(chunk_manager, rng, low, high, count):
+    def walkable_point():
+        while True:
+            x = rng.randint(-WORLD_RADIUS, WORLD_RADIUS - 1)
+            y = rng.randint(-WORLD_RADIUS, WORLD_RADIUS - 1)
+            if chunk_manager.is_walkable(x, y):
+                return x, y
+
+    pairs = []
+    while len(pairs) < count:
+        a, b = walkable_point(), walkable_point()
+        if low <= max(abs(a[0] - b[0]), abs(a[1] - b[1])) < high:
+            pairs.append((a, b))
+    return pairs
+
+
+def step_cost(path, extra=lambda x, y: 0.0):
+    cost = 0.0
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        cost += (1.414 if x0 != x1 and y0 != y1 else 1.0) + extra(x1, y1)
+    return cost
+
+
+def run(pathfinder, pairs, **kwargs):
+    """返回 (路径列表, 平均耗时ms, 平均展开数)"""
+    paths, elapsed, expansions = [], 0.0, 0
+    for (sx, sy), (ex, ey) in pairs:
+        start = time.perf_counter()
+        paths.append(pathfinder.find_path(sx, sy, ex, ey, **kwargs))
+        elapsed += time.perf_counter() - start
+        expansions += pathfinder.last_expansions
+    return paths, elapsed * 1000 / len(pairs), expansions / len(pairs)
+
+
+def report(label, astar, jps, cost):
+    (a_paths, a_ms, a_exp), (j_paths, j_ms, j_exp) = astar, jps
+    found = sum(1 for p in a_paths if len(p) > 1)
+    ratios = [cost(j) / cost(a) for a, j in zip(a_paths, j_paths) if len(a) > 1 and len(j) > 1]
+    ratio = sum(ratios) / len(ratios) if ratios else float('nan')
+    print(f"{label:>9} | {a_exp:>8.0f} {a_ms:>8.2f} | {j_exp:>8.0f} {j_ms:>8.2f} | "
+          f"{a_exp / max(j_exp, 1):>6.1f}x {a_ms / j_ms:>6.1f}x | {found:>4} {ratio:>8.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--samples', type=int, default=40)
+    args = parser.parse_args()
+
+    chunk_manager = ChunkManager(seed=42)
+    rng = random.Random(11)
+    bands = [(low, high, limit, sample_pairs(chunk_manager, rng, low, high, args.samples))
+             for low, high, limit in BANDS]
+
+    header = (f"{'距离':>9} | {'A*展开':>8} {'A* ms':>8} | {'JPS展开':>8} {'JPS ms':>8} | "
+              f"{'展开比':>7} {'加速':>7} | {'成功':>4} {'代价比':>8}")
+
+    print(f"CollisionPathfinder（近水加价，无缓存，seed=42）")
+    print("=" * 84)
+    print(header)
+    astar = CollisionPathfinder(chunk_manager, use_cache=False)
+    jps = CollisionPathfinder(chunk_manager, use_cache=False, mode='jps')
+    near_water = lambda x, y: 0.5 if chunk_manager.is_near_water(x, y) else 0.0
+    for low, high, limit, pairs in bands:
+        report(f"{low}-{high}", run(astar, pairs, max_distance=limit),
+               run(jps, pairs, max_distance=limit), lambda p: step_cost(p, near_water))
+
+    # 同一片地形转成AStarPathfinder的均匀代价网格（坐标平移到非负）
+    print()
+    print(f"AStarPathfinder（均匀代价，{GRID_SIZE}x{GRID_SIZE}地形网格）")
+    print("=" * 84)
+    print(header)
+    obstacles = [(x + WORLD_RADIUS, y + WORLD_RADIUS)
+                 for x in range(-WORLD_RADIUS, WORLD_RADIUS)
+                 for y in range(-WORLD_RADIUS, WORLD_RADIUS)
+                 if not chunk_manager.is_walkable(x, y)]
+    grid_astar = AStarPathfinder(GRID_SIZE, GRID_SIZE)
+    grid_jps = AStarPathfinder(GRID_SIZE, GRID_SIZE, mode='jps')
+    grid_astar.set_obstacles(obstacles)
+    grid_jps.set_obstacles(obstacles)
+    for low, high, _, pairs in bands:
+        shifted = [((sx + WORLD_RADIUS, sy + WORLD_RADIUS), (ex + WORLD_RADIUS, ey + WORLD_RADIUS))
+                   for (sx, sy), (ex, ey) in pairs]
+        report(f"{low}-{high}", run(grid_astar, shifted), run(grid_jps, shifted), step_cost)
+
+
+if __name__ == "__main__":
+    main()
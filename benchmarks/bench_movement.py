@@ -0,0 +1,100 @@
+"""
+Benchmark - 批量平滑移动
+N个AI沿随机路径行走，对比逐个SmoothMovement.update + chunk_manager.is_walkable
+与MovementSystem.step（向量化推进 + 按区块批量检查可行走）的每帧耗时，
+以及设置路径（Catmull-Rom平滑）的单次耗时；同时确认两者每帧位置逐位相同
+
+用法:
+    python benchmarks/bench_movement.py [--frames 60]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from core.chunk_manager import ChunkManager
+from core.movement_system import MovementSystem
+from core.pathfinder import SmoothMovement
+
+AGENT_COUNTS = (100, 1000, 10000)
+DT = 1.0 / 60
+
+
+def random_path(rng, length=40):
+    x, y = rng.randint(-150, 150), rng.randint(-150, 150)
+    path = [(x, y)]
+    for _ in range(length - 1):
+        x += rng.choice((-1, 0, 1))
+        y += rng.choice((-1, 0, 1))
+        path.append((x, y))
+    return path
+
+
+def run(count, frames, chunk_manager):
+    rng = random.Random(count)
+    paths = [random_path(rng) for _ in range(count)]
+    starts = [(p[0][0] + 0.5, p[0][1] + 0.5) for p in paths]
+
+    # 设置路径
+    scalar = [SmoothMovement(speed=2.5) for _ in range(count)]
+    start = time.perf_counter()
+    for movement, path, pos in zip(scalar, paths, starts):
+        movement.set_path(path, pos)
+    scalar_set_us = (time.perf_counter() - start) * 1e6 / count
+
+    system = MovementSystem()
+    views = [system.add(None, speed=2.5) for _ in range(count)]
+    start = time.perf_counter()
+    for view, path, pos in zip(views, paths, starts):
+        view.set_path(path, pos)
+    batch_set_us = (time.perf_counter() - start) * 1e6 / count
+
+    # 每帧推进
+    scalar_time = batch_time = 0.0
+    mismatched = 0
+    for _ in range(frames):
+        start = time.perf_counter()
+        scalar_pos = []
+        for movement in scalar:
+            if movement.is_moving:
+                x, y = movement.update(DT)
+                scalar_pos.append((x, y, chunk_manager.is_walkable(x, y)))
+        scalar_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for view in views:
+            if view.is_moving:
+                view.request()
+        slots, positions, walkable = system.step(DT, chunk_manager)
+        batch_time += time.perf_counter() - start
+
+        batch_pos = [(x, y, ok) for (x, y), ok in zip(positions.tolist(), walkable.tolist())]
+        mismatched += scalar_pos != batch_pos
+
+    scalar_ms = scalar_time * 1000 / frames
+    batch_ms = batch_time * 1000 / frames
+    print(f"{count:>6} | {scalar_set_us:>8.1f} {batch_set_us:>8.1f} | {scalar_ms:>8.2f} {batch_ms:>8.2f} "
+          f"{scalar_ms / batch_ms:>6.1f}x | {mismatched:>4}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=60)
+    args = parser.parse_args()
+
+    chunk_manager = ChunkManager(seed=42)
+    print(f"批量平滑移动基准: 每条路径40格, {args.frames} 帧")
+    print("=" * 70)
+    print(f"{'AI数':>6} | {'设路径us':>8} {'批量us':>8} | {'逐个ms':>8} {'批量ms':>8} {'加速':>7} | "
+          f"{'不一致帧':>4}")
+    for count in AGENT_COUNTS:
+        run(count, args.frames, chunk_manager)
+
+
+if __name__ == "__main__":
+    main()
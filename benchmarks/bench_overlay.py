@@ -0,0 +1,85 @@
+"""
+Benchmark - 日夜/季节叠加层
+旧实现每帧新建一张整屏SRCALPHA Surface并fill（日夜一张、季节一张）；
+OverlayCache把各层合成为一个颜色，按颜色缓存整屏Surface，每帧一次blit。
+同时检查24个小时 x 4个季节下缓存结果与逐层绘制的最大像素差
+
+用法:
+    python benchmarks/bench_overlay.py [--frames 600] [--width 1400] [--height 900]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from core.event_manager import Season
+from core.overlay_cache import OverlayCache, day_night_color, season_tint
+
+
+def legacy_overlays(screen, hour, season):
+    """旧实现：每层每帧新建整屏SRCALPHA Surface"""
+    for color in (day_night_color(hour), season_tint(season, hour)):
+        if color[3] > 0:
+            overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            overlay.fill(color)
+            screen.blit(overlay, (0, 0))
+
+
+def timed(frames, draw, screen):
+    start = time.perf_counter()
+    for frame in range(frames):
+        screen.fill((60, 120, 60))
+        # 一帧推进约1分钟游戏时间
+        draw(screen, (8 + frame / 60) % 24)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def max_pixel_diff(screen):
+    cache = OverlayCache(max_surfaces=4)
+    worst = 0
+    for season in Season:
+        for hour in range(24):
+            shots = []
+            for draw in (lambda: legacy_overlays(screen, hour, season),
+                         lambda: cache.render(screen, hour, season)):
+                screen.fill((60, 120, 60))
+                draw()
+                shots.append(pygame.surfarray.array3d(screen).astype(int))
+            worst = max(worst, int(np.abs(shots[0] - shots[1]).max()))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--width', type=int, default=1400)
+    parser.add_argument('--height', type=int, default=900)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    season = Season.AUTUMN
+    cache = OverlayCache()
+
+    rows = [
+        ("每帧新建", timed(args.frames, lambda s, h: legacy_overlays(s, int(h), season), screen)),
+        ("缓存", timed(args.frames, lambda s, h: cache.render(s, h, season), screen)),
+        ("缓存+平滑过渡", timed(args.frames, lambda s, h: cache.render(s, h, season, smooth=True),
+                              screen)),
+    ]
+    print(f"{args.width}x{args.height}, 日夜+季节两层, {args.frames} 帧:")
+    for name, ms in rows:
+        print(f"  {name:<10}: {ms:>7.3f} ms/帧  ({rows[0][1] / ms:.1f}x)")
+    print(f"  缓存统计: {cache.get_stats()}")
+    print(f"  24小时 x 4季节 与逐层绘制的最大像素差: {max_pixel_diff(screen)}")
+
+
+if __name__ == "__main__":
+    main()
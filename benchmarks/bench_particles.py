@@ -0,0 +1,192 @@
+"""
+Benchmark - 粒子系统
+对比旧的逐个对象粒子（每帧重建列表、每个半透明粒子新建一个SRCALPHA Surface）与
+数组化ParticleEngine（整批更新、swap-remove、预渲染精灵 + Surface.blits）：
+暴雨/大雾天气粒子，以及大量角色走路扬起的尘土
+
+用法:
+    python benchmarks/bench_particles.py [--frames 300] [--walkers 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+
+from core.animation import AnimationManager
+
+try:
+    from core.living_world import Weather
+    from effects.particles import WeatherParticles
+except ImportError as e:  # living_world依赖AI后端（aiohttp等）
+    Weather = WeatherParticles = None
+    WEATHER_IMPORT_ERROR = e
+
+SCREEN_SIZE = (1400, 900)
+
+
+# ----------------------------------------------------------------------
+# 旧实现（改写前的逐对象粒子）
+# ----------------------------------------------------------------------
+@dataclass
+class LegacyParticle:
+    x: float
+    y: float
+    vx: float
+    vy: float
+    life: float
+    max_life: float
+    color: Tuple[int, int, int]
+    size: float
+
+
+class LegacyWeather(WeatherParticles or object):
+    """旧的天气粒子：生成与参数同新版，更新和绘制按对象逐个进行"""
+
+    def __init__(self, width, height, rng):
+        super().__init__(width, height, rng=rng)
+        self.objects = []
+
+    def update(self, weather, intensity):
+        rng = self.rng
+        for _ in range(self._get_spawn_count(weather, intensity)):
+            if weather == Weather.STORMY:
+                life = rng.randint(20, 40)
+                self.objects.append(LegacyParticle(
+                    rng.randint(-100, self.screen_width + 100) + self.camera_x, -50 + self.camera_y,
+                    -5 + rng.uniform(-2, 2), 20 + rng.uniform(0, 10), life, life, (100, 100, 150), 3))
+            elif weather == Weather.FOGGY:
+                life = rng.randint(200, 400)
+                self.objects.append(LegacyParticle(
+                    rng.randint(0, self.screen_width) + self.camera_x,
+                    rng.randint(0, self.screen_height) + self.camera_y,
+                    rng.uniform(-0.5, 0.5), rng.uniform(-0.5, 0.5), life, life,
+                    (200, 200, 200), rng.uniform(20, 50)))
+        for p in self.objects:
+            p.x += p.vx
+            p.y += p.vy
+            p.life -= 1
+        self.objects = [p for p in self.objects if p.life > 0]
+
+    def render(self, screen):
+        for p in self.objects:
+            sx, sy = int(p.x - self.camera_x), int(p.y - self.camera_y)
+            if -50 < sx < self.screen_width + 50 and -50 < sy < self.screen_height + 50:
+                alpha = int(255 * p.life / p.max_life)
+                if p.size < 5:
+                    pygame.draw.circle(screen, p.color, (sx, sy), int(p.size))
+                else:
+                    s = pygame.Surface((int(p.size * 2), int(p.size * 2)), pygame.SRCALPHA)
+                    pygame.draw.circle(s, (*p.color, alpha // 3), (int(p.size), int(p.size)),
+                                       int(p.size))
+                    screen.blit(s, (sx - int(p.size), sy - int(p.size)))
+
+    @property
+    def count(self):
+        return len(self.objects)
+
+
+class LegacyAnimation:
+    """旧的AnimationManager粒子部分"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.objects = []
+
+    def update(self, dt):
+        for p in self.objects:
+            p.x += p.vx * dt
+            p.y += p.vy * dt
+            p.life -= dt
+        self.objects = [p for p in self.objects if p.life > 0]
+
+    def add_dust(self, x, y):
+        rng = self.rng
+        for _ in range(3):
+            self.objects.append(LegacyParticle(
+                x + rng.uniform(-5, 5), y + rng.uniform(-2, 2), rng.uniform(-10, 10),
+                rng.uniform(-20, -5), rng.uniform(0.3, 0.6), 0.6, (180, 160, 140),
+                rng.uniform(2, 4)))
+
+    def render(self, screen, camera_x, camera_y, tile_size, zoom=1.0):
+        for p in self.objects:
+            sx, sy = int((p.x - camera_x) * zoom), int((p.y - camera_y) * zoom)
+            if -10 < sx < screen.get_width() + 10 and -10 < sy < screen.get_height() + 10:
+                s = pygame.Surface((int(p.size * 2), int(p.size * 2)), pygame.SRCALPHA)
+                pygame.draw.circle(s, (*p.color, int(255 * p.life / p.max_life)),
+                                   (int(p.size), int(p.size)), int(p.size))
+                screen.blit(s, (sx - int(p.size), sy - int(p.size)))
+
+    @property
+    def count(self):
+        return len(self.objects)
+
+
+# ----------------------------------------------------------------------
+# 场景
+# ----------------------------------------------------------------------
+def bench_weather(system, weather, frames, screen):
+    start = time.perf_counter()
+    peak = 0
+    for _ in range(frames):
+        screen.fill((20, 25, 20))
+        system.update(weather, 1.0)
+        system.render(screen)
+        peak = max(peak, system.count if hasattr(system, 'objects') else system.particles.count)
+    return (time.perf_counter() - start) * 1000 / frames, peak
+
+
+def bench_dust(animation, walkers, frames, screen):
+    rng = random.Random(7)
+    spots = [(rng.uniform(0, SCREEN_SIZE[0]), rng.uniform(0, SCREEN_SIZE[1])) for _ in range(walkers)]
+    start = time.perf_counter()
+    peak = 0
+    for frame in range(frames):
+        screen.fill((20, 25, 20))
+        # 每个角色大约每10帧走一格
+        for i, (x, y) in enumerate(spots):
+            if (frame + i) % 10 == 0:
+                animation.add_dust(x, y)
+        animation.update(1 / 60)
+        animation.render(screen, 0, 0, 32)
+        peak = max(peak, animation.count if hasattr(animation, 'objects') else animation.particles.count)
+    return (time.perf_counter() - start) * 1000 / frames, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--walkers', type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    rows = []
+    if WeatherParticles is None:
+        print(f"跳过天气场景: {WEATHER_IMPORT_ERROR}")
+    for weather in (Weather.STORMY, Weather.FOGGY) if WeatherParticles else ():
+        old = bench_weather(LegacyWeather(*SCREEN_SIZE, random.Random(1)), weather, args.frames, screen)
+        new = bench_weather(WeatherParticles(*SCREEN_SIZE, rng=random.Random(1)), weather,
+                            args.frames, screen)
+        rows.append((weather.name.lower(), old, new))
+    old = bench_dust(LegacyAnimation(random.Random(1)), args.walkers, args.frames, screen)
+    new = bench_dust(AnimationManager(random.Random(1)), args.walkers, args.frames, screen)
+    rows.append((f"dust x{args.walkers}", old, new))
+
+    print(f"{'场景':<14}{'旧 ms/帧':>10}{'新 ms/帧':>10}{'加速':>8}{'峰值粒子':>10}")
+    for name, (old_ms, old_peak), (new_ms, new_peak) in rows:
+        print(f"{name:<14}{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / new_ms:>7.1f}x"
+              f"{new_peak:>10}")
+
+
+if __name__ == "__main__":
+    main()
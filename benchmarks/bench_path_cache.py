@@ -0,0 +1,68 @@
+"""
+Benchmark - 路径缓存
+无头模式下运行同一段模拟，对比CollisionPathfinder开/关PathCache时
+find_path的总耗时、实际A*搜索次数和各类命中
+
+用法:
+    python benchmarks/bench_path_cache.py [--agents 200] [--ticks 600]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from core.collision_pathfinder import CollisionPathfinder
+from headless import HeadlessGame
+
+
+def run(agent_count: int, ticks: int, use_cache: bool):
+    random.seed(1)
+    game = HeadlessGame(agent_count=agent_count, seed=42)
+    pathfinder = CollisionPathfinder(game.chunk_manager, use_cache=use_cache)
+
+    spent = [0.0]
+    find_path = pathfinder.find_path
+
+    def timed_find_path(*args, **kwargs):
+        start = time.perf_counter()
+        path = find_path(*args, **kwargs)
+        spent[0] += time.perf_counter() - start
+        return path
+
+    pathfinder.find_path = timed_find_path
+    for agent in game.agents:
+        agent.set_pathfinder(pathfinder)
+
+    stats = game.run(ticks)
+    return stats['elapsed'], spent[0], pathfinder.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--agents', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=600)
+    args = parser.parse_args()
+
+    print(f"路径缓存基准: {args.agents} 个AI, {args.ticks} 步（seed=42）")
+    print("=" * 72)
+    results = {}
+    for use_cache in (False, True):
+        elapsed, spent, stats = run(args.agents, args.ticks, use_cache)
+        results[use_cache] = spent
+        label = "缓存" if use_cache else "无缓存"
+        print(f"{label:>4}: 模拟 {elapsed:7.2f}s  寻路 {spent:7.2f}s  "
+              f"调用 {stats['calls']}  A*搜索 {stats['searches']}")
+        if use_cache:
+            print(f"      命中 {stats['hits']}  子路径 {stats['subpath_hits']}  "
+                  f"流场 {stats['flow_hits']}  失效 {stats['invalidated']}  流场数 {stats['flow_fields']}")
+    if results[True] > 0:
+        print(f"寻路CPU降低 {results[False] / results[True]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
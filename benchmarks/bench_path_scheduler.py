@@ -0,0 +1,69 @@
+"""
+Benchmark - 分时寻路调度
+无头模式下逐步计时，对比同步寻路与PathScheduler（每步预算）的
+单步耗时分布（p50/p99/最大）和请求等待帧数；默认关闭路径缓存以模拟最坏情况
+
+用法:
+    python benchmarks/bench_path_scheduler.py [--agents 200] [--ticks 600] [--cache]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from core.collision_pathfinder import CollisionPathfinder
+from core.path_scheduler import PathScheduler
+from headless import HeadlessGame
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def run(agent_count: int, ticks: int, budget_ms: float, use_cache: bool):
+    random.seed(1)
+    game = HeadlessGame(agent_count=agent_count, seed=42, path_budget_ms=budget_ms)
+    game.pathfinder = CollisionPathfinder(game.chunk_manager, use_cache=use_cache)
+    if game.path_scheduler is not None:
+        game.path_scheduler = PathScheduler(game.pathfinder, budget_ms)
+    for agent in game.agents:
+        agent.set_pathfinder(game.pathfinder, game.path_scheduler)
+
+    times = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        game.update(game.dt)
+        times.append((time.perf_counter() - start) * 1000)
+    game.prefetcher.shutdown()
+    return times, game
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--agents', type=int, default=200)
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--cache', action='store_true', help="启用路径缓存")
+    args = parser.parse_args()
+
+    print(f"分时寻路基准: {args.agents} 个AI, {args.ticks} 步, 缓存{'开' if args.cache else '关'}")
+    print("=" * 78)
+    print(f"{'模式':>10} | {'p50 ms':>7} {'p99 ms':>7} {'最大 ms':>8} | {'总计 s':>7} | "
+          f"{'完成':>5} {'最长等待帧':>10}")
+    for budget_ms in (0.0, 2.0, 1.0):
+        times, game = run(args.agents, args.ticks, budget_ms, args.cache)
+        label = "同步" if budget_ms <= 0 else f"预算{budget_ms:.0f}ms"
+        scheduler = game.path_scheduler
+        done = scheduler.completed if scheduler else game.pathfinder.calls
+        wait = scheduler.max_wait_frames if scheduler else 0
+        print(f"{label:>10} | {percentile(times, 50):>7.2f} {percentile(times, 99):>7.2f} "
+              f"{max(times):>8.2f} | {sum(times) / 1000:>7.2f} | {done:>5} {wait:>10}")
+
+
+if __name__ == "__main__":
+    main()
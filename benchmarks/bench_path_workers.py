@@ -0,0 +1,99 @@
+"""
+Benchmark - 多进程寻路扩展性
+同一批寻路请求（关闭路径缓存，测纯搜索）分别用进程内同步寻路和1/2/4/8个工作进程完成，
+比较总耗时、吞吐量和相对进程内的加速比。两边配置相同（CollisionPathfinder逐格A*、
+不限常驻区块），计时前缓存状态也相同：进程内先把整批请求跑一遍，
+每个工作进程预加载同一组区块（含靠近水掩码）。单核机器上调度抖动很大，两边都取repeats次中最快的一次
+
+用法:
+    python benchmarks/bench_path_workers.py [--requests 240] [--repeats 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_manager import ChunkManager
+from core.collision_pathfinder import CollisionPathfinder
+from core.path_workers import PathWorkerPool
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def make_requests(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        sx, sy = rng.randint(-60, 60), rng.randint(-60, 60)
+        goals = [(sx + rng.randint(-25, 25), sy + rng.randint(-25, 25)) for _ in range(2)]
+        requests.append(((sx, sy), goals))
+    return requests
+
+
+def solve_all(pathfinder, requests):
+    for (sx, sy), goals in requests:
+        for gx, gy in goals:
+            path = pathfinder.find_path(sx, sy, gx, gy)
+            if len(path) > 1:
+                break
+
+
+def run_in_process(requests, repeats: int) -> Tuple[float, List[Tuple[int, int]]]:
+    """返回(最快一次的耗时, 预热后常驻的区块坐标)"""
+    chunk_manager = ChunkManager(seed=42)
+    pathfinder = CollisionPathfinder(chunk_manager, use_cache=False)
+    solve_all(pathfinder, requests)  # 预热：生成搜索会读到的全部区块和掩码
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        solve_all(pathfinder, requests)
+        best = min(best, time.perf_counter() - start)
+    return best, list(chunk_manager.chunks)
+
+
+def run_pool(requests, workers: int, warm_chunks: List[Tuple[int, int]], repeats: int) -> float:
+    """返回最快一次的耗时"""
+    pool = PathWorkerPool(ChunkManager(seed=42), workers=workers, batch_size=8,
+                          use_cache=False, worker_max_chunks=None)
+    try:
+        pool.preload(warm_chunks)  # 每个进程预加载与进程内相同的区块
+        pool.wait(timeout=120)
+
+        best = float('inf')
+        for _ in range(repeats):
+            results = {}
+            start = time.perf_counter()
+            for i, (start_pos, goals) in enumerate(requests):
+                pool.submit(i, start_pos, goals, lambda path, i=i: results.__setitem__(i, path))
+            pool.wait(timeout=600)
+            best = min(best, time.perf_counter() - start)
+            assert len(results) == len(requests), "有请求未完成"
+        return best
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=240)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    requests = make_requests(args.requests)
+
+    print(f"多进程寻路基准: {len(requests)} 个请求, 本机 {os.cpu_count()} 核")
+    print("=" * 56)
+    baseline, warm_chunks = run_in_process(requests, args.repeats)
+    print(f"{'进程内':>8} | {baseline:>7.2f}s | {len(requests) / baseline:>8.1f} 请求/s | {1.0:>5.2f}x")
+    for workers in WORKER_COUNTS:
+        elapsed = run_pool(requests, workers, warm_chunks, args.repeats)
+        print(f"{workers:>6}进程 | {elapsed:>7.2f}s | {len(requests) / elapsed:>8.1f} 请求/s | "
+              f"{baseline / elapsed:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark - 长距离寻路
+对比CollisionPathfinder（平面A*）与HierarchicalPathfinder（HPA*）：
+不同直线距离下的单次寻路耗时、成功率和路径长度（相对平面A*最优解）
+
+用法:
+    python benchmarks/bench_pathfinding.py
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_manager import ChunkManager
+from core.collision_pathfinder import CollisionPathfinder
+from core.hierarchical_pathfinder import NEAR_WATER_PENALTY, HierarchicalPathfinder
+
+# (最小距离, 最大距离, 样本数)；世界中心约5个区块内地形连通
+BANDS = ((20, 50, 40), (50, 100, 40), (100, 200, 30), (200, 320, 20))
+WORLD_RADIUS = 150
+FLAT_LIMIT = 100  # 平面A*太慢，只在该距离以内对比
+
+
+def path_cost(chunk_manager, path):
+    """与CollisionPathfinder相同的度量：步长 + 走进近水格的加价"""
+    return sum(math.hypot(x1 - x0, y1 - y0)
+               + (NEAR_WATER_PENALTY if chunk_manager.is_near_water(x1, y1) else 0.0)
+               for (x0, y0), (x1, y1) in zip(path, path[1:]))
+
+
+def sample_pairs(chunk_manager, rng, low, high, count):
+    def walkable_point():
+        while True:
+            x = rng.randint(-WORLD_RADIUS, WORLD_RADIUS)
+            y = rng.randint(-WORLD_RADIUS, WORLD_RADIUS)
+            if chunk_manager.is_walkable(x, y):
+                return x, y
+
+    pairs = []
+    while len(pairs) < count:
+        a, b = walkable_point(), walkable_point()
+        if low <= max(abs(a[0] - b[0]), abs(a[1] - b[1])) < high:
+            pairs.append((a, b))
+    return pairs
+
+
+def timed(pathfinder, pairs, **kwargs):
+    """返回 (路径列表, 每次耗时ms列表)"""
+    paths, times = [], []
+    for (sx, sy), (ex, ey) in pairs:
+        start = time.perf_counter()
+        paths.append(pathfinder.find_path(sx, sy, ex, ey, **kwargs))
+        times.append((time.perf_counter() - start) * 1000)
+    return paths, times
+
+
+def mean(values):
+    return sum(values) / len(values) if values else float('nan')
+
+
+def main():
+    chunk_manager = ChunkManager(seed=42)
+    flat = CollisionPathfinder(chunk_manager)
+    hpa = HierarchicalPathfinder(chunk_manager)
+    rng = random.Random(7)
+
+    print("长距离寻路基准（seed=42）")
+    print("=" * 84)
+    print(f"{'距离':>9} | {'平面A* ms':>9} {'成功':>5} | {'HPA*冷 ms':>9} {'热:成功ms':>9} "
+          f"{'热:失败ms':>9} {'成功':>5} {'抽象展开':>8} {'路径/最优':>9}")
+
+    for low, high, count in BANDS:
+        pairs = sample_pairs(chunk_manager, rng, low, high, count)
+
+        hpa.clusters.clear()
+        _, cold_times = timed(hpa, pairs)
+        hpa_paths, warm_times = timed(hpa, pairs)
+        found_ms = mean([t for p, t in zip(hpa_paths, warm_times) if p])
+        failed_ms = mean([t for p, t in zip(hpa_paths, warm_times) if not p])
+        expanded = 0
+        for (sx, sy), (ex, ey) in pairs:
+            hpa.find_path(sx, sy, ex, ey)
+            expanded += hpa.last_stats['abstract_expanded']
+
+        flat_col = f"{'-':>9} {'-':>5}"
+        ratio_col = f"{'-':>9}"
+        if high <= FLAT_LIMIT:
+            flat_paths, flat_times = timed(flat, pairs, max_distance=10 ** 6)
+            ratios = [path_cost(chunk_manager, p) / path_cost(chunk_manager, q)
+                      for p, q in zip(hpa_paths, flat_paths)
+                      if p and q and path_cost(chunk_manager, q) > 0]
+            flat_col = f"{mean(flat_times):>9.2f} {sum(1 for p in flat_paths if p):>5}"
+            if ratios:
+                ratio_col = f"{sum(ratios) / len(ratios):>9.3f}"
+
+        found = sum(1 for p in hpa_paths if p)
+        print(f"{low:>4}-{high:<4} | {flat_col} | {mean(cold_times):>9.2f} {found_ms:>9.2f} "
+              f"{failed_ms:>9.2f} {found:>5} "
+              f"{expanded / len(pairs):>8.0f} {ratio_col}")
+
+    print(f"已构建簇: {hpa.clusters_built}, 常驻簇: {len(hpa.clusters)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark - AI空间索引
+N个AI随机分布并随机游走，对比线性扫描与SpatialHash：
+每步增量更新索引的开销，以及点选、半径查询（感知）、k近邻、视野矩形查询的单次耗时
+
+用法:
+    python benchmarks/bench_spatial_hash.py [--agents 10000] [--world 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.spatial_hash import SpatialHash
+
+AGENT_COUNTS = (100, 1000, 10000)
+QUERIES = 500
+
+
+class Dot:
+    __slots__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def linear_pick(agents, x, y, half):
+    for agent in agents:
+        if abs(agent.x - x) < half and abs(agent.y - y) < half:
+            return agent
+    return None
+
+
+def linear_range(agents, x, y, radius):
+    r2 = radius * radius
+    return [a for a in agents if (a.x - x) ** 2 + (a.y - y) ** 2 <= r2]
+
+
+def linear_nearest(agents, x, y, k):
+    return sorted(agents, key=lambda a: (a.x - x) ** 2 + (a.y - y) ** 2)[:k]
+
+
+def linear_rect(agents, left, top, right, bottom):
+    return [a for a in agents if left <= a.x <= right and top <= a.y <= bottom]
+
+
+def per_query_us(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - start) * 1e6 / len(queries)
+
+
+def run(count, world, rng):
+    agents = [Dot(rng.uniform(0, world), rng.uniform(0, world)) for _ in range(count)]
+    index = SpatialHash(8.0)
+    for agent in agents:
+        index.update(agent, agent.x, agent.y)
+
+    # 每步增量更新（AI每步移动不到一格，多数不跨桶）
+    ticks = 20
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for agent in agents:
+            agent.x += rng.uniform(-0.05, 0.05)
+            agent.y += rng.uniform(-0.05, 0.05)
+            index.update(agent, agent.x, agent.y)
+    update_ms = (time.perf_counter() - start) * 1000 / ticks
+
+    points = [(rng.uniform(0, world), rng.uniform(0, world)) for _ in range(QUERIES)]
+    rows = [
+        ("点选±0.6格", lambda x, y: linear_pick(agents, x, y, 0.6),
+         lambda x, y: index.query_rect(x - 0.6, y - 0.6, x + 0.6, y + 0.6)),
+        ("半径10格", lambda x, y: linear_range(agents, x, y, 10),
+         lambda x, y: index.query_range(x, y, 10)),
+        ("k=5近邻", lambda x, y: linear_nearest(agents, x, y, 5),
+         lambda x, y: index.nearest(x, y, 5)),
+        ("视野40x23格", lambda x, y: linear_rect(agents, x, y, x + 40, y + 23),
+         lambda x, y: index.query_rect(x, y, x + 40, y + 23)),
+    ]
+    print(f"{count:>6} 个AI | 每步更新索引 {update_ms:>7.2f} ms")
+    for label, linear, hashed in rows:
+        linear_us = per_query_us(linear, points[:50] if count >= 10000 else points)
+        hashed_us = per_query_us(hashed, points)
+        print(f"         {label:<10} | 线性 {linear_us:>9.1f} us | 索引 {hashed_us:>7.1f} us | "
+              f"{linear_us / hashed_us:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--agents', type=int, default=None, help="只测这一个数量")
+    parser.add_argument('--world', type=float, default=1000, help="世界边长（格）")
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    print(f"空间索引基准: 世界 {args.world:.0f}x{args.world:.0f} 格, 桶边长8格")
+    print("=" * 76)
+    for count in ([args.agents] if args.agents else AGENT_COUNTS):
+        run(count, args.world, rng)
+
+
+if __name__ == "__main__":
+    main()
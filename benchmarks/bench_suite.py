@@ -0,0 +1,321 @@
+"""
+Benchmark - 整体模拟基准套件
+按场景（AI数量、相机静止/漫游、上帝模式缩小、接本地桩服务器的LLM大脑）运行完整的Game
+（update + render，SDL dummy驱动，无需显示器），以确定性模式固定dt推进，报告：
+每秒步数、帧耗时百分位、峰值RSS、常驻区块数、寻路调用次数和最终状态哈希，结果写成JSON，
+便于逐版本对比（--compare 旧结果.json）
+
+每个场景在独立子进程里运行，峰值RSS互不影响
+
+用法:
+    python benchmarks/bench_suite.py [--scenarios agents_15,camera_roaming] [--frames 300]
+                                     [--output bench_results.json] [--compare old.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+DT = 1.0 / 60
+WARMUP_FRAMES = 30
+
+
+@dataclass
+class Scenario:
+    """一个基准场景"""
+    name: str
+    agents: int
+    camera: str = 'follow'      # follow: 跟随玩家 / stationary: 上帝模式静止 / roam: 上帝模式漫游
+    zoom: float = 1.0           # 上帝模式下的缩放（<1为缩小）
+    llm: bool = False           # 为每个AI接一个LLMBrain（请求发往本地桩服务器）
+    frames: Optional[int] = None  # 覆盖--frames（AI很多的场景跑少一些）
+    warmup: int = WARMUP_FRAMES   # 不计时的预热帧
+    description: str = ""
+
+
+SCENARIOS = [
+    Scenario('agents_15', 15, description="默认世界"),
+    Scenario('agents_100', 100),
+    Scenario('agents_1000', 1000),
+    Scenario('agents_10000', 10000, frames=20, warmup=10),
+    Scenario('camera_stationary', 100, camera='stationary', description="上帝模式，相机不动"),
+    Scenario('camera_roaming', 100, camera='roam', description="上帝模式，相机持续平移（区块加载/预取）"),
+    Scenario('god_mode_zoomed_out', 1000, camera='stationary', zoom=0.1,
+             description="上帝模式缩到最小，视野内区块和AI最多"),
+    Scenario('llm_stub', 15, llm=True, description="每个AI定期向本地桩服务器请求决策"),
+]
+
+
+# ----------------------------------------------------------------------
+# LLM桩服务器
+# ----------------------------------------------------------------------
+class StubLLMServer:
+    """本地OpenAI兼容接口：/chat/completions固定返回一个合法决策，可设置延迟"""
+
+    def __init__(self, latency: float = 0.05):
+        latency_s = latency
+        decision = json.dumps({'action': 'move', 'direction': 'N',
+                               'reasoning': '基准测试', 'expected_outcome': '无'})
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                time.sleep(latency_s)
+                body = json.dumps({
+                    'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': 'stub',
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': decision}}],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def create_brains(agents, url: str):
+    """为每个AI创建指向桩服务器的LLMBrain；缺少依赖时返回(None, 原因)"""
+    os.environ['OPENAI_API_KEY'] = 'stub'
+    os.environ['OPENAI_BASE_URL'] = url
+    try:
+        from ai.llm_brain import LLMBrain
+    except ImportError as e:
+        return None, f"无法导入LLMBrain: {e}"
+    brains = [LLMBrain(agent.id, {}) for agent in agents]
+    if not all(brain.enabled for brain in brains):
+        return None, "LLMBrain未启用（缺少openai包？）"
+    return brains, None
+
+
+# ----------------------------------------------------------------------
+# 子进程：运行单个场景
+# ----------------------------------------------------------------------
+def setup_camera(game, scenario: Scenario):
+    if scenario.camera == 'follow':
+        return
+    game.camera.toggle_god_mode()
+    while game.camera.zoom > scenario.zoom * 1.1:
+        previous = game.camera.zoom
+        game.camera.zoom_out()
+        if game.camera.zoom == previous:
+            break
+
+
+async def run_frames(game, scenario: Scenario, frames: int, brains) -> Dict:
+    """推进并渲染frames帧，返回每帧耗时和LLM请求统计"""
+    frame_ms: List[float] = []
+    tasks: Dict[int, asyncio.Task] = {}
+    think_interval = 60  # 每个AI每60帧发一次决策请求
+    llm_calls = 0
+    for frame in range(scenario.warmup + frames):
+        start = time.perf_counter()
+        if scenario.camera == 'roam':
+            game.camera.move(0.75, 0.25)
+        game.update(DT, False, {})
+        game.render()
+        if brains is not None:
+            for i, (agent, brain) in enumerate(zip(game.agents, brains)):
+                if (frame + i) % think_interval == 0 and i not in tasks:
+                    context = {'self': {'energy': agent.survival.energy,
+                                        'position': (agent.x, agent.y)}, 'objects': []}
+                    tasks[i] = asyncio.ensure_future(brain.think(context))
+            for i in [i for i, task in tasks.items() if task.done()]:
+                del tasks[i]
+                if frame >= scenario.warmup:
+                    llm_calls += 1
+        await asyncio.sleep(0)
+        if frame >= scenario.warmup:
+            frame_ms.append((time.perf_counter() - start) * 1000)
+    for task in tasks.values():
+        task.cancel()
+    return {'frame_ms': frame_ms, 'llm_calls': llm_calls}
+
+
+def run_scenario(scenario: Scenario, frames: int, seed: int) -> Dict:
+    """在当前进程中运行一个场景，返回结果字典"""
+    from main import Game
+
+    server = brains = None
+    if scenario.llm:
+        server = StubLLMServer()
+    try:
+        build_start = time.perf_counter()
+        game = Game(seed=seed, deterministic=True, agent_count=scenario.agents)
+        build_s = time.perf_counter() - build_start
+        if server is not None:
+            brains, reason = create_brains(game.agents, server.url)
+            if brains is None:
+                game.prefetcher.shutdown()
+                return {'skipped': reason}
+        setup_camera(game, scenario)
+
+        measured = asyncio.run(run_frames(game, scenario, frames, brains))
+        game.prefetcher.shutdown()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    frame_ms = np.array(measured['frame_ms'])
+    p50, p90, p99 = np.percentile(frame_ms, [50, 90, 99])
+    path_stats = game.pathfinder.get_stats()
+    scheduler_stats = game.path_scheduler.get_stats()
+    result = {
+        'frames': frames,
+        'build_s': build_s,
+        'ticks_per_second': 1000 / frame_ms.mean(),
+        'frame_ms': {'mean': float(frame_ms.mean()), 'p50': float(p50), 'p90': float(p90),
+                     'p99': float(p99), 'max': float(frame_ms.max())},
+        # Linux上ru_maxrss单位是KB
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'chunks': len(game.chunk_manager.chunks),
+        'path_calls': path_stats['calls'],
+        'path_searches': path_stats['searches'],
+        'path_requests_completed': scheduler_stats['completed'],
+        'alive': game.survival_store.get_stats()['alive'],
+        'state_hash': game.state_hash(),
+    }
+    if scenario.llm:
+        result['llm_calls'] = measured['llm_calls']
+    return result
+
+
+# ----------------------------------------------------------------------
+# 父进程：调度、汇总、对比
+# ----------------------------------------------------------------------
+def run_in_subprocess(scenario: Scenario, frames: int, seed: int) -> Dict:
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        result_path = f.name
+    try:
+        cmd = [sys.executable, os.path.abspath(__file__), '--child', scenario.name,
+               '--frames', str(frames), '--seed', str(seed), '--output', result_path]
+        proc = subprocess.run(cmd, cwd=ROOT, stdout=subprocess.DEVNULL)
+        if proc.returncode != 0:
+            return {'error': f"子进程退出码 {proc.returncode}"}
+        with open(result_path) as f:
+            return json.load(f)
+    finally:
+        os.unlink(result_path)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_row(name: str, result: Dict):
+    if 'skipped' in result or 'error' in result:
+        print(f"{name:<20} | {result.get('skipped') or result.get('error')}")
+        return
+    ms = result['frame_ms']
+    print(f"{name:<20} | {result['ticks_per_second']:>7.1f} | {ms['p50']:>7.2f} {ms['p90']:>7.2f} "
+          f"{ms['p99']:>7.2f} | {result['peak_rss_mb']:>7.1f} | {result['chunks']:>5} | "
+          f"{result['path_calls']:>6} | {result['state_hash'][:8]}")
+
+
+def compare(results: Dict, old_path: str):
+    """与旧结果对比每秒步数和状态哈希"""
+    with open(old_path) as f:
+        old = json.load(f)['results']
+    print(f"\n对比 {old_path}:")
+    for name, result in results.items():
+        before = old.get(name)
+        if not before or 'ticks_per_second' not in before or 'ticks_per_second' not in result:
+            continue
+        change = result['ticks_per_second'] / before['ticks_per_second'] - 1
+        behaviour = "行为一致" if result['state_hash'] == before['state_hash'] else "⚠️ 状态哈希改变"
+        print(f"  {name:<20} {before['ticks_per_second']:>7.1f} -> {result['ticks_per_second']:>7.1f} "
+              f"ticks/s ({change:+.1%})  {behaviour}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scenarios', default=None, help="逗号分隔的场景名（默认全部）")
+    parser.add_argument('--frames', type=int, default=300, help="每个场景计时的帧数")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='bench_results.json', help="JSON结果文件")
+    parser.add_argument('--compare', default=None, help="与之对比的旧结果JSON")
+    parser.add_argument('--list', action='store_true', help="列出场景")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    by_name = {scenario.name: scenario for scenario in SCENARIOS}
+    if args.child:
+        scenario = by_name[args.child]
+        result = run_scenario(scenario, scenario.frames or args.frames, args.seed)
+        with open(args.output, 'w') as f:
+            json.dump(result, f)
+        return
+
+    if args.list:
+        for scenario in SCENARIOS:
+            print(f"{scenario.name:<20} {scenario.agents:>6} 个AI  {scenario.description}")
+        return
+
+    names = args.scenarios.split(',') if args.scenarios else list(by_name)
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        parser.error(f"未知场景: {', '.join(unknown)}")
+
+    print(f"模拟基准套件: 每场景 {args.frames} 帧（默认预热 {WARMUP_FRAMES}），dt={DT:.4f}s，种子 {args.seed}")
+    print("=" * 92)
+    print(f"{'场景':<20} | {'步/秒':>7} | {'p50ms':>7} {'p90ms':>7} {'p99ms':>7} | {'RSS MB':>7} | "
+          f"{'区块':>5} | {'寻路':>6} | 哈希")
+    results = {}
+    for name in names:
+        scenario = by_name[name]
+        results[name] = run_in_subprocess(scenario, scenario.frames or args.frames, args.seed)
+        print_row(name, results[name])
+
+    report = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'frames': args.frames,
+        'seed': args.seed,
+        'scenarios': {name: asdict(by_name[name]) for name in names},
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n结果已写入 {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
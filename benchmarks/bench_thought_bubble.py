@@ -0,0 +1,119 @@
+"""
+Benchmark - 思考气泡渲染
+50个气泡每帧渲染：旧实现（每帧描边24次blit + 新建SRCALPHA Surface + 画背景/边框/尾巴）
+与合成缓存版本（文字改变才重建，淡入淡出只set_alpha）的每帧耗时；
+同时比较完全不透明时两者画到屏幕上的像素差
+
+用法:
+    python benchmarks/bench_thought_bubble.py [--bubbles 50] [--frames 300]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+from ui.thought_bubble import ThoughtBubble
+
+THOUGHTS = ["今天天气真好！", "有点饿了...", "想去探索新地方", "好累啊，想休息",
+            "这里风景真美", "继续前进吧", "感觉充满活力！", "想找个地方坐下"]
+DT = 1.0 / 60
+
+
+class LegacyThoughtBubble(ThoughtBubble):
+    """旧的每帧重建实现"""
+
+    def render(self, screen, x, y):
+        if self.alpha <= 0 or not self.text:
+            return
+        bubble_y = y - 55 + self.float_offset
+        text_surf = self._render_text_with_outline(self.text, (255, 255, 255), (0, 0, 0), 2)
+        text_w, text_h = text_surf.get_size()
+        padding_x, padding_y = 12, 8
+        bubble_w = text_w + padding_x * 2
+        bubble_h = text_h + padding_y * 2
+        bubble_x = x - bubble_w // 2
+        bubble_y = bubble_y - bubble_h
+        bg_color = (40, 40, 50, int(220 * self.alpha / 255))
+        bubble_surf = pygame.Surface((bubble_w, bubble_h), pygame.SRCALPHA)
+        pygame.draw.rect(bubble_surf, bg_color, (0, 0, bubble_w, bubble_h), border_radius=10)
+        border_color = (100, 100, 120, int(150 * self.alpha / 255))
+        pygame.draw.rect(bubble_surf, border_color, (0, 0, bubble_w, bubble_h), width=2, border_radius=10)
+        tail_points = [(bubble_w // 2 - 8, bubble_h), (bubble_w // 2 + 8, bubble_h),
+                       (bubble_w // 2, bubble_h + 10)]
+        pygame.draw.polygon(bubble_surf, bg_color, tail_points)
+        pygame.draw.polygon(bubble_surf, border_color, tail_points, width=1)
+        screen.blit(bubble_surf, (bubble_x, bubble_y))
+        screen.blit(text_surf, (bubble_x + padding_x, bubble_y + padding_y))
+
+    def _render_text_with_outline(self, text, text_color, outline_color, outline_width):
+        font = self.font.font  # 不经过文字缓存
+        text_surf = font.render(text, True, text_color)
+        w, h = text_surf.get_size()
+        outline_surf = pygame.Surface((w + outline_width * 2, h + outline_width * 2), pygame.SRCALPHA)
+        outline_text = font.render(text, True, outline_color)
+        for dx in range(-outline_width, outline_width + 1):
+            for dy in range(-outline_width, outline_width + 1):
+                if dx != 0 or dy != 0:
+                    outline_surf.blit(outline_text, (outline_width + dx, outline_width + dy))
+        outline_surf.blit(text_surf, (outline_width, outline_width))
+        return outline_surf
+
+
+def run(bubble_cls, count, frames, screen):
+    bubbles = [bubble_cls() for _ in range(count)]
+    for b in bubbles:
+        b.set_visible(True)
+    positions = [(100 + (i % 10) * 120, 120 + (i // 10) * 90) for i in range(count)]
+    start = time.perf_counter()
+    for frame in range(frames):
+        screen.fill((20, 25, 20))
+        for i, (b, (x, y)) in enumerate(zip(bubbles, positions)):
+            # 每6秒换一次想法，错开；每个周期最后1秒淡出
+            thought = THOUGHTS[(frame // 360 + i) % len(THOUGHTS)]
+            b.set_visible((frame + i * 7) % 360 < 300)
+            b.update(DT, thought)
+            b.render(screen, x, y)
+    return (time.perf_counter() - start) * 1000 / frames, bubbles
+
+
+def pixel_diff(screen):
+    """完全不透明时新旧实现的最大像素差"""
+    shots = []
+    for cls in (LegacyThoughtBubble, ThoughtBubble):
+        bubble = cls()
+        bubble.text = THOUGHTS[0]
+        bubble.alpha = 255
+        screen.fill((20, 25, 20))
+        bubble.render(screen, 300, 200)
+        shots.append(pygame.surfarray.array3d(screen).astype(int))
+    return int(np.abs(shots[0] - shots[1]).max())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--bubbles', type=int, default=50)
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((1400, 900))
+    legacy_ms, _ = run(LegacyThoughtBubble, args.bubbles, args.frames, screen)
+    cached_ms, bubbles = run(ThoughtBubble, args.bubbles, args.frames, screen)
+    rebuilds = sum(b.rebuilds for b in bubbles)
+
+    print(f"{args.bubbles} 个气泡, {args.frames} 帧:")
+    print(f"  每帧重建  : {legacy_ms:>7.2f} ms/帧  (每帧约 {args.bubbles * 2} 次Surface分配)")
+    print(f"  合成缓存  : {cached_ms:>7.2f} ms/帧  ({legacy_ms / cached_ms:.1f}x, "
+          f"共重建 {rebuilds} 次)")
+    print(f"  不透明时最大像素差: {pixel_diff(screen)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark - 靠近水代价
+对比旧版_is_near_water（每个邻居扫描5x5窗口，25次is_water）与区块预计算掩码（一次查表），
+在约20/50/100格的路径上测量CollisionPathfinder.find_path耗时，并确认两者路径一致
+
+用法:
+    python benchmarks/bench_water_proximity.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_manager import ChunkManager
+from core.collision_pathfinder import CollisionPathfinder
+
+PATH_LENGTHS = (20, 50, 100)
+SAMPLES = 10
+
+
+class LegacyCollisionPathfinder(CollisionPathfinder):
+    """旧版：逐格扫描5x5窗口"""
+
+    def _is_near_water(self, x: int, y: int, radius: int = 2) -> bool:
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                if self.chunk_manager.is_water(x + dx, y + dy):
+                    return True
+        return False
+
+
+def sample_pairs(pathfinder, rng, length, count):
+    """找实际路径长度约为length（±20%）的起终点对"""
+    chunk_manager = pathfinder.chunk_manager
+    pairs = []
+    while len(pairs) < count:
+        sx, sy = rng.randint(-100, 100), rng.randint(-100, 100)
+        ex, ey = sx + rng.randint(-length, length), sy + rng.randint(-length, length)
+        if not (chunk_manager.is_walkable(sx, sy) and chunk_manager.is_walkable(ex, ey)):
+            continue
+        path = pathfinder.find_path(sx, sy, ex, ey, max_distance=length * 3)
+        if 0.8 * length <= len(path) <= 1.2 * length:
+            pairs.append(((sx, sy), (ex, ey)))
+    return pairs
+
+
+def time_paths(pathfinder, pairs, max_distance):
+    paths = []
+    start = time.perf_counter()
+    for (sx, sy), (ex, ey) in pairs:
+        paths.append(pathfinder.find_path(sx, sy, ex, ey, max_distance=max_distance))
+    return paths, (time.perf_counter() - start) / len(pairs) * 1000
+
+
+def main():
+    chunk_manager = ChunkManager(seed=42)
+    legacy = LegacyCollisionPathfinder(chunk_manager)
+    current = CollisionPathfinder(chunk_manager)
+    rng = random.Random(3)
+
+    print("靠近水代价基准（seed=42）")
+    print("=" * 60)
+    print(f"{'路径长度':>8} | {'旧版 ms':>9} | {'掩码 ms':>9} | {'加速':>6} | {'路径一致':>6}")
+    for length in PATH_LENGTHS:
+        pairs = sample_pairs(current, rng, length, SAMPLES)
+        legacy_paths, legacy_ms = time_paths(legacy, pairs, length * 3)
+        paths, current_ms = time_paths(current, pairs, length * 3)
+        same = legacy_paths == paths
+        print(f"{length:>8} | {legacy_ms:>9.2f} | {current_ms:>9.2f} | "
+              f"{legacy_ms / current_ms:>5.1f}x | {str(same):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Agent State - 结构数组形式的AI生存状态
+所有AI的能量/饥饿/健康/食物/睡眠/死亡存在NumPy数组里，每帧一次向量化更新，
+结果与SurvivalSystem.update逐个更新完全一致；GameAgent持有SurvivalView（数组某一行的视图），
+接口与SurvivalSystem相同
+"""
+
+import random
+from typing import Dict, List
+
+import numpy as np
+
+# get_priority的结果，按判断顺序编码
+PRIORITY_NAMES = ('normal', 'wake_up', 'hungry', 'low_energy', 'critical', 'dead')
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITY_NAMES)}
+
+
+class AgentStateStore:
+    """所有AI的生存状态（每个AI一行）"""
+
+    def __init__(self, capacity: int = 64):
+        self.size = 0  # 已分配的行数（含已释放的）
+        self.free: List[int] = []
+        self._allocate_arrays(capacity)
+        self.deaths = 0
+
+    def _allocate_arrays(self, capacity: int):
+        self.capacity = capacity
+        self.energy = np.full(capacity, 100.0)
+        self.hunger = np.zeros(capacity)
+        self.health = np.full(capacity, 100.0)
+        self.food = np.zeros(capacity, dtype=np.int32)
+        self.sleeping = np.zeros(capacity, dtype=bool)
+        self.dead = np.zeros(capacity, dtype=bool)
+        self.used = np.zeros(capacity, dtype=bool)
+
+    def _grow(self):
+        old = (self.energy, self.hunger, self.health, self.food,
+               self.sleeping, self.dead, self.used)
+        self._allocate_arrays(self.capacity * 2)
+        for new, previous in zip((self.energy, self.hunger, self.health, self.food,
+                                  self.sleeping, self.dead, self.used), old):
+            new[:len(previous)] = previous
+
+    def add(self) -> 'SurvivalView':
+        """分配一行（初始状态与SurvivalSystem()相同），返回视图"""
+        if self.free:
+            index = self.free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            index = self.size
+            self.size += 1
+        self.energy[index] = 100.0
+        self.hunger[index] = 0.0
+        self.health[index] = 100.0
+        self.food[index] = 2  # 初始食物
+        self.sleeping[index] = False
+        self.dead[index] = False
+        self.used[index] = True
+        return SurvivalView(self, index)
+
+    def remove(self, view: 'SurvivalView'):
+        self.used[view.index] = False
+        self.free.append(view.index)
+
+    def __len__(self) -> int:
+        return self.size - len(self.free)
+
+    # ------------------------------------------------------------------
+    # 向量化更新
+    # ------------------------------------------------------------------
+    def step(self, dt: float, weather_effects: Dict, hour: int) -> int:
+        """所有存活AI的SurvivalSystem.update，返回本帧死亡数"""
+        n = self.size
+        energy = self.energy[:n]
+        hunger = self.hunger[:n]
+        active = self.used[:n] & ~self.dead[:n]
+        asleep = active & self.sleeping[:n]
+        awake = active & ~self.sleeping[:n]
+
+        # 逐项与标量版本的运算顺序一致，保证浮点结果相同；
+        # 布尔掩码乘常数得到c或0.0（加减0.0不改变数值），比带where的ufunc快得多
+        energy_drain = weather_effects.get('energy_drain', 1.0)
+        base_drain = 0.015 * dt * energy_drain
+        energy += asleep * (0.15 * dt)
+        hunger += asleep * (0.01 * dt)
+        if hour < 6 or hour > 20:
+            energy += asleep * (0.08 * dt)
+        energy -= awake * base_drain
+        hunger += awake * (0.012 * dt)
+
+        # 只限制存活的行：先记下其余行（死亡的能量可能略小于0），限制后还原
+        inactive = np.flatnonzero(~active)
+        kept_energy = energy[inactive]
+        kept_hunger = hunger[inactive]
+        np.clip(energy, 0, 100, out=energy)
+        np.clip(hunger, 0, 100, out=hunger)
+        energy[inactive] = kept_energy
+        hunger[inactive] = kept_hunger
+
+        energy -= (active & (hunger > 80)) * (0.05 * dt)
+
+        died = active & (energy <= 0)
+        count = int(np.count_nonzero(died))
+        if count:
+            self.dead[:n] |= died
+            self.deaths += count
+            print(f"💀 {count}个AI因能量耗尽死亡")
+        return count
+
+    def priorities(self) -> np.ndarray:
+        """所有行的get_priority编码（见PRIORITY_NAMES）"""
+        n = self.size
+        energy = self.energy[:n]
+        return np.select(
+            [self.dead[:n], energy < 25, energy < 45, self.hunger[:n] > 70,
+             self.sleeping[:n] & (energy > 80)],
+            [PRIORITY_CODES['dead'], PRIORITY_CODES['critical'], PRIORITY_CODES['low_energy'],
+             PRIORITY_CODES['hungry'], PRIORITY_CODES['wake_up']],
+            PRIORITY_CODES['normal'])
+
+    def should_sleep(self, hour: int) -> np.ndarray:
+        """所有行的should_sleep"""
+        if hour >= 22 or hour <= 5:
+            return np.ones(self.size, dtype=bool)
+        return self.energy[:self.size] < 35
+
+    def get_stats(self) -> Dict:
+        n = self.size
+        alive = self.used[:n] & ~self.dead[:n]
+        return {
+            'agents': len(self),
+            'alive': int(np.count_nonzero(alive)),
+            'sleeping': int(np.count_nonzero(alive & self.sleeping[:n])),
+            'deaths': self.deaths,
+            'mean_energy': float(self.energy[:n][alive].mean()) if alive.any() else 0.0,
+        }
+
+
+class SurvivalView:
+    """AgentStateStore中一行的视图，接口与SurvivalSystem相同"""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: AgentStateStore, index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def energy(self) -> float:
+        return float(self.store.energy[self.index])
+
+    @energy.setter
+    def energy(self, value: float):
+        self.store.energy[self.index] = value
+
+    @property
+    def hunger(self) -> float:
+        return float(self.store.hunger[self.index])
+
+    @hunger.setter
+    def hunger(self, value: float):
+        self.store.hunger[self.index] = value
+
+    @property
+    def health(self) -> float:
+        return float(self.store.health[self.index])
+
+    @health.setter
+    def health(self, value: float):
+        self.store.health[self.index] = value
+
+    @property
+    def food_inventory(self) -> int:
+        return int(self.store.food[self.index])
+
+    @food_inventory.setter
+    def food_inventory(self, value: int):
+        self.store.food[self.index] = value
+
+    @property
+    def is_sleeping(self) -> bool:
+        return bool(self.store.sleeping[self.index])
+
+    @is_sleeping.setter
+    def is_sleeping(self, value: bool):
+        self.store.sleeping[self.index] = value
+
+    @property
+    def is_dead(self) -> bool:
+        return bool(self.store.dead[self.index])
+
+    @is_dead.setter
+    def is_dead(self, value: bool):
+        self.store.dead[self.index] = value
+
+    def update(self, dt: float, weather_effects: Dict, hour: int):
+        """只更新这一行（批量更新请用AgentStateStore.step）"""
+        if self.is_dead:
+            return
+        energy_drain = weather_effects.get('energy_drain', 1.0)
+        base_drain = 0.015 * dt * energy_drain
+        energy, hunger = self.energy, self.hunger
+        if self.is_sleeping:
+            energy += 0.15 * dt
+            hunger += 0.01 * dt
+            if hour < 6 or hour > 20:
+                energy += 0.08 * dt
+        else:
+            energy -= base_drain
+            hunger += 0.012 * dt
+        energy = max(0, min(100, energy))
+        hunger = max(0, min(100, hunger))
+        if hunger > 80:
+            energy -= 0.05 * dt
+        self.energy, self.hunger = energy, hunger
+        if energy <= 0:
+            self.is_dead = True
+            self.store.deaths += 1
+            print(f"💀 AI因能量耗尽死亡")
+
+    def get_priority(self) -> str:
+        store, i = self.store, self.index
+        if store.dead[i]:
+            return 'dead'
+        energy = store.energy[i]
+        if energy < 25:
+            return 'critical'
+        if energy < 45:
+            return 'low_energy'
+        if store.hunger[i] > 70:
+            return 'hungry'
+        if store.sleeping[i] and energy > 80:
+            return 'wake_up'
+        return 'normal'
+
+    def should_sleep(self, hour: int) -> bool:
+        if self.store.energy[self.index] < 35:
+            return True
+        if hour >= 22 or hour <= 5:
+            return True
+        return False
+
+    def eat(self) -> bool:
+        if self.food_inventory > 0:
+            self.food_inventory -= 1
+            self.hunger = max(0, self.hunger - 30)
+            self.energy = min(100, self.energy + 15)
+            return True
+        return False
+
+    def gather_food(self, tile_type: str) -> bool:
+        if tile_type == 'water' and random.random() < 0.3:
+            self.food_inventory += 1
+            return True
+        if tile_type == 'forest' and random.random() < 0.2:
+            self.food_inventory += 1
+            return True
+        return False
@@ -6,40 +6,31 @@ Animation Manager - 动画管理器
 import pygame
 import random
 import math
-from typing import List, Tuple
-from dataclasses import dataclass
+from typing import Tuple
 
-@dataclass
-class Particle:
-    """粒子"""
-    x: float
-    y: float
-    vx: float
-    vy: float
-    life: float
-    max_life: float
-    color: Tuple[int, int, int]
-    size: float
-    
-    def update(self, dt: float):
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.life -= dt
-        
-    def is_alive(self) -> bool:
-        return self.life > 0
-        
-    def get_alpha(self) -> int:
-        return int(255 * (self.life / self.max_life))
+from core.overlay_cache import get_overlay_cache
+from core.particle_engine import ParticleEngine
+
+DUST_COLOR = (180, 160, 140)
+LEAF_COLORS = {
+    'spring': [(100, 200, 100), (120, 220, 120)],
+    'summer': [(60, 160, 60), (80, 180, 80)],
+    'autumn': [(200, 120, 40), (220, 160, 60), (180, 80, 30)],
+    'winter': [(240, 250, 255)],
+}
 
 
 class AnimationManager:
     """动画管理器"""
     
-    def __init__(self):
-        self.particles: List[Particle] = []
+    def __init__(self, rng: random.Random = None, max_particles: int = 2000):
+        # 粒子存在数组化粒子池里（有上限），按剩余寿命淡出
+        self.particles = ParticleEngine(max_particles)
         self.water_offset = 0
         self.time = 0
+        # 粒子用的随机数流（确定性模式下单独一个流，不影响AI决策的序列）
+        self.rng = rng if rng is not None else random
+        self._dust_color = self.particles.color_id(DUST_COLOR)
         
     def update(self, dt: float):
         """更新动画"""
@@ -47,61 +38,35 @@ class AnimationManager:
         self.water_offset += dt * 2
         
         # 更新粒子
-        for p in self.particles:
-            p.update(dt)
-        self.particles = [p for p in self.particles if p.is_alive()]
+        self.particles.update(dt)
         
     def add_dust(self, x: float, y: float):
         """添加走路尘土"""
-        for _ in range(3):
-            self.particles.append(Particle(
-                x=x + random.uniform(-5, 5),
-                y=y + random.uniform(-2, 2),
-                vx=random.uniform(-10, 10),
-                vy=random.uniform(-20, -5),
-                life=random.uniform(0.3, 0.6),
-                max_life=0.6,
-                color=(180, 160, 140),
-                size=random.uniform(2, 4)
-            ))
+        rng = self.rng
+        values = [(x + rng.uniform(-5, 5), y + rng.uniform(-2, 2),
+                   rng.uniform(-10, 10), rng.uniform(-20, -5),
+                   rng.uniform(0.3, 0.6), rng.uniform(2, 4)) for _ in range(3)]
+        px, py, vx, vy, life, size = zip(*values)
+        self.particles.emit(px, py, vx, vy, life, 0.6, size, self._dust_color)
             
     def add_leaf(self, x: float, y: float, season: str = 'autumn'):
         """添加落叶"""
-        colors = {
-            'spring': [(100, 200, 100), (120, 220, 120)],
-            'summer': [(60, 160, 60), (80, 180, 80)],
-            'autumn': [(200, 120, 40), (220, 160, 60), (180, 80, 30)],
-            'winter': [(240, 250, 255)],
-        }
+        color = self.rng.choice(LEAF_COLORS.get(season, LEAF_COLORS['autumn']))
         
-        color = random.choice(colors.get(season, colors['autumn']))
+        self.particles.emit(
+            x, y,
+            self.rng.uniform(-15, 15),
+            self.rng.uniform(5, 20),
+            self.rng.uniform(1.0, 2.0),
+            2.0,
+            self.rng.uniform(3, 5),
+            self.particles.color_id(color),
+        )
         
-        self.particles.append(Particle(
-            x=x,
-            y=y,
-            vx=random.uniform(-15, 15),
-            vy=random.uniform(5, 20),
-            life=random.uniform(1.0, 2.0),
-            max_life=2.0,
-            color=color,
-            size=random.uniform(3, 5)
-        ))
-        
-    def render(self, screen: pygame.Surface, camera_x: float, camera_y: float, tile_size: int):
-        """渲染粒子"""
-        for p in self.particles:
-            screen_x = int(p.x - camera_x)
-            screen_y = int(p.y - camera_y)
-            
-            # 检查是否在屏幕内
-            if -10 < screen_x < screen.get_width() + 10 and -10 < screen_y < screen.get_height() + 10:
-                alpha = p.get_alpha()
-                color = (*p.color, alpha)
-                
-                # 使用带alpha的表面
-                s = pygame.Surface((int(p.size * 2), int(p.size * 2)), pygame.SRCALPHA)
-                pygame.draw.circle(s, color, (int(p.size), int(p.size)), int(p.size))
-                screen.blit(s, (screen_x - int(p.size), screen_y - int(p.size)))
+    def render(self, screen: pygame.Surface, camera_x: float, camera_y: float, tile_size: int,
+               zoom: float = 1.0):
+        """渲染粒子（预渲染精灵，整批blit）"""
+        self.particles.render(screen, camera_x, camera_y, zoom)
 
 
 class EnvironmentEffects:
@@ -147,24 +112,13 @@ class EnvironmentEffects:
             pygame.draw.circle(screen, color, (center_x, center_y), radius)
             
     @staticmethod
-    def render_day_night_overlay(screen: pygame.Surface, hour: int, minute: int):
-        """渲染日夜叠加效果"""
-        # 计算亮度 (0-1)
-        if 6 <= hour < 18:
-            # 白天
-            peak = 12
-            dist = abs(hour - peak)
-            brightness = 0.3 + 0.7 * (1 - dist / 6)
-        else:
-            # 夜晚
-            brightness = 0.15
-            
-        if brightness < 0.9:
-            # 创建暗化叠加层
-            overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            alpha = int((1 - brightness) * 150)
-            overlay.fill((10, 15, 40, alpha))
-            screen.blit(overlay, (0, 0))
+    def render_day_night_overlay(screen: pygame.Surface, hour: float, minute: int = 0,
+                                 smooth: bool = False):
+        """渲染日夜叠加效果（叠加层来自共享缓存，每帧一次blit）
+
+        smooth=True时按minute在这一小时与下一小时之间平滑过渡
+        """
+        get_overlay_cache().render(screen, int(hour) + minute / 60, smooth=smooth)
             
         # 夜晚灯火效果
         if hour >= 19 or hour < 6:
@@ -36,8 +36,8 @@ class GameCamera:
         """切换上帝模式"""
         self.god_mode = not self.god_mode
         if not self.god_mode:
-            # 退出上帝模式，恢复正常缩放
-            self.zoom = min(self.zoom, self.max_zoom)
+            # 退出上帝模式，恢复正常缩放范围
+            self.zoom = max(self.min_zoom, min(self.zoom, self.max_zoom))
         return self.god_mode
         
     def update(self, screen_width: int, screen_height: int):
@@ -52,15 +52,15 @@ class GameCamera:
             else:
                 target_y_pos = getattr(self.target, 'y', 0)
             
-            target_x = target_x_pos * self.tile_size - screen_width // 2
-            target_y = target_y_pos * self.tile_size - screen_height // 2
+            target_x = target_x_pos * self.tile_size - screen_width / (2 * self.zoom)
+            target_y = target_y_pos * self.tile_size - screen_height / (2 * self.zoom)
             
             self.x += (target_x - self.x) * self.smooth_speed
             self.y += (target_y - self.y) * self.smooth_speed
         
-        # 限制边界
-        max_x = self.world_width * self.tile_size - screen_width
-        max_y = self.world_height * self.tile_size - screen_height
+        # 限制边界（缩放后可见的世界像素范围）
+        max_x = self.world_width * self.tile_size - screen_width / self.zoom
+        max_y = self.world_height * self.tile_size - screen_height / self.zoom
         
         self.x = max(0, min(max_x, self.x))
         self.y = max(0, min(max_y, self.y))
@@ -73,32 +73,31 @@ class GameCamera:
             
     def zoom_in(self):
         """放大"""
-        max_z = self.god_max_zoom if self.god_mode else self.max_zoom
-        self.zoom = min(max_z, self.zoom * 1.1)
+        self.zoom = min(self.max_zoom, self.zoom * 1.1)
         
     def zoom_out(self):
         """缩小"""
-        min_z = self.min_zoom
+        min_z = self.god_max_zoom if self.god_mode else self.min_zoom
         self.zoom = max(min_z, self.zoom / 1.1)
         
     def world_to_screen(self, world_x: float, world_y: float) -> Tuple[int, int]:
         """世界坐标转屏幕坐标"""
-        screen_x = int(world_x * self.tile_size - self.x)
-        screen_y = int(world_y * self.tile_size - self.y)
+        screen_x = int((world_x * self.tile_size - self.x) * self.zoom)
+        screen_y = int((world_y * self.tile_size - self.y) * self.zoom)
         return screen_x, screen_y
         
     def screen_to_world(self, screen_x: int, screen_y: int) -> Tuple[int, int]:
         """屏幕坐标转世界坐标"""
-        world_x = int((screen_x + self.x) / self.tile_size)
-        world_y = int((screen_y + self.y) / self.tile_size)
+        world_x = int((screen_x / self.zoom + self.x) / self.tile_size)
+        world_y = int((screen_y / self.zoom + self.y) / self.tile_size)
         return world_x, world_y
         
     def get_visible_range(self, screen_width: int, screen_height: int) -> Tuple[int, int, int, int]:
         """获取可见范围（用于优化渲染）"""
         start_col = max(0, int(self.x // self.tile_size))
         end_col = min(self.world_width, 
-                     int((self.x + screen_width) // self.tile_size) + 1)
+                     int((self.x + screen_width / self.zoom) // self.tile_size) + 1)
         start_row = max(0, int(self.y // self.tile_size))
         end_row = min(self.world_height, 
-                     int((self.y + screen_height) // self.tile_size) + 1)
+                     int((self.y + screen_height / self.zoom) // self.tile_size) + 1)
         return start_col, end_col, start_row, end_row
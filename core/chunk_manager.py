@@ -1,29 +1,200 @@
 """
 Chunk Manager - 无限世界区块系统（高质量版）
 9宫格动态加载，保持画质一致
+区块数据用uint8数组存储（地形类型 + 变体 + 可行走掩码）
+地形按(seed, cx, cy)播种，整块一次向量化生成
+常驻区块数可设上限（LRU淘汰，已修改的区块写入磁盘）
 """
 
 import random
 import math
-from typing import Dict, Tuple, List, Set
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple, List, Optional, Set
+from dataclasses import dataclass, field, asdict
+
+import numpy as np
+
+from core.chunk_store import ChunkStore
 
 CHUNK_SIZE = 32
 
+# 地形类型编号（uint8）
+TILE_TYPES = ('grass', 'forest', 'mountain', 'water', 'sand')
+TILE_IDS = {name: i for i, name in enumerate(TILE_TYPES)}
+WATER_ID = TILE_IDS['water']
+
+# 不可行走的地形：障碍（树、山）+ 水
+WALKABLE_LUT = np.array([name not in ('forest', 'mountain', 'water') for name in TILE_TYPES],
+                        dtype=bool)
+WATER_LUT = np.array([name == 'water' for name in TILE_TYPES], dtype=bool)
+
+# 最多记住多少个被淘汰过的区块坐标（只用于regenerations统计，超出时忘掉最早的）
+MAX_EVICTED_TRACKED = 4096
+
+# 寻路"靠近水"代价的半径（以格为中心的5x5窗口内有水）
+WATER_PROXIMITY_RADIUS = 2
+
+
 @dataclass
 class Chunk:
+    """区块：32x32的地形类型/变体数组，附带预计算的可行走和水域掩码"""
     cx: int
     cy: int
-    tiles: List[List[Tuple[str, int]]]
-    obstacles: Set[Tuple[int, int]]
-    water: Set[Tuple[int, int]]
+    tile_types: np.ndarray  # (CHUNK_SIZE, CHUNK_SIZE) uint8，按[y, x]索引
+    variants: np.ndarray    # (CHUNK_SIZE, CHUNK_SIZE) uint8
+    version: int = 0
+    walkable: np.ndarray = field(init=False, repr=False)
+    water: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rebuild_masks()
+
+    def _rebuild_masks(self):
+        """重算掩码（地形变化后调用）：直接按地形编号查表得到布尔数组"""
+        self.walkable = WALKABLE_LUT.take(self.tile_types)
+        self.water = WATER_LUT.take(self.tile_types)
+        # 扁平字节掩码（标量查询比numpy索引快一倍），第一次标量查询时才生成
+        self._walkable_bytes = None
+        self._water_bytes = None
+        # 靠近水掩码依赖四周区块，由ChunkManager按需计算
+        self._near_water_bytes = None
+        self._near_water_provisional = False  # 计算时有邻居区块不在内存中（按无水处理）
+
+    def get_tile(self, lx: int, ly: int) -> Tuple[str, int]:
+        return (TILE_TYPES[self.tile_types[ly, lx]], int(self.variants[ly, lx]))
+
+    def is_walkable(self, lx: int, ly: int) -> bool:
+        mask = self._walkable_bytes
+        if mask is None:
+            mask = self._walkable_bytes = self.walkable.tobytes()
+        return mask[ly * CHUNK_SIZE + lx] != 0
+
+    def is_water(self, lx: int, ly: int) -> bool:
+        mask = self._water_bytes
+        if mask is None:
+            mask = self._water_bytes = self.water.tobytes()
+        return mask[ly * CHUNK_SIZE + lx] != 0
+
+    def set_tile(self, lx: int, ly: int, tile_type: str, variant: int = 0):
+        """修改地形，版本号+1"""
+        self.tile_types[ly, lx] = TILE_IDS[tile_type]
+        self.variants[ly, lx] = variant
+        self.version += 1
+        self._rebuild_masks()
+
+    @property
+    def modified(self) -> bool:
+        """是否与种子生成的地形不同"""
+        return self.version > 0
+
+    @property
+    def tiles(self) -> List[List[Tuple[str, int]]]:
+        """兼容旧接口：按行返回(地形, 变体)元组（每次重新构建）"""
+        return [[(TILE_TYPES[t], v) for t, v in zip(type_row, variant_row)]
+                for type_row, variant_row in zip(self.tile_types.tolist(),
+                                                 self.variants.tolist())]
+
+# 地形阈值：noise依次小于各阈值时为 山/树/水，否则为草地
+_TERRAIN_ORDER = np.array([TILE_IDS['mountain'], TILE_IDS['forest'],
+                           TILE_IDS['water'], TILE_IDS['grass']], dtype=np.uint8)
+_THRESHOLDS_CENTER = np.array([0.12, 0.3, 0.4])
+_THRESHOLDS_OUTER = np.array([0.3, 0.5, 0.6])  # 远离中心：更多山地
+_SEED_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def generate_terrain(seed: int, cx: int, cy: int) -> Tuple[np.ndarray, np.ndarray]:
+    """向量化生成整个区块的地形，返回(tile_types, variants)
+
+    随机数流由(seed, cx, cy)唯一确定，同一坐标总是生成相同的区块。
+    """
+    entropy = [seed & _SEED_MASK, cx & _SEED_MASK, cy & _SEED_MASK]
+    rng = np.random.Generator(np.random.PCG64(entropy))
+    noise, variant_noise = rng.random((2, CHUNK_SIZE, CHUNK_SIZE))
+    
+    # 距离中心越远，山地越多
+    thresholds = _THRESHOLDS_OUTER if cx * cx + cy * cy > 25 else _THRESHOLDS_CENTER
+    tile_types = _TERRAIN_ORDER[np.searchsorted(thresholds, noise, side='right')]
+    variants = (variant_noise * 3).astype(np.uint8)
+    return tile_types, variants
+
+
+def generate_terrain_loop(seed: int, cx: int, cy: int) -> Tuple[np.ndarray, np.ndarray]:
+    """逐格生成地形（旧算法，保留用于复现旧种子的世界和基准对比）"""
+    chunk_seed = seed + cx * 10000 + cy
+    rng = random.Random(chunk_seed)
+    
+    tile_types = np.empty((CHUNK_SIZE, CHUNK_SIZE), dtype=np.uint8)
+    variants = np.empty((CHUNK_SIZE, CHUNK_SIZE), dtype=np.uint8)
+    
+    # 距离中心越远，山地越多
+    dist = math.sqrt(cx**2 + cy**2)
+    
+    for y in range(CHUNK_SIZE):
+        for x in range(CHUNK_SIZE):
+            noise = rng.random()
+            
+            # 根据距离调整地形概率
+            if dist > 5:
+                # 远离中心：更多山地
+                if noise < 0.3:
+                    tile_type = 'mountain'
+                elif noise < 0.5:
+                    tile_type = 'forest'
+                elif noise < 0.6:
+                    tile_type = 'water'
+                else:
+                    tile_type = 'grass'
+            else:
+                # 中心区域：更多平地
+                if noise < 0.12:
+                    tile_type = 'mountain'
+                elif noise < 0.3:
+                    tile_type = 'forest'
+                elif noise < 0.4:
+                    tile_type = 'water'
+                else:
+                    tile_type = 'grass'
+                    
+            tile_types[y, x] = TILE_IDS[tile_type]
+            variants[y, x] = rng.randint(0, 2)
+            
+    return tile_types, variants
+
+
+@dataclass
+class ChunkStats:
+    """区块缓存统计"""
+    hits: int = 0            # get_chunk命中常驻区块
+    misses: int = 0          # 未命中（需要生成或从磁盘读取）
+    generated: int = 0       # 按种子生成的区块数（含重新生成）
+    regenerations: int = 0   # 被淘汰后再次生成的区块数
+    evictions: int = 0       # LRU淘汰次数
+    spills: int = 0          # 淘汰时写入磁盘的次数
+    loads: int = 0           # 从磁盘读回的次数
+    prefetched: int = 0      # 后台预取后放入的区块数
+
 
 class ChunkManager:
     """无限世界区块管理器"""
     
-    def __init__(self, seed: int = 42):
+    def __init__(self, seed: int = 42, vectorized: bool = True,
+                 max_resident: Optional[int] = None, spill_dir: Optional[str] = None):
         self.seed = seed
-        self.chunks: Dict[Tuple[int, int], Chunk] = {}
+        # 按最近使用排序（末尾最新）
+        self.chunks: Dict[Tuple[int, int], Chunk] = OrderedDict()
+        # vectorized=False 使用逐格旧算法（与旧版本的世界完全一致）
+        self.terrain_generator = generate_terrain if vectorized else generate_terrain_loop
+        
+        # 常驻区块上限（None表示不限制）
+        self.max_resident = max_resident
+        self.store = ChunkStore(spill_dir)
+        self.stats = ChunkStats()
+        # 被淘汰、尚未重新载入的区块坐标（有序，超出MAX_EVICTED_TRACKED时丢弃最早的）
+        self._evicted: Dict[Tuple[int, int], None] = OrderedDict()
+        # 地形修改计数（set_tile/replace_chunk），跨多帧的计算用它判断期间是否有改动
+        self.edits = 0
+        # 地形修改回调，参数为区块坐标（多进程寻路据此只广播改过的区块）
+        self.edit_listeners: List[Callable[[Tuple[int, int]], None]] = []
         
     def get_chunk_coord(self, world_x: float, world_y: float) -> Tuple[int, int]:
         """获取世界坐标对应的区块坐标"""
@@ -33,63 +204,176 @@ class ChunkManager:
         """获取世界坐标在区块内的局部坐标"""
         return (int(world_x % CHUNK_SIZE), int(world_y % CHUNK_SIZE))
         
+    def build_chunk(self, cx: int, cy: int) -> Chunk:
+        """生成区块数据（不加入self.chunks）"""
+        tile_types, variants = self.terrain_generator(self.seed, cx, cy)
+        return Chunk(cx, cy, tile_types, variants)
+        
     def generate_chunk(self, cx: int, cy: int) -> Chunk:
         """生成新区块"""
-        chunk_seed = self.seed + cx * 10000 + cy
-        rng = random.Random(chunk_seed)
+        chunk = self.build_chunk(cx, cy)
+        self.stats.generated += 1
+        if (cx, cy) in self._evicted:
+            del self._evicted[(cx, cy)]
+            self.stats.regenerations += 1
+        self._insert(chunk)
+        return chunk
         
-        tiles = []
-        obstacles = set()
-        water = set()
+    def get_chunk(self, cx: int, cy: int) -> Chunk:
+        """获取区块（不存在则从磁盘读取或生成）"""
+        chunk = self.chunks.get((cx, cy))
+        if chunk is not None:
+            self.stats.hits += 1
+            if self.max_resident is not None:
+                self.chunks.move_to_end((cx, cy))
+            return chunk
+            
+        self.stats.misses += 1
+        saved = self.store.load(cx, cy)
+        if saved is None:
+            return self.generate_chunk(cx, cy)
+            
+        version, tile_types, variants = saved
+        chunk = Chunk(cx, cy, tile_types, variants, version)
+        self.stats.loads += 1
+        self._evicted.pop((cx, cy), None)
+        self._insert(chunk)
+        return chunk
         
-        # 距离中心越远，山地越多
-        dist = math.sqrt(cx**2 + cy**2)
+    def chunk_version(self, cx: int, cy: int) -> int:
+        """区块当前的版本号，不生成、不读盘、不影响LRU顺序
+
+        不常驻的区块取磁盘上保存的版本（未修改过的为0），与之后重新载入时一致
+        """
+        chunk = self.chunks.get((cx, cy))
+        if chunk is not None:
+            return chunk.version
+        return self.store.saved.get((cx, cy), 0)
+        
+    def adopt_chunk(self, chunk: Chunk) -> bool:
+        """放入在别处（如预取线程）生成的区块；已常驻或磁盘上有修改版本时丢弃"""
+        coord = (chunk.cx, chunk.cy)
+        if coord in self.chunks or coord in self.store:
+            return False
+        self.stats.prefetched += 1
+        if coord in self._evicted:
+            del self._evicted[coord]
+            self.stats.regenerations += 1
+        self._insert(chunk)
+        return True
         
-        for y in range(CHUNK_SIZE):
-            row = []
-            for x in range(CHUNK_SIZE):
-                noise = rng.random()
+    def replace_chunk(self, chunk: Chunk):
+        """用外部传来的区块（如主进程广播的修改）覆盖本地副本"""
+        coord = (chunk.cx, chunk.cy)
+        self.chunks.pop(coord, None)
+        self._insert(chunk)
+        self._notify_edit(coord)
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                neighbor = self.chunks.get((chunk.cx + dx, chunk.cy + dy))
+                if neighbor is not None:
+                    neighbor._near_water_bytes = None
+                    
+    def _insert(self, chunk: Chunk):
+        """加入常驻区块，超出上限时淘汰最久未使用的"""
+        self.chunks[(chunk.cx, chunk.cy)] = chunk
+        # 邻居的靠近水掩码若是在本区块缺席时算的，作废后按需重算
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                neighbor = self.chunks.get((chunk.cx + dx, chunk.cy + dy))
+                if neighbor is not None and neighbor._near_water_provisional:
+                    neighbor._near_water_bytes = None
+        if self.max_resident is None:
+            return
+        while len(self.chunks) > max(1, self.max_resident):
+            _, old = self.chunks.popitem(last=False)
+            self._evict(old)
+            
+    def _evict(self, chunk: Chunk):
+        """淘汰区块：已修改的写入磁盘，未修改的丢弃（之后按种子重新生成）"""
+        self.stats.evictions += 1
+        self._evicted[(chunk.cx, chunk.cy)] = None
+        if len(self._evicted) > MAX_EVICTED_TRACKED:
+            self._evicted.popitem(last=False)
+        if chunk.modified and not self.store.has_version(chunk.cx, chunk.cy, chunk.version):
+            self.store.save(chunk.cx, chunk.cy, chunk.version,
+                            chunk.tile_types, chunk.variants)
+            self.stats.spills += 1
+            
+    def set_tile(self, world_x: float, world_y: float, tile_type: str, variant: int = 0):
+        """修改世界坐标处的地形"""
+        cx, cy = self.get_chunk_coord(world_x, world_y)
+        lx, ly = self.get_tile_in_chunk(world_x, world_y)
+        self.get_chunk(cx, cy).set_tile(lx, ly, tile_type, variant)
+        self._notify_edit((cx, cy))
+        # 水域变化会影响相邻区块边缘的靠近水掩码
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                neighbor = self.chunks.get((cx + dx, cy + dy))
+                if neighbor is not None:
+                    neighbor._near_water_bytes = None
+                    
+    def _notify_edit(self, coord: Tuple[int, int]):
+        self.edits += 1
+        for listener in self.edit_listeners:
+            listener(coord)
+            
+    def _build_near_water(self, chunk: Chunk) -> bytes:
+        """计算区块的靠近水掩码：把3x3邻域的水域膨胀WATER_PROXIMITY_RADIUS格
+
+        邻居只读常驻区块或磁盘上的修改版本，不生成、不影响LRU顺序；
+        缺席的邻居按无水处理，掩码记为临时的，该邻居放入内存时作废重算
+        """
+        r = WATER_PROXIMITY_RADIUS
+        size = CHUNK_SIZE + 2 * r
+        water = np.zeros((size, size), dtype=bool)
+        # 每个方向上 (来源切片, 目标切片)
+        spans = {-1: (slice(CHUNK_SIZE - r, CHUNK_SIZE), slice(0, r)),
+                 0: (slice(0, CHUNK_SIZE), slice(r, r + CHUNK_SIZE)),
+                 1: (slice(0, r), slice(r + CHUNK_SIZE, size))}
+        provisional = False
+        for dy, (src_y, dst_y) in spans.items():
+            for dx, (src_x, dst_x) in spans.items():
+                source = chunk.water if dx == 0 and dy == 0 else \
+                    self._peek_water(chunk.cx + dx, chunk.cy + dy)
+                if source is None:
+                    provisional = True
+                    continue
+                water[dst_y, dst_x] = source[src_y, src_x]
                 
-                # 根据距离调整地形概率
-                if dist > 5:
-                    # 远离中心：更多山地
-                    if noise < 0.3:
-                        tile_type = 'mountain'
-                        obstacles.add((x, y))
-                    elif noise < 0.5:
-                        tile_type = 'forest'
-                        obstacles.add((x, y))
-                    elif noise < 0.6:
-                        tile_type = 'water'
-                        water.add((x, y))
-                    else:
-                        tile_type = 'grass'
-                else:
-                    # 中心区域：更多平地
-                    if noise < 0.12:
-                        tile_type = 'mountain'
-                        obstacles.add((x, y))
-                    elif noise < 0.3:
-                        tile_type = 'forest'
-                        obstacles.add((x, y))
-                    elif noise < 0.4:
-                        tile_type = 'water'
-                        water.add((x, y))
-                    else:
-                        tile_type = 'grass'
-                        
-                row.append((tile_type, rng.randint(0, 2)))
-            tiles.append(row)
+        # 可分离膨胀：先沿x，再沿y
+        rows = np.zeros((size, CHUNK_SIZE), dtype=bool)
+        for offset in range(2 * r + 1):
+            rows |= water[:, offset:offset + CHUNK_SIZE]
+        near = np.zeros((CHUNK_SIZE, CHUNK_SIZE), dtype=bool)
+        for offset in range(2 * r + 1):
+            near |= rows[offset:offset + CHUNK_SIZE, :]
             
-        chunk = Chunk(cx, cy, tiles, obstacles, water)
-        self.chunks[(cx, cy)] = chunk
-        return chunk
+        chunk._near_water_bytes = near.tobytes()
+        chunk._near_water_provisional = provisional
+        return chunk._near_water_bytes
         
-    def get_chunk(self, cx: int, cy: int) -> Chunk:
-        """获取区块（不存在则生成）"""
-        if (cx, cy) not in self.chunks:
-            return self.generate_chunk(cx, cy)
-        return self.chunks[(cx, cy)]
+    def _peek_water(self, cx: int, cy: int) -> Optional[np.ndarray]:
+        """不生成区块地读取水域掩码：常驻的直接取，写过盘的从磁盘读（不放入内存），否则None"""
+        chunk = self.chunks.get((cx, cy))
+        if chunk is not None:
+            return chunk.water
+        saved = self.store.load(cx, cy)
+        if saved is not None:
+            return WATER_LUT.take(saved[1])
+        return None
+        
+    def get_stats(self) -> Dict:
+        """区块缓存统计（用于调整常驻上限）"""
+        stats = asdict(self.stats)
+        stats['resident'] = len(self.chunks)
+        stats['max_resident'] = self.max_resident
+        stats['spilled_on_disk'] = len(self.store.saved)
+        return stats
+        
+    def close(self):
+        """退出时调用：删除区块磁盘存储的临时目录"""
+        self.store.close()
         
     def get_tile(self, world_x: float, world_y: float) -> Tuple[str, int]:
         """获取世界坐标的地形"""
@@ -97,7 +381,7 @@ class ChunkManager:
         lx, ly = self.get_tile_in_chunk(world_x, world_y)
         chunk = self.get_chunk(cx, cy)
         if 0 <= ly < CHUNK_SIZE and 0 <= lx < CHUNK_SIZE:
-            return chunk.tiles[ly][lx]
+            return chunk.get_tile(lx, ly)
         return ('grass', 0)
         
     def is_walkable(self, world_x: float, world_y: float) -> bool:
@@ -105,34 +389,103 @@ class ChunkManager:
         cx, cy = self.get_chunk_coord(world_x, world_y)
         lx, ly = self.get_tile_in_chunk(world_x, world_y)
         chunk = self.get_chunk(cx, cy)
-        return (lx, ly) not in chunk.obstacles and (lx, ly) not in chunk.water
+        return chunk.is_walkable(lx, ly)
+        
+    def is_walkable_many(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """批量is_walkable：按区块分组，每个区块一次掩码索引"""
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        result = np.zeros(len(xs), dtype=bool)
+        if not len(xs):
+            return result
+        cxs = np.floor_divide(xs, CHUNK_SIZE).astype(np.int64)
+        cys = np.floor_divide(ys, CHUNK_SIZE).astype(np.int64)
+        # 负的极小值取模可能得到CHUNK_SIZE本身，夹到区块内
+        lxs = np.minimum(np.mod(xs, CHUNK_SIZE).astype(np.int64), CHUNK_SIZE - 1)
+        lys = np.minimum(np.mod(ys, CHUNK_SIZE).astype(np.int64), CHUNK_SIZE - 1)
+        # 按区块排序后切成连续段，每段一个区块
+        base_x, base_y = cxs.min(), cys.min()
+        keys = (cxs - base_x) * (cys.max() - base_y + 1) + (cys - base_y)
+        order = np.argsort(keys, kind='stable')
+        bounds = np.flatnonzero(np.diff(keys[order])) + 1
+        for members in np.split(order, bounds):
+            first = members[0]
+            chunk = self.get_chunk(int(cxs[first]), int(cys[first]))
+            result[members] = chunk.walkable[lys[members], lxs[members]]
+        return result
         
     def is_water(self, world_x: float, world_y: float) -> bool:
         """检查是否是水"""
         cx, cy = self.get_chunk_coord(world_x, world_y)
         lx, ly = self.get_tile_in_chunk(world_x, world_y)
         chunk = self.get_chunk(cx, cy)
-        return (lx, ly) in chunk.water
+        return chunk.is_water(lx, ly)
+        
+    def is_near_water(self, world_x: float, world_y: float) -> bool:
+        """检查WATER_PROXIMITY_RADIUS格内是否有水（查预计算掩码，O(1)）"""
+        cx, cy = self.get_chunk_coord(world_x, world_y)
+        lx, ly = self.get_tile_in_chunk(world_x, world_y)
+        chunk = self.get_chunk(cx, cy)
+        mask = chunk._near_water_bytes
+        if mask is None:
+            mask = self._build_near_water(chunk)
+        return mask[ly * CHUNK_SIZE + lx] != 0
+        
+    def near_water_bytes(self, chunk: Chunk) -> bytes:
+        """区块的靠近水掩码（按行展开的字节，按需计算；不生成邻居区块）"""
+        mask = chunk._near_water_bytes
+        if mask is None:
+            mask = self._build_near_water(chunk)
+        return mask
+
+    def find_spawn_point(self, x: int, y: int, min_region: int = 256,
+                         max_radius: int = 64) -> Tuple[int, int]:
+        """离(x, y)最近、且所在连通区域至少有min_region格的可行走格（避免出生在水洼或孤岛里）"""
+        trapped: Set[Tuple[int, int]] = set()
+        for r in range(max_radius + 1):
+            for dx in range(-r, r + 1):
+                for dy in range(-r, r + 1):
+                    if max(abs(dx), abs(dy)) != r:
+                        continue
+                    start = (x + dx, y + dy)
+                    if start in trapped or not self.is_walkable(*start):
+                        continue
+                    region = self._flood_region(start, min_region)
+                    if len(region) >= min_region:
+                        return start
+                    trapped |= region
+        return (x, y)
+        
+    def _flood_region(self, start: Tuple[int, int], limit: int) -> Set[Tuple[int, int]]:
+        """从start出发的可行走连通区域（8方向，斜向不穿角），最多limit格"""
+        region = {start}
+        frontier = [start]
+        while frontier and len(region) < limit:
+            px, py = frontier.pop()
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    tile = (px + dx, py + dy)
+                    if tile in region or not self.is_walkable(*tile):
+                        continue
+                    if dx and dy and not (self.is_walkable(px + dx, py) and self.is_walkable(px, py + dy)):
+                        continue
+                    region.add(tile)
+                    frontier.append(tile)
+        return region
         
     def update_loaded_chunks(self, center_x: float, center_y: float):
         """更新加载的区块（9宫格）"""
         center_cx, center_cy = self.get_chunk_coord(center_x, center_y)
         for dx in range(-1, 2):
             for dy in range(-1, 2):
-                cx, cy = center_cx + dx, center_cy + dy
-                if (cx, cy) not in self.chunks:
-                    self.generate_chunk(cx, cy)
+                self.get_chunk(center_cx + dx, center_cy + dy)
                     
     def get_render_chunks(self, camera_x: float, camera_y: float, 
-                         screen_width: int, screen_height: int) -> List[Chunk]:
-        """获取需要渲染的区块列表"""
-        start_cx = int(camera_x // (CHUNK_SIZE * 32))
-        end_cx = int((camera_x + screen_width) // (CHUNK_SIZE * 32)) + 1
-        start_cy = int(camera_y // (CHUNK_SIZE * 32))
-        end_cy = int((camera_y + screen_height) // (CHUNK_SIZE * 32)) + 1
-        
-        chunks = []
-        for cx in range(start_cx, end_cx + 1):
-            for cy in range(start_cy, end_cy + 1):
-                chunks.append(self.get_chunk(cx, cy))
-        return chunks
+                         screen_width: int, screen_height: int,
+                         zoom: float = 1.0, tile_size: int = 32) -> List[Chunk]:
+        """获取与视野相交的区块列表（考虑缩放和瓦片尺寸）"""
+        from core.culling import visible_chunk_coords
+        
+        return [self.get_chunk(cx, cy)
+                for cx, cy in visible_chunk_coords(camera_x, camera_y, screen_width,
+                                                   screen_height, zoom, tile_size)]
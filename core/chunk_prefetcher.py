@@ -0,0 +1,162 @@
+"""
+Chunk Prefetcher - 区块后台预取
+根据相机速度和AI当前路径的终点预测即将用到的区块，在工作线程/进程中提前生成，
+主线程每帧只把已完成的区块放入ChunkManager
+"""
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.chunk_manager import CHUNK_SIZE, Chunk
+
+# 估计路径终点处行进方向时回看的路径点数
+PATH_HEADING_POINTS = 8
+
+
+def _build_chunk(generator: Callable, seed: int, cx: int, cy: int) -> Chunk:
+    """在工作线程/进程中生成区块（纯函数，不访问ChunkManager）"""
+    tile_types, variants = generator(seed, cx, cy)
+    return Chunk(cx, cy, tile_types, variants)
+
+
+class ChunkPrefetcher:
+    """区块预取器"""
+
+    def __init__(self, chunk_manager, workers: int = 1, use_processes: bool = False,
+                 lookahead: float = 0.75, margin_chunks: float = 0.5,
+                 max_pending: int = 32):
+        self.chunk_manager = chunk_manager
+        self.lookahead = lookahead          # 按当前速度预测多少秒后的视野
+        self.margin_chunks = margin_chunks  # 视野外额外预取的边距（区块）
+        self.max_pending = max_pending
+
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor: Executor = pool_cls(max_workers=workers)
+        self.pending: Dict[Tuple[int, int], Future] = {}
+
+        # 相机速度估计
+        self._last_camera_pos: Optional[Tuple[float, float]] = None
+        self.camera_velocity = (0.0, 0.0)
+
+        self.submitted = 0
+        self.adopted = 0
+        self.discarded = 0
+
+    # ------------------------------------------------------------------
+    # 预测
+    # ------------------------------------------------------------------
+    def predict_camera_chunks(self, camera, screen_width: int, screen_height: int,
+                              dt: float) -> List[Tuple[int, int]]:
+        """视野（沿速度方向外推lookahead秒，再加边距）覆盖的区块"""
+        pos = (camera.x, camera.y)
+        if self._last_camera_pos is not None and dt > 0:
+            self.camera_velocity = ((pos[0] - self._last_camera_pos[0]) / dt,
+                                    (pos[1] - self._last_camera_pos[1]) / dt)
+        self._last_camera_pos = pos
+
+        zoom = getattr(camera, 'zoom', 1.0) or 1.0
+        chunk_px = CHUNK_SIZE * camera.tile_size
+        view_w = screen_width / zoom
+        view_h = screen_height / zoom
+        ahead_x = self.camera_velocity[0] * self.lookahead
+        ahead_y = self.camera_velocity[1] * self.lookahead
+        margin = self.margin_chunks * chunk_px
+
+        left = min(pos[0], pos[0] + ahead_x) - margin
+        right = max(pos[0], pos[0] + ahead_x) + view_w + margin
+        top = min(pos[1], pos[1] + ahead_y) - margin
+        bottom = max(pos[1], pos[1] + ahead_y) + view_h + margin
+
+        coords = []
+        for cy in range(int(top // chunk_px), int(bottom // chunk_px) + 1):
+            for cx in range(int(left // chunk_px), int(right // chunk_px) + 1):
+                coords.append((cx, cy))
+        return coords
+
+    def predict_path_chunks(self, agents: Iterable) -> List[Tuple[int, int]]:
+        """AI到达终点后下一次寻路会读到的区块
+
+        路径本身经过的区块在寻路时已经同步生成，预取它们没有意义；这里取终点所在的9宫格，
+        外加沿最后一段行进方向再往前一个区块（终点附近的优先）
+        """
+        coords = []
+        seen = set()
+        for agent in agents:
+            movement = getattr(agent, 'movement', None)
+            if movement is None or not movement.is_moving:
+                continue
+            path = movement.path  # list或MovementSystem的(n, 2)数组
+            if len(path) == 0:
+                continue
+            ex, ey = float(path[-1][0]), float(path[-1][1])
+            cx, cy = int(ex // CHUNK_SIZE), int(ey // CHUNK_SIZE)
+            # 行进方向：路径最后一段（至多PATH_HEADING_POINTS个点）的总体朝向
+            heading_from = path[max(0, len(path) - PATH_HEADING_POINTS)]
+            px, py = float(heading_from[0]), float(heading_from[1])
+            step_x = (ex > px) - (ex < px)
+            step_y = (ey > py) - (ey < py)
+            ahead = [(cx, cy), (cx + step_x, cy + step_y), (cx + 2 * step_x, cy + 2 * step_y)]
+            around = [(cx + dx, cy + dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+            for coord in ahead + around:
+                if coord not in seen:
+                    seen.add(coord)
+                    coords.append(coord)
+        return coords
+
+    # ------------------------------------------------------------------
+    # 调度
+    # ------------------------------------------------------------------
+    def request(self, coords: Iterable[Tuple[int, int]]) -> int:
+        """提交未常驻、未在队列中的区块，返回新提交数量"""
+        manager = self.chunk_manager
+        count = 0
+        for coord in coords:
+            if len(self.pending) >= self.max_pending:
+                break
+            # 已常驻/排队中/磁盘上有修改版本的区块不需要生成
+            if coord in manager.chunks or coord in self.pending or coord in manager.store:
+                continue
+            self.pending[coord] = self.executor.submit(
+                _build_chunk, manager.terrain_generator, manager.seed, coord[0], coord[1])
+            self.submitted += 1
+            count += 1
+        return count
+
+    def collect(self) -> int:
+        """主线程调用：把已完成的区块交给ChunkManager，返回放入数量"""
+        done = [coord for coord, future in self.pending.items() if future.done()]
+        adopted = 0
+        for coord in done:
+            future = self.pending.pop(coord)
+            if future.exception() is not None:
+                self.discarded += 1
+                continue
+            if self.chunk_manager.adopt_chunk(future.result()):
+                adopted += 1
+            else:
+                self.discarded += 1
+        self.adopted += adopted
+        return adopted
+
+    def update(self, dt: float, camera=None, agents: Iterable = (),
+               screen_size: Tuple[int, int] = (0, 0)):
+        """每帧调用：收取完成的区块，然后按预测提交新任务（相机优先）"""
+        self.collect()
+        if camera is not None:
+            self.request(self.predict_camera_chunks(camera, screen_size[0], screen_size[1], dt))
+        self.request(self.predict_path_chunks(agents))
+
+    def get_stats(self) -> Dict:
+        return {
+            'pending': len(self.pending),
+            'submitted': self.submitted,
+            'adopted': self.adopted,
+            'discarded': self.discarded,
+        }
+
+    def shutdown(self):
+        """停止工作线程/进程（丢弃未开始的任务）"""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
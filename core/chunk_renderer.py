@@ -0,0 +1,211 @@
+"""
+Chunk Renderer - 区块预渲染缓存
+每个区块只渲染一次到整块Surface，之后每帧一次blit；地形变化（版本号改变）时重绘
+缩小时使用多级细节（LOD）：32px/瓦片原图、8px/瓦片缩略图、1px/瓦片色块图
+"""
+
+import math
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+import pygame
+
+from core.chunk_manager import CHUNK_SIZE, TILE_TYPES, Chunk
+
+BACKGROUND_COLOR = (20, 25, 20)
+
+# LOD级别：每瓦片像素数。屏幕上每瓦片像素 >= 阈值时使用该级别
+LOD_LEVELS = (
+    (16.0, None),  # 原图（tile_size px/瓦片）
+    (4.0, 8),      # 8px/瓦片
+    (0.0, 1),      # 1px/瓦片（平均色）
+)
+
+
+class ChunkSurfaceCache:
+    """区块Surface的LRU缓存"""
+
+    def __init__(self, tileset, tile_size: int = 32, max_surfaces: int = 16,
+                 max_lod_surfaces: int = 1024, max_scaled_pixels: int = 16 * 1024 * 1024):
+        self.tileset = tileset
+        self.tile_size = tile_size
+        self.max_surfaces = max_surfaces  # 1024x1024x4字节 ≈ 4MB/张
+        self.surfaces: Dict[Tuple[int, int], Tuple[int, pygame.Surface]] = OrderedDict()
+
+        # 低细节底图：(cx, cy, 每瓦片像素) -> (version, Surface)
+        self.max_lod_surfaces = max_lod_surfaces
+        self.lod_surfaces: Dict[Tuple[int, int, int], Tuple[int, pygame.Surface]] = OrderedDict()
+        # 按当前缩放缩放好的区块：(cx, cy, 边长) -> (version, Surface)，按像素总量限制
+        self.max_scaled_pixels = max_scaled_pixels
+        self.scaled_surfaces: Dict[Tuple[int, int, int], Tuple[int, pygame.Surface]] = OrderedDict()
+        self._scaled_pixels = 0
+
+        self._small_tiles: Dict[int, Dict[str, pygame.Surface]] = {}
+        self._palette = None
+
+        self.hits = 0
+        self.renders = 0
+
+    def get_surface(self, chunk: Chunk) -> pygame.Surface:
+        """获取区块Surface（版本不一致时重绘）"""
+        key = (chunk.cx, chunk.cy)
+        cached = self.surfaces.get(key)
+        if cached is not None and cached[0] == chunk.version:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return cached[1]
+
+        surface = self._render_chunk(chunk)
+        self.surfaces[key] = (chunk.version, surface)
+        self.surfaces.move_to_end(key)
+        while len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def _render_chunk(self, chunk: Chunk, tile_size: int = None, tiles: Dict = None) -> pygame.Surface:
+        """把整个区块的瓦片画到一张Surface上"""
+        tile_size = tile_size or self.tile_size
+        size = CHUNK_SIZE * tile_size
+        surface = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        # 树等瓦片带透明背景，先铺底色（与屏幕背景一致）
+        surface.fill(BACKGROUND_COLOR)
+
+        if tiles is None:
+            get_tile = self.tileset.get_tile
+        else:
+            def get_tile(tile_type, variant):
+                return tiles.get(f"{tile_type}_{variant % 3}", tiles['grass_0'])
+        blits = []
+        rows = zip(chunk.tile_types.tolist(), chunk.variants.tolist())
+        for y, (type_row, variant_row) in enumerate(rows):
+            for x, (type_id, variant) in enumerate(zip(type_row, variant_row)):
+                blits.append((get_tile(TILE_TYPES[type_id], variant),
+                              (x * tile_size, y * tile_size)))
+        surface.blits(blits, doreturn=False)
+
+        self.renders += 1
+        return surface
+
+    # ------------------------------------------------------------------
+    # 多级细节（LOD）
+    # ------------------------------------------------------------------
+    def get_lod_surface(self, chunk: Chunk, tile_px: int) -> pygame.Surface:
+        """获取每瓦片tile_px像素的低细节底图"""
+        key = (chunk.cx, chunk.cy, tile_px)
+        cached = self.lod_surfaces.get(key)
+        if cached is not None and cached[0] == chunk.version:
+            self.lod_surfaces.move_to_end(key)
+            return cached[1]
+
+        if tile_px == 1:
+            surface = self._render_palette_chunk(chunk)
+        else:
+            surface = self._render_chunk(chunk, tile_px, self._get_small_tiles(tile_px))
+        self.lod_surfaces[key] = (chunk.version, surface)
+        while len(self.lod_surfaces) > self.max_lod_surfaces:
+            self.lod_surfaces.popitem(last=False)
+        return surface
+
+    def _get_small_tiles(self, tile_px: int) -> Dict[str, pygame.Surface]:
+        """把瓦片集缩小到tile_px（每种瓦片只缩放一次）"""
+        tiles = self._small_tiles.get(tile_px)
+        if tiles is None:
+            tiles = {name: pygame.transform.smoothscale(tile, (tile_px, tile_px))
+                     for name, tile in self.tileset.tiles.items()}
+            self._small_tiles[tile_px] = tiles
+        return tiles
+
+    def _get_palette(self) -> np.ndarray:
+        """每种(地形, 变体)的平均颜色，索引为 type_id * 3 + variant"""
+        if self._palette is None:
+            palette = np.zeros((len(TILE_TYPES) * 3, 3), dtype=np.uint8)
+            for type_id, tile_type in enumerate(TILE_TYPES):
+                for variant in range(3):
+                    tile = self.tileset.get_tile(tile_type, variant)
+                    # 透明瓦片先叠在底色上再取平均
+                    flat = pygame.Surface(tile.get_size())
+                    flat.fill(BACKGROUND_COLOR)
+                    flat.blit(tile, (0, 0))
+                    palette[type_id * 3 + variant] = pygame.transform.average_color(flat)[:3]
+            self._palette = palette
+        return self._palette
+
+    def _render_palette_chunk(self, chunk: Chunk) -> pygame.Surface:
+        """1px/瓦片：按调色板直接由数组生成"""
+        indices = chunk.tile_types.astype(np.intp) * 3 + chunk.variants % 3
+        rgb = self._get_palette()[indices]  # (y, x, 3)
+        self.renders += 1
+        return pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+
+    def get_scaled_surface(self, chunk: Chunk, zoom: float) -> pygame.Surface:
+        """缩小（zoom < 1）后的整块Surface，按LOD选择底图后缩放并缓存"""
+        size = math.ceil(CHUNK_SIZE * self.tile_size * zoom)
+        key = (chunk.cx, chunk.cy, size)
+        cached = self.scaled_surfaces.get(key)
+        if cached is not None and cached[0] == chunk.version:
+            self.hits += 1
+            self.scaled_surfaces.move_to_end(key)
+            return cached[1]
+
+        tile_px = self.tile_size * zoom
+        base = None
+        for threshold, level_px in LOD_LEVELS:
+            if tile_px >= threshold:
+                base = self.get_surface(chunk) if level_px is None else self.get_lod_surface(chunk, level_px)
+                break
+        if base.get_width() == size:
+            surface = base
+        elif base.get_width() > size:
+            surface = pygame.transform.smoothscale(base, (size, size))
+        else:
+            surface = pygame.transform.scale(base, (size, size))
+
+        old = self.scaled_surfaces.pop(key, None)
+        if old is not None:
+            self._scaled_pixels -= size * size
+        self.scaled_surfaces[key] = (chunk.version, surface)
+        self._scaled_pixels += size * size
+        while self._scaled_pixels > self.max_scaled_pixels and len(self.scaled_surfaces) > 1:
+            (_, _, old_size), _ = self.scaled_surfaces.popitem(last=False)
+            self._scaled_pixels -= old_size * old_size
+        return surface
+
+    def draw(self, screen: pygame.Surface, chunk: Chunk, camera_x: float, camera_y: float,
+             area: pygame.Rect, zoom: float = 1.0):
+        """绘制区块：area为区块内可见的像素范围（原始尺寸坐标）"""
+        origin_x = chunk.cx * CHUNK_SIZE * self.tile_size
+        origin_y = chunk.cy * CHUNK_SIZE * self.tile_size
+
+        if zoom == 1.0:
+            # 原始尺寸：只blit可见子矩形
+            screen.blit(self.get_surface(chunk),
+                        (origin_x - int(camera_x) + area.x, origin_y - int(camera_y) + area.y), area)
+        elif zoom < 1.0:
+            # 缩小：整块缓存的LOD图，一次blit
+            pos = (math.floor((origin_x - camera_x) * zoom), math.floor((origin_y - camera_y) * zoom))
+            screen.blit(self.get_scaled_surface(chunk, zoom), pos)
+        else:
+            # 放大：只缩放可见部分（放大后的整块太大，不缓存）
+            visible = self.get_surface(chunk).subsurface(area)
+            size = (math.ceil(area.width * zoom), math.ceil(area.height * zoom))
+            pos = (math.floor((origin_x + area.x - camera_x) * zoom),
+                   math.floor((origin_y + area.y - camera_y) * zoom))
+            screen.blit(pygame.transform.scale(visible, size), pos)
+
+    def invalidate(self, cx: int, cy: int):
+        """丢弃某个区块的缓存"""
+        self.surfaces.pop((cx, cy), None)
+        for cache in (self.lod_surfaces, self.scaled_surfaces):
+            for key in [k for k in cache if k[0] == cx and k[1] == cy]:
+                del cache[key]
+                if cache is self.scaled_surfaces:
+                    self._scaled_pixels -= key[2] * key[2]
+
+    def clear(self):
+        self.surfaces.clear()
+        self.lod_surfaces.clear()
+        self.scaled_surfaces.clear()
+        self._scaled_pixels = 0
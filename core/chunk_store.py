@@ -0,0 +1,83 @@
+"""
+Chunk Store - 区块磁盘存储
+被淘汰的已修改区块写入磁盘（zlib压缩的uint8数组），未修改区块直接按种子重新生成
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 文件头：cx, cy, version, 区块边长
+_HEADER = struct.Struct('<iiIH')
+
+
+class ChunkStore:
+    """每个区块一个小文件：<dir>/c_<cx>_<cy>.bin"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+        self._owns_directory = directory is None  # 临时目录由自己创建，close时删除
+        self.saved: Dict[Tuple[int, int], int] = {}  # 坐标 -> 已写入的版本号
+        self.bytes_written = 0
+
+    @property
+    def directory(self) -> str:
+        """存储目录（未指定时首次写入才创建临时目录）"""
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='another_you_chunks_')
+        else:
+            os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def _path(self, cx: int, cy: int) -> str:
+        return os.path.join(self.directory, f"c_{cx}_{cy}.bin")
+
+    def __contains__(self, coord: Tuple[int, int]) -> bool:
+        return coord in self.saved
+
+    def has_version(self, cx: int, cy: int, version: int) -> bool:
+        """磁盘上是否已有该版本（避免重复写入）"""
+        return self.saved.get((cx, cy)) == version
+
+    def save(self, cx: int, cy: int, version: int,
+             tile_types: np.ndarray, variants: np.ndarray):
+        """写入区块（先写临时文件再替换，避免半截文件）"""
+        size = tile_types.shape[0]
+        payload = zlib.compress(tile_types.tobytes() + variants.tobytes(), 1)
+        data = _HEADER.pack(cx, cy, version, size) + payload
+
+        path = self._path(cx, cy)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self.saved[(cx, cy)] = version
+        self.bytes_written += len(data)
+
+    def load(self, cx: int, cy: int) -> Optional[Tuple[int, np.ndarray, np.ndarray]]:
+        """读取区块，返回(version, tile_types, variants)；不存在返回None"""
+        if (cx, cy) not in self.saved:
+            return None
+        with open(self._path(cx, cy), 'rb') as f:
+            data = f.read()
+
+        _, _, version, size = _HEADER.unpack_from(data)
+        raw = zlib.decompress(data[_HEADER.size:])
+        cells = size * size
+        tile_types = np.frombuffer(raw, dtype=np.uint8, count=cells).reshape(size, size).copy()
+        variants = np.frombuffer(raw, dtype=np.uint8, count=cells,
+                                 offset=cells).reshape(size, size).copy()
+        return version, tile_types, variants
+
+    def close(self):
+        """退出时清理：自己创建的临时目录整个删除，调用方指定的目录保持原样"""
+        if self._owns_directory and self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+            self.saved.clear()
@@ -1,20 +1,71 @@
 """
 Collision Pathfinder - 碰撞感知A*寻路
 绕树、避水、遵守世界规则
+结果经PathCache缓存，热门起终点共享流场（流场在background_jobs里排队，
+由PathScheduler在寻路请求之后用剩余预算构建；同步find_path在返回前建好）
+搜索可分片执行（find_path_steps），供PathScheduler按帧预算推进
+mode='jps'时用跳点搜索（core.jump_point），近水加价区的边界也作为跳点；
+跳跃逐格经过区块回调和近水判断，主要收益是展开数减半，耗时只与A*相当或略快
 """
 
 import heapq
-from typing import List, Tuple, Optional, Dict
+from collections import deque
+from typing import Dict, Generator, List, Optional, Tuple
+
+from core.chunk_manager import WATER_PROXIMITY_RADIUS
+from core.jump_point import jps_search_steps
+from core.path_cache import FlowField, PathCache, chunks_in_box, tiles_box
+
+NEIGHBOR_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1),
+                    (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+# 分片搜索时每展开多少个节点让出一次
+SEARCH_SLICE = 64
+
+# 搜索模式：逐格A* / 跳点搜索
+PATH_MODES = ('astar', 'jps')
+
+
+def run_steps(steps: Generator):
+    """把分片生成器一次跑完，返回其结果"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
 
 class CollisionPathfinder:
     """碰撞感知路径寻找器"""
     
-    def __init__(self, chunk_manager):
+    def __init__(self, chunk_manager, use_cache: bool = True, mode: str = 'astar'):
+        if mode not in PATH_MODES:
+            raise ValueError(f"未知寻路模式: {mode}")
         self.chunk_manager = chunk_manager
+        self.mode = mode
+        # 路径缓存（按区块版本失效，热门起终点共享流场）
+        self.cache: Optional[PathCache] = PathCache(chunk_manager) if use_cache else None
+        self.calls = 0
+        self.searches = 0
+        self.expansions = 0
+        self.last_expansions = 0
+        # 上一次失败搜索读取过的格子范围（外接矩形）；跳点搜索的扫描线不在其中，为None
+        self.last_searched = None
+        # 待构建的流场（分片生成器），不占用触发它的那次寻路
+        self.background_jobs: deque = deque()
         
     def find_path(self, start_x: float, start_y: float, 
                   end_x: float, end_y: float, max_distance: int = 50) -> List[Tuple[int, int]]:
         """A*寻路，避开障碍和水域"""
+        path = run_steps(self.find_path_steps(start_x, start_y, end_x, end_y, max_distance))
+        # 没有调度器时没有空闲预算可用，流场照旧在本次调用里建好
+        while self.background_jobs:
+            run_steps(self.background_jobs.popleft())
+        return path
+        
+    def find_path_steps(self, start_x: float, start_y: float, end_x: float, end_y: float,
+                        max_distance: int = 50) -> Generator[None, None, List[Tuple[int, int]]]:
+        """可分片执行的find_path：每展开SEARCH_SLICE个节点yield一次，结果作为返回值"""
+        self.calls += 1
         start = (int(start_x), int(start_y))
         end = (int(end_x), int(end_y))
         
@@ -24,42 +75,73 @@ class CollisionPathfinder:
             if end is None:
                 return []
                 
+        if self.cache is None:
+            return (yield from self._search_steps(start, end, max_distance))
+            
+        path = self.cache.lookup(start, end, max_distance)
+        if path is not None:
+            return path
+            
+        path = yield from self._search_steps(start, end, max_distance)
+        self.cache.store(start, end, max_distance, path, self.last_searched,
+                         self._path_costs(path))
+        popular = self.cache.note_miss(start, end, max_distance)
+        if popular is not None:
+            self.background_jobs.append(self._flow_field_job(popular[0], popular[1], max_distance))
+        return path
+        
+    def _path_costs(self, path: List[Tuple[int, int]]) -> List[float]:
+        """路径上每个位置的累计代价（与搜索的逐格代价相同）"""
+        costs = [0.0] * len(path)
+        for i in range(1, len(path)):
+            (x0, y0), (x1, y1) = path[i - 1], path[i]
+            costs[i] = costs[i - 1] + self._segment_cost(x0, y0, x1 - x0, y1 - y0, 1)
+        return costs
+        
+    def _flow_field_job(self, root: Tuple[int, int], reverse: bool,
+                        max_distance: float) -> Generator[None, None, None]:
+        """后台任务：分片建立流场，建好后放入缓存"""
+        flow = yield from self._flow_field_steps(root, reverse, max_distance)
+        self.cache.add_flow_field(flow)
+        
+    def _search(self, start: Tuple[int, int], end: Tuple[int, int],
+                max_distance: float) -> List[Tuple[int, int]]:
+        """A*搜索本体（一次跑完）"""
+        return run_steps(self._search_steps(start, end, max_distance))
+        
+    def _search_steps(self, start: Tuple[int, int], end: Tuple[int, int],
+                      max_distance: float) -> Generator[None, None, List[Tuple[int, int]]]:
+        """A*搜索本体（分片）"""
+        self.searches += 1
+        self.last_searched = None
+        if self.mode == 'jps':
+            path, expanded = yield from jps_search_steps(
+                self._is_walkable, start, end, max_distance,
+                self._crosses_water_edge, self._segment_cost, SEARCH_SLICE)
+            self._count_expansions(expanded)
+            return path
+            
         open_set = []
         heapq.heappush(open_set, (0, start))
         came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
         g_score: Dict[Tuple[int, int], float] = {start: 0}
+        expanded = 0
         
         while open_set:
             _, current = heapq.heappop(open_set)
             
             if current == end:
+                self._count_expansions(expanded)
                 return self._reconstruct_path(came_from, current)
                 
             if g_score[current] > max_distance:
                 continue
                 
-            # 8方向邻居
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1),
-                          (-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-                
-                # 检查是否可行走
-                if not self._is_walkable(neighbor[0], neighbor[1]):
-                    continue
-                    
-                # 对角线移动检查
-                if abs(dx) == 1 and abs(dy) == 1:
-                    if not self._is_walkable(current[0] + dx, current[1]) or \
-                       not self._is_walkable(current[0], current[1] + dy):
-                        continue
-                        
-                # 移动代价
-                move_cost = 1.414 if abs(dx) == abs(dy) else 1.0
+            expanded += 1
+            if expanded % SEARCH_SLICE == 0:
+                yield
                 
-                # 水域附近增加代价（AI倾向于远离水）
-                if self._is_near_water(neighbor[0], neighbor[1]):
-                    move_cost += 0.5
-                    
+            for neighbor, move_cost in self._neighbors(current):
                 tentative_g = g_score[current] + move_cost
                 
                 if neighbor not in g_score or tentative_g < g_score[neighbor]:
@@ -68,13 +150,127 @@ class CollisionPathfinder:
                     f_score = tentative_g + self._heuristic(neighbor, end)
                     heapq.heappush(open_set, (f_score, neighbor))
                     
+        self._count_expansions(expanded)
+        # 失败结果只取决于发现过的格子及其相邻格
+        self.last_searched = tiles_box(g_score)
         return []
         
+    def _count_expansions(self, expanded: int):
+        self.last_expansions = expanded
+        self.expansions += expanded
+        
+    def _crosses_water_edge(self, px: int, py: int, x: int, y: int) -> bool:
+        """跳点搜索的停止条件：进出近水加价区时必须停下"""
+        return self._is_near_water(px, py) != self._is_near_water(x, y)
+        
+    def _segment_cost(self, x: int, y: int, dx: int, dy: int, steps: int) -> float:
+        """沿直线/斜线走steps格的代价（与_neighbors逐格代价相同）"""
+        base = 1.414 if dx and dy else 1.0
+        cost = 0.0
+        for _ in range(steps):
+            x += dx
+            y += dy
+            cost += base + 0.5 if self._is_near_water(x, y) else base
+        return cost
+        
+    def _neighbors(self, current: Tuple[int, int]):
+        """可到达的8方向邻居及移动代价"""
+        for dx, dy in NEIGHBOR_OFFSETS:
+            neighbor = (current[0] + dx, current[1] + dy)
+            
+            # 检查是否可行走
+            if not self._is_walkable(neighbor[0], neighbor[1]):
+                continue
+                
+            # 对角线移动检查
+            if abs(dx) == 1 and abs(dy) == 1:
+                if not self._is_walkable(current[0] + dx, current[1]) or \
+                   not self._is_walkable(current[0], current[1] + dy):
+                    continue
+                    
+            # 移动代价
+            move_cost = 1.414 if abs(dx) == abs(dy) else 1.0
+            
+            # 水域附近增加代价（AI倾向于远离水）
+            if self._is_near_water(neighbor[0], neighbor[1]):
+                move_cost += 0.5
+                
+            yield neighbor, move_cost
+            
+    def _predecessors(self, current: Tuple[int, int]):
+        """能一步走到current的格子及代价（反向搜索用，代价取决于current）"""
+        if not self._is_walkable(current[0], current[1]):
+            return
+        penalty = 0.5 if self._is_near_water(current[0], current[1]) else 0.0
+        for dx, dy in NEIGHBOR_OFFSETS:
+            prev = (current[0] - dx, current[1] - dy)
+            if abs(dx) == 1 and abs(dy) == 1:
+                if not self._is_walkable(prev[0] + dx, prev[1]) or \
+                   not self._is_walkable(prev[0], prev[1] + dy):
+                    continue
+                yield prev, 1.414 + penalty
+            else:
+                yield prev, 1.0 + penalty
+                
+    def build_flow_field(self, root: Tuple[int, int], reverse: bool,
+                         max_distance: float) -> FlowField:
+        """Dijkstra建立以root为根的最短路树（与A*相同的代价和max_distance剪枝）
+
+        reverse=False：root为起点，可回答root到范围内任意终点（含不可达）；
+        reverse=True：root为终点，可回答范围内任意起点到root
+        """
+        return run_steps(self._flow_field_steps(root, reverse, max_distance))
+        
+    def _flow_field_steps(self, root: Tuple[int, int], reverse: bool,
+                          max_distance: float) -> Generator[None, None, FlowField]:
+        """build_flow_field的分片版本"""
+        # 分片构建期间地形若有变化，流场记成过期，第一次使用时就会失效
+        edits = self.chunk_manager.edits
+        
+        costs: Dict[Tuple[int, int], float] = {root: 0.0}
+        parents: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {root: None}
+        open_set = [(0.0, root)]
+        expand = self._predecessors if reverse else self._neighbors
+        expanded = 0
+        
+        while open_set:
+            cost, current = heapq.heappop(open_set)
+            if cost > costs[current] or cost > max_distance:
+                continue
+            expanded += 1
+            if expanded % SEARCH_SLICE == 0:
+                yield
+            # 反向时不可行走的格子只能作为起点，_predecessors不会从它继续展开
+            for other, move_cost in expand(current):
+                new_cost = cost + move_cost
+                if other not in costs or new_cost < costs[other]:
+                    costs[other] = new_cost
+                    parents[other] = current
+                    heapq.heappush(open_set, (new_cost, other))
+                    
+        # 流场只依赖发现过的格子及其相邻格所在的区块（只读版本号，不会额外生成区块）
+        chunks = chunks_in_box(*tiles_box(costs))
+        version = self.chunk_manager.chunk_version
+        versions = tuple(version(cx, cy) for cx, cy in chunks)
+        if self.chunk_manager.edits != edits:
+            versions = (-1,) * len(chunks)
+        return FlowField(root, reverse, max_distance, parents, costs, chunks, versions)
+        
+    def get_stats(self) -> Dict:
+        """寻路统计：调用次数、实际搜索次数和缓存命中"""
+        stats = {'calls': self.calls, 'searches': self.searches,
+                 'mode': self.mode, 'expansions': self.expansions}
+        if self.cache is not None:
+            stats.update(self.cache.get_stats())
+        return stats
+        
     def _is_walkable(self, x: int, y: int) -> bool:
         return self.chunk_manager.is_walkable(x, y)
         
-    def _is_near_water(self, x: int, y: int, radius: int = 2) -> bool:
-        """检查是否靠近水"""
+    def _is_near_water(self, x: int, y: int, radius: int = WATER_PROXIMITY_RADIUS) -> bool:
+        """检查是否靠近水（默认半径查区块预计算的掩码）"""
+        if radius == WATER_PROXIMITY_RADIUS:
+            return self.chunk_manager.is_near_water(x, y)
         for dx in range(-radius, radius + 1):
             for dy in range(-radius, radius + 1):
                 if self.chunk_manager.is_water(x + dx, y + dy):
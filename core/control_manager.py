@@ -85,13 +85,23 @@ class ControlManager:
                 
         return self.player_mode, move_keys
         
-    def handle_mouse_click(self, mouse_pos: Tuple[int, int], agents: list, camera) -> Optional[object]:
+    def handle_mouse_click(self, mouse_pos: Tuple[int, int], agents: list, camera,
+                           index=None) -> Optional[object]:
         """
         处理鼠标点击
+        index: 可选的SpatialHash（世界坐标），有则只查点击附近的桶
         返回: 被点击的AI（如果有）
         """
         mx, my = mouse_pos
         
+        if index is not None:
+            # 屏幕上±20像素的点击范围换算成世界坐标，取离点击点最近的
+            half = 20 / (camera.zoom * camera.tile_size)
+            wx = (mx / camera.zoom + camera.x) / camera.tile_size
+            wy = (my / camera.zoom + camera.y) / camera.tile_size
+            candidates = index.query_rect(wx - half, wy - half, wx + half, wy + half)
+            agents = sorted(candidates, key=lambda a: (a.x - wx) ** 2 + (a.y - wy) ** 2)
+            
         for agent in agents:
             sx, sy = camera.world_to_screen(agent.x, agent.y)
             # 点击检测范围
@@ -0,0 +1,53 @@
+"""
+Culling - 视野裁剪
+根据相机位置、缩放和瓦片尺寸计算与屏幕相交的区块，以及每个区块内可见的瓦片子矩形
+坐标约定：camera_x/camera_y 是世界像素（缩放前），屏幕宽高是缩放后的像素
+"""
+
+import math
+from typing import List, Tuple
+
+from core.chunk_manager import CHUNK_SIZE
+
+
+def visible_world_rect(camera_x: float, camera_y: float, screen_width: int,
+                       screen_height: int, zoom: float = 1.0) -> Tuple[float, float, float, float]:
+    """可见区域的世界像素范围 (left, top, right, bottom)，右/下边界不含"""
+    return (camera_x, camera_y,
+            camera_x + screen_width / zoom, camera_y + screen_height / zoom)
+
+
+def visible_chunk_range(camera_x: float, camera_y: float, screen_width: int,
+                        screen_height: int, zoom: float = 1.0,
+                        tile_size: int = 32) -> Tuple[int, int, int, int]:
+    """与视野相交的区块范围 (start_cx, end_cx, start_cy, end_cy)，end不含"""
+    left, top, right, bottom = visible_world_rect(camera_x, camera_y,
+                                                  screen_width, screen_height, zoom)
+    chunk_px = CHUNK_SIZE * tile_size
+    return (math.floor(left / chunk_px), math.ceil(right / chunk_px),
+            math.floor(top / chunk_px), math.ceil(bottom / chunk_px))
+
+
+def visible_chunk_coords(camera_x: float, camera_y: float, screen_width: int,
+                         screen_height: int, zoom: float = 1.0,
+                         tile_size: int = 32) -> List[Tuple[int, int]]:
+    """与视野相交的区块坐标（按行排列）"""
+    start_cx, end_cx, start_cy, end_cy = visible_chunk_range(
+        camera_x, camera_y, screen_width, screen_height, zoom, tile_size)
+    return [(cx, cy) for cy in range(start_cy, end_cy) for cx in range(start_cx, end_cx)]
+
+
+def chunk_tile_rect(cx: int, cy: int, camera_x: float, camera_y: float,
+                    screen_width: int, screen_height: int, zoom: float = 1.0,
+                    tile_size: int = 32) -> Tuple[int, int, int, int]:
+    """区块内可见的瓦片子矩形 (tile_x, tile_y, tiles_w, tiles_h)；不可见时宽高为0"""
+    left, top, right, bottom = visible_world_rect(camera_x, camera_y,
+                                                  screen_width, screen_height, zoom)
+    origin_x = cx * CHUNK_SIZE * tile_size
+    origin_y = cy * CHUNK_SIZE * tile_size
+
+    x0 = max(0, math.floor((left - origin_x) / tile_size))
+    y0 = max(0, math.floor((top - origin_y) / tile_size))
+    x1 = min(CHUNK_SIZE, math.ceil((right - origin_x) / tile_size))
+    y1 = min(CHUNK_SIZE, math.ceil((bottom - origin_y) / tile_size))
+    return (x0, y0, max(0, x1 - x0), max(0, y1 - y0))
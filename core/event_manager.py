@@ -5,7 +5,7 @@ Event Manager - 事件管理系统（修复版）
 
 import random
 import time
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
@@ -79,16 +79,19 @@ class EventManager:
         },
     }
     
-    def __init__(self):
+    def __init__(self, rng: random.Random = None, clock: Callable[[], float] = time.time):
+        # 确定性模式下传入带种子的随机数流和模拟时钟
+        self.rng = rng if rng is not None else random
+        self.clock = clock
         self.active_events: Dict[str, WorldEvent] = {}
         self.cooldowns: Dict[str, EventCooldown] = {}
         self.last_log_time: Dict[str, float] = {}
         self.log_cooldown = 60.0
         
-        current_time = time.time()
+        current_time = self.clock()
         for event_id, definition in self.EVENT_DEFINITIONS.items():
             cooldown_range = definition['cooldown']
-            initial_cooldown = random.uniform(*cooldown_range)
+            initial_cooldown = self.rng.uniform(*cooldown_range)
             self.cooldowns[event_id] = EventCooldown(
                 event_id=event_id,
                 last_trigger_time=current_time - initial_cooldown,
@@ -97,7 +100,7 @@ class EventManager:
             
     def update(self, dt: float, season: Season, hour: int, day: int, agent_count: int):
         """更新事件系统"""
-        current_time = time.time()
+        current_time = self.clock()
         
         # 更新活跃事件
         expired = []
@@ -109,7 +112,7 @@ class EventManager:
             del self.active_events[event_id]
             
         # 尝试触发新事件（每秒检查一次）
-        if random.random() < 0.016:  # 约每秒1次
+        if self.rng.random() < 0.016:  # 约每秒1次
             self._try_trigger_event(current_time, season, hour, day, agent_count)
             
     def _try_trigger_event(self, current_time, season, hour, day, agent_count):
@@ -133,13 +136,13 @@ class EventManager:
             elif 'season_end_prob' in definition and is_season_end:
                 prob = definition['season_end_prob'] / 86400
                 
-            if random.random() < prob:
+            if self.rng.random() < prob:
                 self._trigger_event(event_id, definition, current_time)
                 break  # 每次只触发一个事件
                 
     def _trigger_event(self, event_id, definition, current_time):
         """触发事件"""
-        duration = random.randint(*definition['duration'])
+        duration = self.rng.randint(*definition['duration'])
         event = WorldEvent(
             id=f"{event_id}_{int(current_time)}",
             name=definition['name'],
@@ -154,7 +157,7 @@ class EventManager:
         
         # 更新冷却
         cooldown_range = definition['cooldown']
-        new_cooldown = random.uniform(*cooldown_range)
+        new_cooldown = self.rng.uniform(*cooldown_range)
         self.cooldowns[event_id].last_trigger_time = current_time
         self.cooldowns[event_id].cooldown_seconds = new_cooldown
         
@@ -0,0 +1,58 @@
+"""
+Headless - 无渲染替身组件
+在没有显示器的服务器上运行世界时，替代精灵、气泡和粒子
+"""
+
+
+class NullSprite:
+    """空精灵：保留CharacterSprite的接口，不创建任何Surface"""
+
+    def __init__(self):
+        self.current_direction = 'down'
+        self.current_frame = 0
+        self.is_moving = False
+
+    def update(self, dt: float, dx: float = 0, dy: float = 0):
+        self.is_moving = dx != 0 or dy != 0
+
+    def render(self, screen, x: int, y: int, scale: float = 2.0):
+        pass
+
+
+class NullThoughtBubble:
+    """空气泡：只记录文字，不加载字体"""
+
+    def __init__(self):
+        self.text = ""
+        self.visible = False
+
+    def update(self, dt: float, thought_text: str):
+        self.text = thought_text
+
+    def set_visible(self, visible: bool):
+        self.visible = bool(visible)
+
+    def render(self, screen, x: int, y: int):
+        pass
+
+
+class NullAnimation:
+    """空动画管理器：丢弃所有粒子"""
+
+    def __init__(self):
+        self.particles = []
+        self.time = 0
+
+    def update(self, dt: float):
+        self.time += dt
+
+    def add_dust(self, x: float, y: float):
+        pass
+
+    def add_leaf(self, x: float, y: float, season: str = 'autumn'):
+        pass
+
+    def render(self, screen, camera_x: float, camera_y: float, tile_size: int,
+               zoom: float = 1.0):
+        pass
+
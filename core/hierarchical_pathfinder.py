@@ -0,0 +1,649 @@
+"""
+Hierarchical Pathfinder - 分层寻路（HPA*）
+以区块为簇：预计算每个区块边界上的入口节点和簇内入口间距离，
+先在抽象图上搜索，再在簇内沿距离场细化为逐格路径
+查询时不再计算距离场：起点/终点到入口的距离直接查入口的距离场，起终点同簇时用簇内有界A*；
+搜索可分片执行（find_path_steps），供PathScheduler按帧预算推进
+
+靠近水加价与CollisionPathfinder相同（走进近水格+0.5）。该加价只取决于目标格，
+把每一步拆成对称部分 base + (pen(a) + pen(b)) / 2 后，整条路径只差一个常数
+(pen(终点) - pen(起点)) / 2，因此距离场仍然对称，最优路径不变
+"""
+
+import heapq
+import math
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from core.chunk_manager import CHUNK_SIZE
+
+INF = np.float32(np.inf)
+DIAGONAL_COST = 1.414
+NEAR_WATER_PENALTY = 0.5  # 与CollisionPathfinder相同
+
+# 8方向移动 (dx, dy, cost)
+_MOVES = [(-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+          (-1, -1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST),
+          (1, -1, DIAGONAL_COST), (1, 1, DIAGONAL_COST)]
+
+# 入口段长度达到该值时放两个过渡点（两端），否则放一个（中点）
+_LONG_ENTRANCE = 6
+
+# 分片搜索时抽象图每展开多少个节点让出一次
+SEARCH_SLICE = 64
+
+Tile = Tuple[int, int]
+
+
+def _span(d: int) -> slice:
+    """平移d格后目标区域的切片"""
+    return slice(max(d, 0), CHUNK_SIZE + min(d, 0))
+
+
+def _move_penalties(walkable: np.ndarray,
+                    penalty: np.ndarray) -> List[Tuple[slice, slice, slice, slice, np.ndarray]]:
+    """每个方向的(目标y, 目标x, 来源y, 来源x, 代价数组)；不可走的目标代价为inf
+
+    与CollisionPathfinder规则一致：目标格可行走，斜向移动时两个相邻正交格也必须可行走；
+    代价含两端近水加价的平均值（penalty为每格的近水加价）
+    """
+    moves = []
+    for dx, dy, cost in _MOVES:
+        ty, tx = _span(dy), _span(dx)
+        sy, sx = _span(-dy), _span(-dx)
+        allowed = walkable[ty, tx].copy()
+        if dx != 0 and dy != 0:
+            allowed &= walkable[sy, tx]  # (x, y - dy)
+            allowed &= walkable[ty, sx]  # (x - dx, y)
+        step = np.float32(cost) + (penalty[ty, tx] + penalty[sy, sx]) * np.float32(0.5)
+        moves.append((ty, tx, sy, sx, np.where(allowed, step, INF).astype(np.float32)))
+    return moves
+
+
+def distance_fields(walkable: np.ndarray, sources: List[Tile],
+                    moves=None, penalty: Optional[np.ndarray] = None) -> np.ndarray:
+    """多源距离场（区块内）：返回 (len(sources), CHUNK_SIZE, CHUNK_SIZE) float32
+
+    所有源同时做向量化松弛，直到收敛
+    """
+    if moves is None:
+        if penalty is None:
+            penalty = np.zeros((CHUNK_SIZE, CHUNK_SIZE), dtype=np.float32)
+        moves = _move_penalties(walkable, penalty)
+    fields = np.full((len(sources), CHUNK_SIZE, CHUNK_SIZE), INF, dtype=np.float32)
+    for i, (lx, ly) in enumerate(sources):
+        fields[i, ly, lx] = 0.0
+
+    while True:
+        before = fields.copy()
+        for ty, tx, sy, sx, penalty in moves:
+            target = fields[:, ty, tx]
+            np.minimum(target, fields[:, sy, sx] + penalty, out=target)
+        if np.array_equal(before, fields):
+            return fields
+
+
+def descend(field: np.ndarray, walkable: np.ndarray, penalty: np.ndarray,
+            lx: int, ly: int) -> List[Tile]:
+    """从(lx, ly)沿距离场下降到源点，返回局部坐标序列（含起止点）"""
+    path = [(lx, ly)]
+    current = field[ly, lx]
+    while current > 0:
+        best = None
+        best_value = current
+        for dx, dy, cost in _MOVES:
+            nx, ny = lx - dx, ly - dy  # 从(nx, ny)走(dx, dy)到达当前格
+            if not (0 <= nx < CHUNK_SIZE and 0 <= ny < CHUNK_SIZE):
+                continue
+            if dx != 0 and dy != 0 and not (walkable[ny, lx] and walkable[ly, nx]):
+                continue
+            value = field[ny, nx] + cost + (penalty[ny, nx] + penalty[ly, lx]) * 0.5
+            if value <= best_value + 1e-3 and (best is None or field[ny, nx] < field[best[1], best[0]]):
+                best = (nx, ny)
+                best_value = value
+        if best is None:
+            break
+        lx, ly = best
+        current = field[ly, lx]
+        path.append(best)
+    return path
+
+
+def cell_moves(walkable: bytes, penalty: List[float]) -> List[List[Tuple[int, float]]]:
+    """每个格子（按行展开的编号）能一步走到的 (格子编号, 代价)，规则和代价与距离场相同"""
+    size = CHUNK_SIZE
+    moves: List[List[Tuple[int, float]]] = []
+    for i in range(size * size):
+        y, x = divmod(i, size)
+        row = []
+        for dx, dy, cost in _MOVES:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < size and 0 <= ny < size) or not walkable[ny * size + nx]:
+                continue
+            if dx and dy and not (walkable[y * size + nx] and walkable[ny * size + x]):
+                continue
+            j = ny * size + nx
+            row.append((j, cost + (penalty[i] + penalty[j]) * 0.5))
+        moves.append(row)
+    return moves
+
+
+def local_astar(moves: List[List[Tuple[int, float]]], start: Tile, goal: Tile,
+                max_cost: float = math.inf) -> Tuple[float, Optional[List[Tile]]]:
+    """簇内A*（局部坐标，moves来自cell_moves），返回 (代价, 路径)；不可达为 (inf, None)
+
+    起点可以不可行走（只能离开），f超过max_cost的节点不展开
+    """
+    size = CHUNK_SIZE
+    goal_x, goal_y = goal
+    start_id = start[1] * size + start[0]
+    goal_id = goal_y * size + goal_x
+    g_score = {start_id: 0.0}
+    came_from: Dict[int, int] = {}
+    open_set = [(0.0, start_id)]
+    closed = set()
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if current == goal_id:
+            path = [current]
+            while current in came_from:
+                current = came_from[current]
+                path.append(current)
+            return g_score[goal_id], [(i % size, i // size) for i in reversed(path)]
+        if current in closed:
+            continue
+        closed.add(current)
+        base = g_score[current]
+        for neighbor, cost in moves[current]:
+            tentative = base + cost
+            if tentative < g_score.get(neighbor, math.inf):
+                hy, hx = divmod(neighbor, size)
+                hx = abs(hx - goal_x)
+                hy = abs(hy - goal_y)
+                f = tentative + (hx + 0.414 * hy if hx > hy else hy + 0.414 * hx)
+                if f > max_cost:
+                    continue
+                g_score[neighbor] = tentative
+                came_from[neighbor] = current
+                heapq.heappush(open_set, (f, neighbor))
+    return math.inf, None
+
+
+def component_labels(walkable: bytes) -> List[int]:
+    """区块内可行走格的连通分量编号（不可走为-1）
+
+    不穿角规则下斜向一步总能拆成两步正交移动，4连通即可
+    """
+    size = CHUNK_SIZE
+    labels = [-1] * (size * size)
+    label = 0
+    for seed in range(size * size):
+        if not walkable[seed] or labels[seed] >= 0:
+            continue
+        labels[seed] = label
+        stack = [seed]
+        while stack:
+            i = stack.pop()
+            y, x = divmod(i, size)
+            for j, ok in ((i - 1, x > 0), (i + 1, x < size - 1),
+                          (i - size, y > 0), (i + size, y < size - 1)):
+                if ok and walkable[j] and labels[j] < 0:
+                    labels[j] = label
+                    stack.append(j)
+        label += 1
+    return labels
+
+
+def _prune_dominated(dist: np.ndarray) -> np.ndarray:
+    """去掉可由经过第三个入口的等长路径替代的簇内边（抽象图更稀疏，最短路不变）"""
+    dist = dist.copy()
+    np.fill_diagonal(dist, INF)
+    via = np.min(dist[:, :, None] + dist[None, :, :], axis=1)  # via[i, j] = min_m d(i,m) + d(m,j)
+    dist[via <= dist + 1e-3] = INF
+    return dist
+
+
+@dataclass
+class Cluster:
+    """一个区块的抽象图：入口节点、邻接表（簇内边 + 跨边界边）"""
+    cx: int
+    cy: int
+    versions: Tuple[int, ...]
+    borders: Tuple[Optional[bytes], ...]    # 四邻区块朝向本簇那一条边的可行走+近水掩码
+    walkable: np.ndarray
+    nodes: List[Tile]                       # 世界坐标
+    fields: np.ndarray                      # 每个入口的簇内距离场
+    index: Dict[Tile, int] = field(default_factory=dict)
+    adjacency: Dict[Tile, List[Tuple[Tile, float]]] = field(default_factory=dict)
+    moves: list = field(default_factory=list, repr=False)
+    segments: Dict[Tuple[Tile, Tile], List[Tile]] = field(default_factory=dict, repr=False)
+    walkable_bytes: bytes = field(default=b'', repr=False)
+    labels: List[int] = field(default_factory=list, repr=False)  # 簇内连通分量
+    near_water: bytes = field(default=b'', repr=False)
+    penalty: Optional[np.ndarray] = field(default=None, repr=False)  # 每格近水加价 (y, x)
+    _cell_moves: Optional[list] = field(default=None, repr=False)
+
+    @property
+    def cell_moves(self) -> List[List[Tuple[int, float]]]:
+        """逐格邻接表（第一次做簇内A*时才构建）"""
+        if self._cell_moves is None:
+            self._cell_moves = cell_moves(self.walkable_bytes, self.penalty.ravel().tolist())
+        return self._cell_moves
+
+    def connected(self, a: Tile, b: Tile) -> bool:
+        """a能否在簇内走到可行走的b（a站在障碍上时看它可走进的相邻格）"""
+        ax, ay = self.local(a)
+        bx, by = self.local(b)
+        target = self.labels[by * CHUNK_SIZE + bx]
+        own = self.labels[ay * CHUNK_SIZE + ax]
+        if own >= 0:
+            return own == target
+        for dx, dy, _ in _MOVES:
+            nx, ny = ax + dx, ay + dy
+            if 0 <= nx < CHUNK_SIZE and 0 <= ny < CHUNK_SIZE \
+                    and self.labels[ny * CHUNK_SIZE + nx] == target:
+                if dx and dy and not (self.walkable[ay, nx] and self.walkable[ny, ax]):
+                    continue
+                return True
+        return False
+
+    def local(self, tile: Tile) -> Tile:
+        return (tile[0] - self.cx * CHUNK_SIZE, tile[1] - self.cy * CHUNK_SIZE)
+
+    def to_world(self, local_tiles: List[Tile]) -> List[Tile]:
+        bx, by = self.cx * CHUNK_SIZE, self.cy * CHUNK_SIZE
+        return [(x + bx, y + by) for x, y in local_tiles]
+
+    def distances_to(self, tile: Tile) -> List[Tuple[Tile, float]]:
+        """簇内各入口到tile（同簇可行走格）的距离（对称代价，来回相同）"""
+        lx, ly = self.local(tile)
+        column = self.fields[:, ly, lx].tolist()
+        return [(node, d) for node, d in zip(self.nodes, column) if d != math.inf]
+
+    def distances_from_blocked(self, tile: Tile) -> Tuple[List[Tuple[Tile, float]], Dict[Tile, Tile]]:
+        """不可行走的tile（站在障碍上）到各入口的距离：先走一步到可行走的相邻格，再查距离场
+
+        返回 (入口距离, 入口 -> 经过的相邻格)
+        """
+        lx, ly = self.local(tile)
+        best = np.full(len(self.nodes), INF, dtype=np.float32)
+        via = np.full(len(self.nodes), -1, dtype=np.int64)
+        steps = []
+        for dx, dy, cost in _MOVES:
+            nx, ny = lx + dx, ly + dy
+            if not (0 <= nx < CHUNK_SIZE and 0 <= ny < CHUNK_SIZE) or not self.walkable[ny, nx]:
+                continue
+            if dx and dy and not (self.walkable[ly, nx] and self.walkable[ny, lx]):
+                continue
+            step = cost + (self.penalty[ly, lx] + self.penalty[ny, nx]) * 0.5
+            candidate = self.fields[:, ny, nx] + np.float32(step)
+            better = candidate < best
+            best[better] = candidate[better]
+            via[better] = len(steps)
+            steps.append((tile[0] + dx, tile[1] + dy))
+        edges = []
+        first_step = {}
+        for node, d, step in zip(self.nodes, best.tolist(), via.tolist()):
+            if d != math.inf:
+                edges.append((node, d))
+                first_step[node] = steps[step]
+        return edges, first_step
+
+    def node_distances(self) -> np.ndarray:
+        """入口两两之间的簇内距离 (k, k)"""
+        xs = np.array([x for x, _ in self.nodes]) - self.cx * CHUNK_SIZE
+        ys = np.array([y for _, y in self.nodes]) - self.cy * CHUNK_SIZE
+        return self.fields[:, ys, xs]
+
+    def segment(self, a: Tile, b: Tile) -> List[Tile]:
+        """入口a到簇内格b的逐格路径（含两端），入口间的路径会被缓存"""
+        key = (a, b)
+        cached = self.segments.get(key)
+        if cached is None:
+            lx, ly = self.local(b)
+            local_path = descend(self.fields[self.index[a]], self.walkable, self.penalty, lx, ly)
+            cached = list(reversed(self.to_world(local_path)))
+            if b in self.index:
+                self.segments[key] = cached
+        return cached
+
+
+class HierarchicalPathfinder:
+    """HPA*寻路器（接口与CollisionPathfinder.find_path一致）"""
+
+    def __init__(self, chunk_manager, max_clusters: int = 512, max_chunk_radius: int = 4):
+        self.chunk_manager = chunk_manager
+        self.max_clusters = max_clusters
+        self.max_chunk_radius = max_chunk_radius  # 抽象搜索可超出起终点包围盒的区块数
+        self.clusters: Dict[Tuple[int, int], Cluster] = OrderedDict()
+
+        self.clusters_built = 0
+        self.last_stats: Dict = {}
+        chunk_manager.edit_listeners.append(self.invalidate_chunk)
+
+    # ------------------------------------------------------------------
+    # 簇（区块）预计算
+    # ------------------------------------------------------------------
+    def _chunk_versions(self, cx: int, cy: int) -> Tuple[int, ...]:
+        """簇依赖自身和四邻区块（入口位置取决于边界两侧）；只读版本号，不生成区块"""
+        version = self.chunk_manager.chunk_version
+        return (version(cx, cy), version(cx + 1, cy), version(cx - 1, cy),
+                version(cx, cy + 1), version(cx, cy - 1))
+
+    def _penalty(self, chunk) -> np.ndarray:
+        """区块每格的近水加价 (y, x)"""
+        near = np.frombuffer(self.chunk_manager.near_water_bytes(chunk), dtype=bool)
+        return near.reshape(CHUNK_SIZE, CHUNK_SIZE) * np.float32(NEAR_WATER_PENALTY)
+
+    def _neighbor_borders(self, cx: int, cy: int) -> Tuple[Optional[bytes], ...]:
+        """四邻区块与本簇相接的那一条边（可行走 + 近水掩码，只有它影响本簇的入口和跨边代价）
+
+        只看常驻区块，不在内存中的邻居为None
+        """
+        chunks = self.chunk_manager.chunks
+        borders = []
+        for (nx, ny), row, col in (((cx + 1, cy), slice(None), 0), ((cx - 1, cy), slice(None), -1),
+                                   ((cx, cy + 1), 0, slice(None)), ((cx, cy - 1), -1, slice(None))):
+            chunk = chunks.get((nx, ny))
+            if chunk is None:
+                borders.append(None)
+            else:
+                borders.append(chunk.walkable[row, col].tobytes()
+                               + self._penalty(chunk)[row, col].tobytes())
+        return tuple(borders)
+
+    def _still_valid(self, cluster: Cluster) -> bool:
+        """簇是否仍与地形一致（只读常驻区块，不生成）
+
+        自身版本号和近水掩码不变，且四邻相接的边不变（不在内存中的邻居只比较版本号）
+        """
+        cx, cy = cluster.cx, cluster.cy
+        versions = self._chunk_versions(cx, cy)
+        if versions[0] != cluster.versions[0]:
+            return False
+        own = self.chunk_manager.chunks.get((cx, cy))
+        if own is not None and self.chunk_manager.near_water_bytes(own) != cluster.near_water:
+            return False
+        for old, new, old_version, new_version in zip(cluster.borders, self._neighbor_borders(cx, cy),
+                                                      cluster.versions[1:], versions[1:]):
+            if new is None:
+                if old_version != new_version:
+                    return False
+            elif new != old:
+                return False
+        cluster.versions = versions
+        return True
+
+    def get_cluster(self, cx: int, cy: int) -> Cluster:
+        """获取簇（地形变化时自动重建）"""
+        cluster = self.clusters.get((cx, cy))
+        if cluster is not None and self._still_valid(cluster):
+            self.clusters.move_to_end((cx, cy))
+            return cluster
+
+        cluster = self._build_cluster(cx, cy)
+        self.clusters[(cx, cy)] = cluster
+        self.clusters.move_to_end((cx, cy))
+        while len(self.clusters) > self.max_clusters:
+            self.clusters.popitem(last=False)
+        return cluster
+
+    def invalidate_chunk(self, coord: Tuple[int, int]):
+        """区块被修改（ChunkManager.edit_listeners回调）：丢弃它和四周的簇
+
+        水域变化会改变相邻区块边缘的近水加价，所以3x3范围内的簇都要重建
+        """
+        cx, cy = coord
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                self.clusters.pop((cx + dx, cy + dy), None)
+
+    def _border_transitions(self, cx: int, cy: int, horizontal: bool) -> List[Tuple[Tile, Tile]]:
+        """区块(cx, cy)东边界（horizontal）或南边界上的过渡点对 (本侧格, 对侧格)"""
+        get = self.chunk_manager.get_chunk
+        a = get(cx, cy).walkable
+        last = CHUNK_SIZE - 1
+        if horizontal:
+            b = get(cx + 1, cy).walkable
+            open_pairs = (a[:, last] & b[:, 0]).tolist()
+        else:
+            b = get(cx, cy + 1).walkable
+            open_pairs = (a[last, :] & b[0, :]).tolist()
+
+        base_x, base_y = cx * CHUNK_SIZE, cy * CHUNK_SIZE
+        transitions = []
+        i = 0
+        while i < CHUNK_SIZE:
+            if not open_pairs[i]:
+                i += 1
+                continue
+            j = i
+            while j + 1 < CHUNK_SIZE and open_pairs[j + 1]:
+                j += 1
+            picks = (i, j) if j - i + 1 >= _LONG_ENTRANCE else ((i + j) // 2,)
+            for k in picks:
+                if horizontal:
+                    transitions.append(((base_x + last, base_y + k), (base_x + CHUNK_SIZE, base_y + k)))
+                else:
+                    transitions.append(((base_x + k, base_y + last), (base_x + k, base_y + CHUNK_SIZE)))
+            i = j + 1
+        return transitions
+
+    def _build_cluster(self, cx: int, cy: int) -> Cluster:
+        chunk = self.chunk_manager.get_chunk(cx, cy)
+        walkable = chunk.walkable
+        inter: Dict[Tile, List[Tile]] = {}
+        for own_cx, own_cy, horizontal, own_side in ((cx, cy, True, 0), (cx - 1, cy, True, 1),
+                                                      (cx, cy, False, 0), (cx, cy - 1, False, 1)):
+            for pair in self._border_transitions(own_cx, own_cy, horizontal):
+                mine, other = pair[own_side], pair[1 - own_side]
+                inter.setdefault(mine, []).append(other)
+
+        # 四邻已放入内存后再取近水掩码，边缘格的加价才是完整的
+        penalty = self._penalty(chunk)
+        nodes = list(inter.keys())
+        index = {node: i for i, node in enumerate(nodes)}
+        moves = _move_penalties(walkable, penalty)
+        # 邻居在取过渡点时已放入内存，此时记录的版本号和相接边都是完整的
+        cluster = Cluster(cx, cy, self._chunk_versions(cx, cy), self._neighbor_borders(cx, cy),
+                          walkable, nodes, np.empty((0, CHUNK_SIZE, CHUNK_SIZE), dtype=np.float32),
+                          index, {}, moves, walkable_bytes=walkable.tobytes(),
+                          near_water=self.chunk_manager.near_water_bytes(chunk), penalty=penalty)
+        cluster.labels = component_labels(cluster.walkable_bytes)
+        if nodes:
+            cluster.fields = distance_fields(walkable, [cluster.local(n) for n in nodes], moves)
+
+        direct = _prune_dominated(cluster.node_distances()) if nodes else None
+        is_near_water = self.chunk_manager.is_near_water
+        for i, node in enumerate(nodes):
+            row = [(nodes[j], float(direct[i, j])) for j in np.flatnonzero(direct[i] != INF)]
+            own = float(penalty[node[1] - cy * CHUNK_SIZE, node[0] - cx * CHUNK_SIZE])
+            for other in inter[node]:
+                across = NEAR_WATER_PENALTY if is_near_water(*other) else 0.0
+                row.append((other, 1.0 + (own + across) * 0.5))
+            cluster.adjacency[node] = row
+
+        self.clusters_built += 1
+        return cluster
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def find_path(self, start_x: float, start_y: float, end_x: float, end_y: float,
+                  max_distance: Optional[int] = None) -> List[Tile]:
+        """分层寻路；max_distance不为None时，估计总代价超过它的抽象节点不展开"""
+        steps = self.find_path_steps(start_x, start_y, end_x, end_y, max_distance)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                return done.value
+
+    def find_path_steps(self, start_x: float, start_y: float, end_x: float, end_y: float,
+                        max_distance: Optional[int] = None) -> Generator[None, None, List[Tile]]:
+        """可分片执行的find_path：取簇之后、抽象搜索中每SEARCH_SLICE个节点、细化之前各yield一次"""
+        start = (int(math.floor(start_x)), int(math.floor(start_y)))
+        end = (int(math.floor(end_x)), int(math.floor(end_y)))
+        built_before = self.clusters_built
+        self.last_stats = {'abstract_expanded': 0, 'clusters_built': 0}
+        if not self.chunk_manager.is_walkable(end[0], end[1]):
+            end = self._find_nearby_walkable(end[0], end[1])
+            if end is None:
+                return []
+        if start == end:
+            return [start]
+        # 对称代价与实际代价相差 (pen(终点) - pen(起点)) / 2，max_distance按实际代价换算
+        max_cost = math.inf
+        if max_distance is not None:
+            near = self.chunk_manager.is_near_water
+            shift = ((NEAR_WATER_PENALTY if near(*end) else 0.0)
+                     - (NEAR_WATER_PENALTY if near(*start) else 0.0)) * 0.5
+            max_cost = float(max_distance) - shift
+
+        start_cluster = self.get_cluster(start[0] // CHUNK_SIZE, start[1] // CHUNK_SIZE)
+        goal_cluster = self.get_cluster(end[0] // CHUNK_SIZE, end[1] // CHUNK_SIZE)
+
+        # 起点到入口：可行走时查入口距离场（代价对称），站在障碍上时先走一步到相邻格
+        first_step: Dict[Tile, Tile] = {}
+        if self.chunk_manager.is_walkable(start[0], start[1]):
+            start_edges = start_cluster.distances_to(start)
+        else:
+            start_edges, first_step = start_cluster.distances_from_blocked(start)
+        # 同簇且簇内连通：簇内直达路径用有界A*
+        direct = None
+        if start_cluster is goal_cluster and start_cluster.connected(start, end):
+            cost, local_path = local_astar(start_cluster.cell_moves, start_cluster.local(start),
+                                           start_cluster.local(end), max_cost)
+            if local_path is not None:
+                direct = start_cluster.to_world(local_path)
+                start_edges = start_edges + [('G', cost)]
+        goal_edges = dict(goal_cluster.distances_to(end))
+        self.last_stats['clusters_built'] = self.clusters_built - built_before
+        yield
+
+        abstract = []
+        if start_edges and (goal_edges or direct is not None):
+            abstract = yield from self._search_abstract_steps(
+                start_edges, goal_edges, end, start_cluster, goal_cluster, max_cost)
+        if not abstract:
+            self.last_stats['clusters_built'] = self.clusters_built - built_before
+            return []
+        yield
+
+        path = self._refine(abstract, start, end, start_cluster, goal_cluster, direct, first_step)
+        self.last_stats['clusters_built'] = self.clusters_built - built_before
+        return path
+
+    def _search_abstract_steps(self, start_edges: List[Tuple], goal_edges: Dict[Tile, float],
+                               end: Tile, start_cluster: Cluster, goal_cluster: Cluster,
+                               max_cost: float = math.inf) -> Generator[None, None, List]:
+        """抽象图A*：'S'/'G'为虚拟起终点，其余节点为入口格"""
+        radius = self.max_chunk_radius
+        min_cx = min(start_cluster.cx, goal_cluster.cx) - radius
+        max_cx = max(start_cluster.cx, goal_cluster.cx) + radius
+        min_cy = min(start_cluster.cy, goal_cluster.cy) - radius
+        max_cy = max(start_cluster.cy, goal_cluster.cy) + radius
+        goal_key = (goal_cluster.cx, goal_cluster.cy)
+        end_x, end_y = end
+
+        # 本次搜索内的簇缓存（避免每次展开都检查版本）
+        clusters = {(start_cluster.cx, start_cluster.cy): start_cluster, goal_key: goal_cluster}
+
+        g_score: Dict = {'S': 0.0}
+        came_from: Dict = {}
+        open_set = [(0.0, 0, 'S')]
+        counter = 1
+        closed = set()
+        expanded = 0
+
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if current == 'G':
+                path = [current]
+                while current in came_from:
+                    current = came_from[current]
+                    path.append(current)
+                self.last_stats['abstract_expanded'] = expanded
+                return list(reversed(path))
+            if current in closed:
+                continue
+            closed.add(current)
+            expanded += 1
+            if expanded % SEARCH_SLICE == 0:
+                yield
+
+            if current == 'S':
+                neighbors = start_edges
+            else:
+                key = (current[0] // CHUNK_SIZE, current[1] // CHUNK_SIZE)
+                cluster = clusters.get(key)
+                if cluster is None:
+                    if not (min_cx <= key[0] <= max_cx and min_cy <= key[1] <= max_cy):
+                        continue
+                    cluster = clusters[key] = self.get_cluster(*key)
+                neighbors = cluster.adjacency[current]
+                if key == goal_key and current in goal_edges:
+                    neighbors = neighbors + [('G', goal_edges[current])]
+
+            base = g_score[current]
+            for node, cost in neighbors:
+                tentative = base + cost
+                if tentative < g_score.get(node, math.inf):
+                    if node == 'G':
+                        f = tentative
+                    else:
+                        dx = abs(node[0] - end_x)
+                        dy = abs(node[1] - end_y)
+                        f = tentative + (dx + 0.414 * dy if dx > dy else dy + 0.414 * dx)
+                    if f > max_cost:
+                        continue
+                    g_score[node] = tentative
+                    came_from[node] = current
+                    heapq.heappush(open_set, (f, counter, node))
+                    counter += 1
+
+        self.last_stats['abstract_expanded'] = expanded
+        return []
+
+    def _refine(self, abstract: List, start: Tile, end: Tile, start_cluster: Cluster,
+                goal_cluster: Cluster, direct: Optional[List[Tile]],
+                first_step: Dict[Tile, Tile]) -> List[Tile]:
+        """把抽象路径细化为逐格路径"""
+        path: List[Tile] = [start]
+
+        def extend(tiles: List[Tile]):
+            for tile in tiles:
+                if tile != path[-1]:
+                    path.append(tile)
+
+        for a, b in zip(abstract, abstract[1:]):
+            if a == 'S':
+                if b == 'G':
+                    extend(direct)
+                elif first_step:
+                    # 站在障碍上：先走到相邻格，再沿入口b的距离场走到b
+                    extend(reversed(start_cluster.segment(b, first_step[b])))
+                else:
+                    # 代价对称：从起点沿入口b的距离场下降即为 起点 -> b
+                    extend(reversed(start_cluster.segment(b, start)))
+            elif b == 'G':
+                extend(goal_cluster.segment(a, end))
+            elif (a[0] // CHUNK_SIZE, a[1] // CHUNK_SIZE) != (b[0] // CHUNK_SIZE, b[1] // CHUNK_SIZE):
+                extend([b])  # 跨边界：相邻一步
+            else:
+                cluster = self.get_cluster(a[0] // CHUNK_SIZE, a[1] // CHUNK_SIZE)
+                extend(cluster.segment(a, b))
+        return path
+
+    def _find_nearby_walkable(self, x: int, y: int, radius: int = 5) -> Optional[Tile]:
+        """找附近可行走的点（与CollisionPathfinder一致）"""
+        for r in range(1, radius + 1):
+            for dx in range(-r, r + 1):
+                for dy in range(-r, r + 1):
+                    if self.chunk_manager.is_walkable(x + dx, y + dy):
+                        return (x + dx, y + dy)
+        return None
@@ -0,0 +1,313 @@
+"""
+Jump Point Search - 跳点搜索
+均匀代价8方向网格上的A*剪枝：沿直线/对角线"跳"过对称路径，只把跳点放进开放表
+采用不穿角规则（斜向移动要求两个相邻正交格都可行走），与A*版本的移动规则一致
+跳跃用循环实现，不递归；供AStarPathfinder和CollisionPathfinder的mode='jps'使用
+jps_search_grid是扁平数组版本：格子用编号表示，邻格靠下标加减，不经过回调
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, Generator, List, Optional, Tuple
+
+Tile = Tuple[int, int]
+WalkableFn = Callable[[int, int], bool]
+# stop(px, py, x, y)：从(px, py)走到(x, y)时是否必须停下（如进入不同代价的区域）
+StopFn = Callable[[int, int, int, int], bool]
+# segment_cost(x0, y0, dx, dy, steps)：沿方向走steps格的代价
+SegmentCostFn = Callable[[int, int, int, int, int], float]
+
+DIAGONAL_COST = 1.414
+ALL_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def octile(ax: int, ay: int, bx: int, by: int) -> float:
+    dx = abs(ax - bx)
+    dy = abs(ay - by)
+    return max(dx, dy) + 0.414 * min(dx, dy)
+
+
+def uniform_segment_cost(x0: int, y0: int, dx: int, dy: int, steps: int) -> float:
+    return steps * (DIAGONAL_COST if dx and dy else 1.0)
+
+
+def jump(is_walkable: WalkableFn, x: int, y: int, dx: int, dy: int, goal: Tile,
+         stop: Optional[StopFn] = None) -> Optional[Tile]:
+    """从(x, y)沿(dx, dy)跳跃，返回遇到的第一个跳点；撞墙返回None"""
+    while True:
+        # 斜向一步要求两个相邻正交格都可行走
+        if dx and dy and not (is_walkable(x + dx, y) and is_walkable(x, y + dy)):
+            return None
+        px, py = x, y
+        x += dx
+        y += dy
+        if not is_walkable(x, y):
+            return None
+        if (x, y) == goal or (stop is not None and stop(px, py, x, y)):
+            return (x, y)
+
+        if dx and dy:
+            # 斜向：水平或竖直方向能跳到跳点时，本格就是跳点
+            if jump(is_walkable, x, y, dx, 0, goal, stop) is not None or \
+               jump(is_walkable, x, y, 0, dy, goal, stop) is not None:
+                return (x, y)
+        elif dx:
+            # 水平：上下侧身后被挡、身侧可走 -> 强迫邻居
+            if (is_walkable(x, y - 1) and not is_walkable(x - dx, y - 1)) or \
+               (is_walkable(x, y + 1) and not is_walkable(x - dx, y + 1)):
+                return (x, y)
+        else:
+            if (is_walkable(x - 1, y) and not is_walkable(x - 1, y - dy)) or \
+               (is_walkable(x + 1, y) and not is_walkable(x + 1, y - dy)):
+                return (x, y)
+
+
+def pruned_directions(is_walkable: WalkableFn, x: int, y: int,
+                      parent: Optional[Tile]) -> List[Tuple[int, int]]:
+    """按到达方向剪枝后需要继续跳跃的方向"""
+    if parent is None:
+        return list(ALL_DIRECTIONS)
+
+    dx = (x > parent[0]) - (x < parent[0])
+    dy = (y > parent[1]) - (y < parent[1])
+    directions = []
+    if dx and dy:
+        vertical = is_walkable(x, y + dy)
+        horizontal = is_walkable(x + dx, y)
+        if vertical:
+            directions.append((0, dy))
+        if horizontal:
+            directions.append((dx, 0))
+        if vertical and horizontal:
+            directions.append((dx, dy))
+    elif dx:
+        up = is_walkable(x, y - 1)
+        down = is_walkable(x, y + 1)
+        if is_walkable(x + dx, y):
+            directions.append((dx, 0))
+            if up:
+                directions.append((dx, -1))
+            if down:
+                directions.append((dx, 1))
+        if up:
+            directions.append((0, -1))
+        if down:
+            directions.append((0, 1))
+    else:
+        left = is_walkable(x - 1, y)
+        right = is_walkable(x + 1, y)
+        if is_walkable(x, y + dy):
+            directions.append((0, dy))
+            if left:
+                directions.append((-1, dy))
+            if right:
+                directions.append((1, dy))
+        if left:
+            directions.append((-1, 0))
+        if right:
+            directions.append((1, 0))
+    return directions
+
+
+def expand_path(jump_points: List[Tile]) -> List[Tile]:
+    """把跳点序列展开成逐格路径（相邻跳点之间是直线或45°斜线）"""
+    if not jump_points:
+        return []
+    path = [jump_points[0]]
+    for (x0, y0), (x1, y1) in zip(jump_points, jump_points[1:]):
+        dx = (x1 > x0) - (x1 < x0)
+        dy = (y1 > y0) - (y1 < y0)
+        x, y = x0, y0
+        while (x, y) != (x1, y1):
+            x += dx
+            y += dy
+            path.append((x, y))
+    return path
+
+
+def jps_search_steps(is_walkable: WalkableFn, start: Tile, goal: Tile,
+                     max_cost: float = math.inf, stop: Optional[StopFn] = None,
+                     segment_cost: SegmentCostFn = uniform_segment_cost,
+                     slice_size: int = 64) -> Generator[None, None, Tuple[List[Tile], int]]:
+    """跳点A*（分片）：每展开slice_size个跳点yield一次，返回 (逐格路径, 展开数)
+
+    max_cost与A*的max_distance含义相同：g超过它的节点不再展开
+    """
+    g_score: Dict[Tile, float] = {start: 0.0}
+    came_from: Dict[Tile, Tile] = {}
+    open_set = [(octile(*start, *goal), 0.0, start)]
+    closed = set()
+    expanded = 0
+
+    while open_set:
+        _, g, current = heapq.heappop(open_set)
+        if current == goal:
+            points = [current]
+            while current in came_from:
+                current = came_from[current]
+                points.append(current)
+            return expand_path(points[::-1]), expanded
+        if current in closed or g > g_score[current]:
+            continue
+        closed.add(current)
+        if g > max_cost:
+            continue
+        expanded += 1
+        if expanded % slice_size == 0:
+            yield
+
+        cx, cy = current
+        for dx, dy in pruned_directions(is_walkable, cx, cy, came_from.get(current)):
+            point = jump(is_walkable, cx, cy, dx, dy, goal, stop)
+            if point is None or point in closed:
+                continue
+            steps = max(abs(point[0] - cx), abs(point[1] - cy))
+            new_g = g + segment_cost(cx, cy, dx, dy, steps)
+            # 与A*一致：线段倒数第二格的g不超过max_cost时才能到达
+            if new_g > max_cost and g + segment_cost(cx, cy, dx, dy, steps - 1) > max_cost:
+                continue
+            if new_g < g_score.get(point, math.inf):
+                g_score[point] = new_g
+                came_from[point] = current
+                heapq.heappush(open_set, (new_g + octile(*point, *goal), new_g, point))
+
+    return [], expanded
+
+
+def jps_search(is_walkable: WalkableFn, start: Tile, goal: Tile, max_cost: float = math.inf,
+               stop: Optional[StopFn] = None,
+               segment_cost: SegmentCostFn = uniform_segment_cost) -> Tuple[List[Tile], int]:
+    """jps_search_steps一次跑完"""
+    steps = jps_search_steps(is_walkable, start, goal, max_cost, stop, segment_cost)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+def _jump_grid(open_cells: bytearray, stride: int, i: int, dx: int, dy: int, goal: int) -> int:
+    """jump的扁平数组版本：open_cells为带一圈障碍边框的可行走表，返回跳点编号，撞墙返回-1"""
+    row = dy * stride
+    step = dx + row
+    while True:
+        if dx and dy and not (open_cells[i + dx] and open_cells[i + row]):
+            return -1
+        i += step
+        if not open_cells[i]:
+            return -1
+        if i == goal:
+            return i
+
+        if dx and dy:
+            if _jump_grid(open_cells, stride, i, dx, 0, goal) >= 0 or \
+               _jump_grid(open_cells, stride, i, 0, dy, goal) >= 0:
+                return i
+        elif dx:
+            if (open_cells[i - stride] and not open_cells[i - dx - stride]) or \
+               (open_cells[i + stride] and not open_cells[i - dx + stride]):
+                return i
+        else:
+            if (open_cells[i - 1] and not open_cells[i - 1 - row]) or \
+               (open_cells[i + 1] and not open_cells[i + 1 - row]):
+                return i
+
+
+def _pruned_grid(open_cells: bytearray, stride: int, i: int, dx: int, dy: int) -> List[Tuple[int, int]]:
+    """pruned_directions的扁平数组版本，(dx, dy)为到达方向（起点为(0, 0)）"""
+    if not dx and not dy:
+        return list(ALL_DIRECTIONS)
+    directions = []
+    if dx and dy:
+        vertical = open_cells[i + dy * stride]
+        horizontal = open_cells[i + dx]
+        if vertical:
+            directions.append((0, dy))
+        if horizontal:
+            directions.append((dx, 0))
+        if vertical and horizontal:
+            directions.append((dx, dy))
+    elif dx:
+        up = open_cells[i - stride]
+        down = open_cells[i + stride]
+        if open_cells[i + dx]:
+            directions.append((dx, 0))
+            if up:
+                directions.append((dx, -1))
+            if down:
+                directions.append((dx, 1))
+        if up:
+            directions.append((0, -1))
+        if down:
+            directions.append((0, 1))
+    else:
+        left = open_cells[i - 1]
+        right = open_cells[i + 1]
+        if open_cells[i + dy * stride]:
+            directions.append((0, dy))
+            if left:
+                directions.append((-1, dy))
+            if right:
+                directions.append((1, dy))
+        if left:
+            directions.append((-1, 0))
+        if right:
+            directions.append((1, 0))
+    return directions
+
+
+def jps_search_grid(open_cells: bytearray, stride: int, start: int,
+                    goal: int) -> Tuple[List[int], int]:
+    """均匀代价网格上的跳点A*，返回 (逐格路径的格子编号, 展开数)
+
+    open_cells按行展开、四周带一圈不可行走的边框（跳跃不用做越界检查），
+    stride为含边框的行宽；start/goal为该表中的编号
+    """
+    gx, gy = goal % stride, goal // stride
+    g_score: Dict[int, float] = {start: 0.0}
+    came_from: Dict[int, int] = {}
+    sx, sy = start % stride, start // stride
+    open_set = [(octile(sx, sy, gx, gy), 0.0, start)]
+    closed = set()
+    expanded = 0
+
+    while open_set:
+        _, g, current = heapq.heappop(open_set)
+        if current == goal:
+            points = [current]
+            while current in came_from:
+                current = came_from[current]
+                points.append(current)
+            points.reverse()
+            path = [points[0]]
+            for a, b in zip(points, points[1:]):
+                ax, ay = a % stride, a // stride
+                bx, by = b % stride, b // stride
+                step = ((bx > ax) - (bx < ax)) + ((by > ay) - (by < ay)) * stride
+                path.extend(range(a + step, b + step, step))
+            return path, expanded
+        if current in closed or g > g_score[current]:
+            continue
+        closed.add(current)
+        expanded += 1
+
+        cx, cy = current % stride, current // stride
+        parent = came_from.get(current)
+        if parent is None:
+            pdx = pdy = 0
+        else:
+            px, py = parent % stride, parent // stride
+            pdx, pdy = (cx > px) - (cx < px), (cy > py) - (cy < py)
+        for dx, dy in _pruned_grid(open_cells, stride, current, pdx, pdy):
+            point = _jump_grid(open_cells, stride, current, dx, dy, goal)
+            if point < 0 or point in closed:
+                continue
+            x, y = point % stride, point // stride
+            steps = max(abs(x - cx), abs(y - cy))
+            new_g = g + steps * (DIAGONAL_COST if dx and dy else 1.0)
+            if new_g < g_score.get(point, math.inf):
+                g_score[point] = new_g
+                came_from[point] = current
+                heapq.heappush(open_set, (new_g + octile(x, y, gx, gy), new_g, point))
+
+    return [], expanded
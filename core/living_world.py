@@ -14,6 +14,8 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 import numpy as np
 
+from core.spatial_hash import SpatialHash
+
 # ============ 时间系统 ============
 
 class Season(Enum):
@@ -90,6 +92,7 @@ class WeatherSystem:
     current: Weather = Weather.SUNNY
     intensity: float = 0.5  # 0-1 强度
     duration: int = 0       # 剩余tick
+    rng: Optional[random.Random] = field(default=None, repr=False)  # 确定性模式下的随机数流
     
     # 季节天气概率
     SEASON_WEATHER = {
@@ -111,9 +114,10 @@ class WeatherSystem:
         """根据季节改变天气"""
         options = self.SEASON_WEATHER.get(season, [(Weather.SUNNY, 1.0)])
         weights = [w for _, w in options]
-        self.current = random.choices([w for w, _ in options], weights=weights)[0]
-        self.intensity = random.uniform(0.3, 1.0)
-        self.duration = random.randint(60, 180)  # 10-30分钟
+        rng = self.rng or random
+        self.current = rng.choices([w for w, _ in options], weights=weights)[0]
+        self.intensity = rng.uniform(0.3, 1.0)
+        self.duration = rng.randint(60, 180)  # 10-30分钟
         
     def get_visibility(self) -> float:
         """获取能见度"""
@@ -302,6 +306,7 @@ class EventManager:
     """事件管理器"""
     active_events: List[WorldEvent] = field(default_factory=list)
     event_history: List[WorldEvent] = field(default_factory=list)
+    rng: Optional[random.Random] = field(default=None, repr=False)  # 确定性模式下的随机数流
     
     # 事件池
     EVENT_POOL = [
@@ -357,7 +362,7 @@ class EventManager:
         self.active_events = [e for e in self.active_events if e.duration > 0]
         
         # 随机触发新事件
-        if random.random() < 0.01:  # 1%概率每tick
+        if (self.rng or random).random() < 0.01:  # 1%概率每tick
             self._try_trigger_event(game_time, weather)
             
     def _try_trigger_event(self, game_time: GameTime, weather: WeatherSystem):
@@ -371,7 +376,8 @@ class EventManager:
             
         # 按权重选择
         weights = [e.get("weight", 0.1) for e in valid_events]
-        event_template = random.choices(valid_events, weights=weights)[0]
+        rng = self.rng or random
+        event_template = rng.choices(valid_events, weights=weights)[0]
         
         # 创建事件
         event = WorldEvent(
@@ -379,7 +385,7 @@ class EventManager:
             name=event_template["name"],
             description=event_template["description"],
             event_type=event_template["type"],
-            duration=random.randint(300, 600),  # 50-100分钟
+            duration=rng.randint(300, 600),  # 50-100分钟
             effects=event_template.get("effects", {})
         )
         
@@ -583,6 +589,9 @@ class LivingWorld:
     agents: Dict[str, LivingAgent] = field(default_factory=dict)
     buildings: List[Dict] = field(default_factory=list)
     
+    # AI位置索引（按id），社交/感知/点选用，update时随移动同步
+    agent_index: SpatialHash = field(default_factory=lambda: SpatialHash(8.0))
+    
     def __post_init__(self):
         self._generate_terrain()
         
@@ -619,12 +628,40 @@ class LivingWorld:
         # 更新所有AI
         for agent in self.agents.values():
             agent.update(self)
+            if agent.alive:
+                self.agent_index.update(agent.id, agent.x, agent.y)
+            else:
+                self.agent_index.remove(agent.id)  # 死亡的AI不再参与社交/感知/点选
             
         # 每日反思
         if self.time.hour == 23 and self.time.tick % 6 == 0:
             for agent in self.agents.values():
                 if agent.alive:
                     agent.memory.daily_reflection()
+                    
+    def add_agent(self, agent: LivingAgent):
+        """加入AI并登记位置"""
+        self.agents[agent.id] = agent
+        self.agent_index.update(agent.id, agent.x, agent.y)
+        
+    def remove_agent(self, agent_id: str) -> Optional[LivingAgent]:
+        """移除AI并同时从位置索引中去掉"""
+        self.agent_index.remove(agent_id)
+        return self.agents.pop(agent_id, None)
+        
+    def nearby_agents(self, agent: LivingAgent, radius: float = 10,
+                      k: Optional[int] = None) -> List[LivingAgent]:
+        """agent周围radius格内的其他存活AI（由近到远，k限制数量），供社交和感知使用"""
+        if k is None:
+            ids = self.agent_index.query_range(agent.x, agent.y, radius)
+        else:
+            ids = self.agent_index.nearest(agent.x, agent.y, k, max_radius=radius, exclude=agent.id)
+        # 先滤掉自己和已移除/死亡的AI，再排序（索引里可能有尚未同步的旧条目）
+        found = [self.agents[i] for i in ids
+                 if i in self.agents and self.agents[i].alive and i != agent.id]
+        if k is None:
+            found.sort(key=lambda other: (other.x - agent.x) ** 2 + (other.y - agent.y) ** 2)
+        return found
 
 
 # ============ 管理员上帝视角系统 ============
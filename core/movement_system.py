@@ -0,0 +1,236 @@
+"""
+Movement System - 批量平滑移动
+所有AI的平滑路径点存在一个扁平数组里（每个AI记录偏移和长度），
+每帧把本帧需要移动的AI一次性向量化推进；到达/停止语义与SmoothMovement.update逐个推进一致，
+Catmull-Rom平滑也用数组一次算完整条路径。GameAgent持有MovementView，接口与SmoothMovement相同
+"""
+
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+# 每段路径的Catmull-Rom采样参数
+_T = np.array([0.25, 0.5, 0.75])
+_T2 = _T * _T
+_T3 = _T2 * _T
+
+ARRIVE_DISTANCE = 0.1  # 与SmoothMovement相同：距离小于它视为已到达该点
+
+
+def smooth_path(path: Sequence[Tuple[int, int]], start_pos: Tuple[float, float]) -> np.ndarray:
+    """SmoothMovement._smooth_path的数组版本，返回 (m, 2) float64；运算顺序相同，结果逐位一致"""
+    points = np.asarray(path, dtype=np.float64).reshape(-1, 2)
+    start = np.asarray(start_pos, dtype=np.float64).reshape(1, 2)
+    n = len(points)
+    if n <= 2:
+        return np.concatenate([start, points[1:]])
+
+    p1 = points[:-1]
+    p2 = points[1:]
+    p0 = np.concatenate([points[:1], points[:-2]])
+    p3 = np.concatenate([points[2:], points[-1:]])
+    # (n-1, 1, 2) 与 (3, 1) 广播成 (n-1, 3, 2)
+    p0, p1, p2, p3 = (p[:, None, :] for p in (p0, p1, p2, p3))
+    t, t2, t3 = _T[:, None], _T2[:, None], _T3[:, None]
+    curve = 0.5 * (
+        (2 * p1) +
+        (-p0 + p2) * t +
+        (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2 +
+        (-p0 + 3 * p1 - 3 * p2 + p3) * t3
+    )
+    return np.concatenate([start, curve.reshape(-1, 2), points[-1:]])
+
+
+class MovementSystem:
+    """所有AI的平滑移动状态"""
+
+    def __init__(self, capacity: int = 64, point_capacity: int = 4096):
+        self.size = 0
+        self.owners: List[Any] = []
+        self.pos = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.index = np.zeros(capacity, dtype=np.int64)   # 当前所在的路径点
+        self.offset = np.zeros(capacity, dtype=np.int64)  # 路径在points中的起点
+        self.length = np.zeros(capacity, dtype=np.int64)
+        self.moving = np.zeros(capacity, dtype=bool)
+        self.requested = np.zeros(capacity, dtype=bool)   # 本帧要推进的AI
+
+        # 所有路径点首尾相接；新路径追加在末尾，空间不够时压缩掉旧路径
+        self.points = np.zeros((point_capacity, 2))
+        self.points_used = 0
+        self.compactions = 0
+
+    def add(self, owner: Any = None, speed: float = 3.0) -> 'MovementView':
+        if self.size == len(self.speed):
+            self._grow()
+        slot = self.size
+        self.size += 1
+        self.owners.append(owner)
+        self.speed[slot] = speed
+        return MovementView(self, slot)
+
+    def _grow(self):
+        capacity = len(self.speed) * 2
+        for name in ('pos', 'speed', 'index', 'offset', 'length', 'moving', 'requested'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    # ------------------------------------------------------------------
+    # 路径
+    # ------------------------------------------------------------------
+    def set_path(self, slot: int, path: Sequence[Tuple[int, int]], start_pos: Tuple[float, float]):
+        """设置路径并平滑化（SmoothMovement.set_path）"""
+        if len(path) < 2:
+            self.length[slot] = 0
+            self.moving[slot] = False
+            return
+        smoothed = smooth_path(path, start_pos)
+        count = len(smoothed)
+        if self.points_used + count > len(self.points):
+            self._compact(count)
+        start = self.points_used
+        self.points[start:start + count] = smoothed
+        self.points_used += count
+        self.offset[slot] = start
+        self.length[slot] = count
+        self.index[slot] = 0
+        self.pos[slot] = start_pos
+        self.moving[slot] = count >= 2
+
+    def _compact(self, incoming: int):
+        """只保留仍在移动的路径，必要时扩容"""
+        live = np.flatnonzero(self.moving[:self.size] & (self.length[:self.size] > 0))
+        needed = int(self.length[live].sum()) + incoming
+        capacity = len(self.points)
+        while capacity < needed * 2:
+            capacity *= 2
+        points = np.zeros((capacity, 2))
+        cursor = 0
+        for slot in live:
+            start, count = self.offset[slot], self.length[slot]
+            points[cursor:cursor + count] = self.points[start:start + count]
+            self.offset[slot] = cursor
+            cursor += count
+        # 不再移动的路径作废
+        stopped = np.setdiff1d(np.arange(self.size), live)
+        self.length[stopped] = 0
+        self.points = points
+        self.points_used = cursor
+        self.compactions += 1
+
+    def path_of(self, slot: int) -> np.ndarray:
+        start = self.offset[slot]
+        return self.points[start:start + self.length[slot]]
+
+    # ------------------------------------------------------------------
+    # 推进
+    # ------------------------------------------------------------------
+    def request(self, slot: int):
+        """本帧推进该AI（由step统一处理）"""
+        self.requested[slot] = True
+
+    def step(self, dt: float, chunk_manager=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """推进本帧请求过的AI并清空请求，返回 (槽位, 新位置(k, 2), 新位置是否可行走)
+
+        可行走检查用chunk_manager.is_walkable_many按区块批量查掩码；不传则全部视为可行走
+        """
+        slots = np.flatnonzero(self.requested[:self.size])
+        self.requested[slots] = False
+        positions = self.advance(slots, dt)
+        if chunk_manager is None:
+            walkable = np.ones(len(slots), dtype=bool)
+        else:
+            walkable = chunk_manager.is_walkable_many(positions[:, 0], positions[:, 1])
+        return slots, positions, walkable
+
+    def advance(self, slots: np.ndarray, dt: float) -> np.ndarray:
+        """SmoothMovement.update的向量化版本：每个AI最多前进到下一个路径点，返回各槽位的新位置"""
+        requested = slots
+        slots = slots[self.moving[slots] & (self.length[slots] > 0)]
+        has_next = self.index[slots] < self.length[slots] - 1
+        # 已在最后一个点：停止，位置不变
+        self.moving[slots[~has_next]] = False
+
+        slots = slots[has_next]
+        if len(slots):
+            pos = self.pos[slots]
+            target = self.points[self.offset[slots] + self.index[slots] + 1]
+            dx = target[:, 0] - pos[:, 0]
+            dy = target[:, 1] - pos[:, 1]
+            distance = np.sqrt(dx * dx + dy * dy)
+            move = self.speed[slots] * dt
+
+            far = distance > ARRIVE_DISTANCE
+            arrive = far & (move >= distance)
+            walk = far & ~arrive
+            # 与Vector2.normalize()后乘move的运算顺序相同
+            pos[walk, 0] += dx[walk] / distance[walk] * move[walk]
+            pos[walk, 1] += dy[walk] / distance[walk] * move[walk]
+            pos[arrive] = target[arrive]
+            self.pos[slots] = pos
+            self.index[slots[~walk]] += 1
+        return self.pos[requested]
+
+
+class MovementView:
+    """MovementSystem中一个AI的视图，接口与SmoothMovement相同"""
+
+    __slots__ = ('system', 'slot')
+
+    def __init__(self, system: MovementSystem, slot: int):
+        self.system = system
+        self.slot = slot
+
+    @property
+    def is_moving(self) -> bool:
+        return bool(self.system.moving[self.slot])
+
+    @is_moving.setter
+    def is_moving(self, value: bool):
+        self.system.moving[self.slot] = value
+
+    @property
+    def speed(self) -> float:
+        return float(self.system.speed[self.slot])
+
+    @speed.setter
+    def speed(self, value: float):
+        self.system.speed[self.slot] = value
+
+    @property
+    def path(self) -> np.ndarray:
+        return self.system.path_of(self.slot)
+
+    @property
+    def current_index(self) -> int:
+        return int(self.system.index[self.slot])
+
+    @property
+    def current_pos(self) -> Tuple[float, float]:
+        x, y = self.system.pos[self.slot]
+        return (float(x), float(y))
+
+    def set_path(self, path: Sequence[Tuple[int, int]], start_pos: Tuple[float, float]):
+        self.system.set_path(self.slot, path, start_pos)
+
+    def request(self):
+        """本帧由MovementSystem.step统一推进"""
+        self.system.request(self.slot)
+
+    def update(self, dt: float) -> Tuple[float, float]:
+        """只推进这一个AI（批量推进请用request + MovementSystem.step）"""
+        x, y = self.system.advance(np.array([self.slot]), dt)[0]
+        return (float(x), float(y))
+
+    def get_direction(self) -> Tuple[float, float]:
+        system, slot = self.system, self.slot
+        if not system.moving[slot] or system.index[slot] >= system.length[slot] - 1:
+            return (0, 0)
+        tx, ty = system.points[system.offset[slot] + system.index[slot] + 1]
+        x, y = system.pos[slot]
+        length = float(np.hypot(tx - x, ty - y))
+        if length > 0:
+            return (float(tx - x) / length, float(ty - y) / length)
+        return (0, 0)
@@ -0,0 +1,171 @@
+"""
+Overlay Cache - 日夜/季节全屏叠加层缓存
+叠加层都是整屏单色半透明，只取决于(屏幕尺寸, 小时, 季节)：
+各层颜色先合成为一个RGBA，每种(尺寸, 图层组合)复用一张整屏Surface（surface alpha，不用逐像素alpha），
+颜色变化时重新fill，不变时每帧只剩一次blit。
+平滑模式下在当前小时与下一小时的颜色之间按分钟插值（量化成transition_steps档）
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+import pygame
+
+RGBA = Tuple[int, int, int, int]
+
+NIGHT_COLOR = (10, 15, 40)
+
+# 季节色调（按Season.value，core.living_world与core.event_manager两个Season枚举都适用）
+SEASON_TINTS: Dict[str, RGBA] = {
+    'spring': (200, 255, 200, 20),
+    'summer': (255, 255, 150, 30),
+    'autumn': (255, 180, 100, 40),
+    'winter': (220, 240, 255, 60),
+}
+
+
+def day_night_color(hour: int) -> RGBA:
+    """日夜暗化层颜色（亮度>=0.9时完全透明）"""
+    if 6 <= hour < 18:
+        # 白天
+        brightness = 0.3 + 0.7 * (1 - abs(hour - 12) / 6)
+    else:
+        # 夜晚
+        brightness = 0.15
+    if brightness >= 0.9:
+        return (*NIGHT_COLOR, 0)
+    return (*NIGHT_COLOR, int((1 - brightness) * 150))
+
+
+def season_tint(season, hour: int) -> RGBA:
+    """季节色调，夜晚加深"""
+    tint = list(SEASON_TINTS.get(getattr(season, 'value', season), (255, 255, 255, 0)))
+    if hour < 6 or hour > 20:
+        tint[3] += 80
+    return tuple(tint)
+
+
+def compose(layers: Sequence[RGBA]) -> RGBA:
+    """把依次叠上去的几层单色合成为一层（结果与逐层blit相同）"""
+    alpha = 0.0
+    premultiplied = [0.0, 0.0, 0.0]
+    for r, g, b, a in layers:
+        a /= 255
+        premultiplied = [p * (1 - a) + c * a for p, c in zip(premultiplied, (r, g, b))]
+        alpha = alpha + a * (1 - alpha)
+    if alpha <= 0:
+        return (0, 0, 0, 0)
+    r, g, b = (min(255, round(p / alpha)) for p in premultiplied)
+    return (r, g, b, round(alpha * 255))
+
+
+def lerp_color(a: RGBA, b: RGBA, t: float) -> RGBA:
+    """两层叠加色之间插值（透明的一端沿用另一端的颜色，只淡入淡出alpha）"""
+    if a[3] == 0:
+        a = (*b[:3], 0)
+    elif b[3] == 0:
+        b = (*a[:3], 0)
+    return tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+
+class OverlayCache:
+    """全屏叠加层缓存
+
+    颜色按(小时, 季节, 是否含日夜层)缓存；每种(尺寸, 季节, 是否含日夜层)一张整屏Surface，
+    颜色变了就在原Surface上重新fill（平滑过渡时每档换一次色，不再分配新Surface）。
+    Surface放在LRU里（1400x900一张约5MB，max_surfaces控制上限）
+    """
+
+    def __init__(self, max_surfaces: int = 4, transition_steps: int = 16):
+        self.max_surfaces = max_surfaces
+        self.transition_steps = transition_steps
+        self.colors: Dict[tuple, RGBA] = {}
+        # (尺寸, 季节, 是否含日夜层) -> (当前颜色, Surface)
+        self.surfaces: Dict[tuple, Tuple[RGBA, pygame.Surface]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def overlay_color(self, hour: int, season=None, day_night: bool = True) -> RGBA:
+        """某小时所有叠加层合成后的颜色"""
+        hour = int(hour) % 24
+        season = getattr(season, 'value', season)
+        key = (hour, season, day_night)
+        color = self.colors.get(key)
+        if color is None:
+            layers = []
+            if day_night:
+                layers.append(day_night_color(hour))
+            if season is not None:
+                layers.append(season_tint(season, hour))
+            color = compose(layers)
+            self.colors[key] = color
+        return color
+
+    def get(self, size: Tuple[int, int], hour: float, season=None,
+            day_night: bool = True, smooth: bool = False) -> Optional[pygame.Surface]:
+        """取叠加层Surface；完全透明时返回None
+
+        smooth=True时hour可带小数，在int(hour)与下一小时的颜色之间插值。
+        返回的Surface会在下次换色时被重新fill，调用方只能立即blit
+        """
+        color = self.overlay_color(hour, season, day_night)
+        if smooth:
+            step = int((hour % 1) * self.transition_steps)
+            if step:
+                following = self.overlay_color(int(hour) + 1, season, day_night)
+                color = lerp_color(color, following, step / self.transition_steps)
+        if color[3] <= 0:
+            return None
+
+        key = (tuple(size), getattr(season, 'value', season), day_night)
+        slot = self.surfaces.get(key)
+        if slot is not None:
+            self.surfaces.move_to_end(key)
+            if slot[0] == color:
+                self.hits += 1
+                return slot[1]
+            surface = slot[1]
+        else:
+            surface = pygame.Surface(size)
+            if len(self.surfaces) >= self.max_surfaces:
+                self.surfaces.popitem(last=False)
+                self.evictions += 1
+
+        self.misses += 1
+        surface.fill(color[:3])
+        surface.set_alpha(color[3])
+        self.surfaces[key] = (color, surface)
+        return surface
+
+    def render(self, screen: pygame.Surface, hour: float, season=None,
+               day_night: bool = True, smooth: bool = False):
+        overlay = self.get(screen.get_size(), hour, season, day_night, smooth)
+        if overlay is not None:
+            screen.blit(overlay, (0, 0))
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'surfaces': len(self.surfaces),
+            'colors': len(self.colors),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_shared_cache: Optional[OverlayCache] = None
+
+
+def get_overlay_cache() -> OverlayCache:
+    """全局共享的叠加层缓存"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = OverlayCache()
+    return _shared_cache
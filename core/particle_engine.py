@@ -0,0 +1,159 @@
+"""
+Particle Engine - 数组化粒子引擎
+位置/速度/寿命存在预分配的NumPy数组里，整批更新；死亡粒子用末尾存活的粒子填洞（swap-remove），
+不再每帧重建列表。绘制时透明度量化成ALPHA_LEVELS档，按(颜色, 半径, 透明度档)预渲染圆形精灵，
+整批交给Surface.blits；粒子数有硬上限，满了新粒子直接丢弃
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pygame
+
+ALPHA_LEVELS = 16
+
+Color = Tuple[int, int, int]
+
+
+def _take(value, n: int):
+    """标量原样返回（赋值时广播），数组取前n个"""
+    return value if np.ndim(value) == 0 else np.asarray(value)[:n]
+
+
+class ParticleEngine:
+    """数组化粒子池
+
+    颜色通过palette登记：同一(颜色, 最大透明度, 是否淡出)只占一个下标；
+    fade=False的粒子一直按最大透明度绘制（雨、雪），否则按剩余寿命淡出
+    """
+
+    def __init__(self, max_particles: int = 4000):
+        self.max_particles = max_particles
+        self.count = 0
+        self.dropped = 0                # 因达到上限被丢弃的粒子数
+
+        self.pos = np.zeros((max_particles, 2), dtype=np.float32)
+        self.vel = np.zeros((max_particles, 2), dtype=np.float32)
+        self.life = np.zeros(max_particles, dtype=np.float32)
+        self.max_life = np.ones(max_particles, dtype=np.float32)
+        self.radius = np.zeros(max_particles, dtype=np.int16)
+        self.color_index = np.zeros(max_particles, dtype=np.int16)
+
+        self.palette: List[Tuple[Color, int, bool]] = []
+        self._palette_lookup: Dict[Tuple[Color, int, bool], int] = {}
+        self._palette_fade = np.zeros(0, dtype=bool)
+        self.sprites: Dict[Tuple[int, int, int], pygame.Surface] = {}
+
+    # ------------------------------------------------------------------
+    # 生成
+    # ------------------------------------------------------------------
+    def color_id(self, color: Color, max_alpha: int = 255, fade: bool = True) -> int:
+        """登记颜色，返回palette下标"""
+        key = (tuple(color), max_alpha, fade)
+        index = self._palette_lookup.get(key)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(key)
+            self._palette_lookup[key] = index
+            self._palette_fade = np.append(self._palette_fade, fade)
+        return index
+
+    def emit(self, x, y, vx, vy, life, max_life, radius, color_id) -> int:
+        """批量加入粒子（参数可以是标量或等长数组），返回实际加入的数量"""
+        n = max(np.size(x), np.size(y), np.size(vx), np.size(vy), np.size(life))
+        room = self.max_particles - self.count
+        if n > room:
+            self.dropped += n - room
+            n = room
+        if n <= 0:
+            return 0
+
+        s = slice(self.count, self.count + n)
+        self.pos[s, 0] = _take(x, n)
+        self.pos[s, 1] = _take(y, n)
+        self.vel[s, 0] = _take(vx, n)
+        self.vel[s, 1] = _take(vy, n)
+        self.life[s] = _take(life, n)
+        self.max_life[s] = _take(max_life, n)
+        self.radius[s] = np.maximum(1, np.asarray(_take(radius, n), dtype=np.float32).astype(np.int16))
+        self.color_index[s] = _take(color_id, n)
+        self.count += n
+        return n
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+    def update(self, dt: float):
+        """整批积分，然后swap-remove死亡粒子"""
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.life[:n] -= dt
+
+        dead = self.life[:n] <= 0
+        if not dead.any():
+            return
+        alive = n - int(dead.sum())
+        # 前alive个位置里的洞，用alive之后的存活粒子填上
+        holes = np.flatnonzero(dead[:alive])
+        if len(holes):
+            movers = alive + np.flatnonzero(~dead[alive:])
+            for array in (self.pos, self.vel, self.life, self.max_life,
+                          self.radius, self.color_index):
+                array[holes] = array[movers]
+        self.count = alive
+
+    def clear(self):
+        self.count = 0
+
+    # ------------------------------------------------------------------
+    # 绘制
+    # ------------------------------------------------------------------
+    def _sprite(self, color_id: int, radius: int, level: int) -> pygame.Surface:
+        key = (color_id, radius, level)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            color, max_alpha, _ = self.palette[color_id]
+            alpha = int(max_alpha * level / (ALPHA_LEVELS - 1))
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+            self.sprites[key] = sprite
+        return sprite
+
+    def render(self, screen: pygame.Surface, camera_x: float, camera_y: float,
+               zoom: float = 1.0, margin: int = 10):
+        """按相机偏移（与缩放）画出屏幕内的粒子，返回绘制数量"""
+        n = self.count
+        if n == 0:
+            return 0
+        screen_pos = ((self.pos[:n] - (camera_x, camera_y)) * zoom).astype(np.int32)
+        width, height = screen.get_size()
+        visible = ((screen_pos[:, 0] > -margin) & (screen_pos[:, 0] < width + margin) &
+                   (screen_pos[:, 1] > -margin) & (screen_pos[:, 1] < height + margin))
+        index = np.flatnonzero(visible)
+        if len(index) == 0:
+            return 0
+
+        colors = self.color_index[index].astype(np.int64)
+        radius = self.radius[index].astype(np.int64)
+        ratio = np.clip(self.life[index] / self.max_life[index], 0.0, 1.0)
+        ratio = np.where(self._palette_fade[colors], ratio, 1.0)
+        level = (ratio * (ALPHA_LEVELS - 1)).astype(np.int64)
+        # 最低一档已经完全透明，不用画
+        shown = level > 0
+        if not shown.all():
+            index, colors, radius, level = index[shown], colors[shown], radius[shown], level[shown]
+            if len(index) == 0:
+                return 0
+
+        # 相同(颜色, 半径, 透明度档)只查一次精灵
+        keys = (colors * 1024 + radius) * ALPHA_LEVELS + level
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sprites = [self._sprite(int(k // (1024 * ALPHA_LEVELS)),
+                                int(k // ALPHA_LEVELS % 1024), int(k % ALPHA_LEVELS))
+                   for k in unique]
+        top_left = (screen_pos[index] - radius[:, None]).tolist()
+        screen.blits([(sprites[i], tuple(p)) for i, p in zip(inverse.tolist(), top_left)],
+                     doreturn=False)
+        return len(index)
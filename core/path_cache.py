@@ -0,0 +1,260 @@
+"""
+Path Cache - 路径缓存与共享
+按(起点, 终点, 最大距离)缓存寻路结果（包括失败），用区块版本号判断是否过期
+（版本号取自常驻区块或磁盘记录，校验时不会生成区块）；
+失败结果依赖的是搜索实际展开过的范围，范围超过MAX_FAILURE_CHUNKS个区块时不缓存；
+命中失败时尝试复用已缓存路径的子段（最短路的子路径仍是最短路，代价超过max_distance的子段不用）；
+热门起点/终点建立共享的搜索树（流场），同一区域内的请求直接沿父指针取路径
+"""
+
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from core.chunk_manager import CHUNK_SIZE, WATER_PROXIMITY_RADIUS
+
+Tile = Tuple[int, int]
+PathKey = Tuple[Tile, Tile, float]
+Box = Tuple[int, int, int, int]
+
+# 失败结果最多依赖多少个区块（更大的搜索范围不缓存失败，避免校验本身变得昂贵）
+MAX_FAILURE_CHUNKS = 64
+
+
+def chunks_in_box(x0: int, y0: int, x1: int, y1: int,
+                  margin: int = WATER_PROXIMITY_RADIUS) -> Tuple[Tuple[int, int], ...]:
+    """覆盖格子矩形（含水边代价半径）的区块坐标"""
+    return tuple((cx, cy)
+                 for cx in range((x0 - margin) // CHUNK_SIZE, (x1 + margin) // CHUNK_SIZE + 1)
+                 for cy in range((y0 - margin) // CHUNK_SIZE, (y1 + margin) // CHUNK_SIZE + 1))
+
+
+def box_chunk_count(x0: int, y0: int, x1: int, y1: int,
+                    margin: int = WATER_PROXIMITY_RADIUS) -> int:
+    """chunks_in_box会返回的区块数（不构建元组）"""
+    width = (x1 + margin) // CHUNK_SIZE - (x0 - margin) // CHUNK_SIZE + 1
+    height = (y1 + margin) // CHUNK_SIZE - (y0 - margin) // CHUNK_SIZE + 1
+    return width * height
+
+
+def tiles_box(tiles, pad: int = 1) -> Box:
+    """一组格子的外接矩形，四周各扩pad格（展开节点会读取相邻格）"""
+    xs = [x for x, _ in tiles]
+    ys = [y for _, y in tiles]
+    return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+
+@dataclass
+class CachedPath:
+    """一条缓存的路径（空列表表示不可达）"""
+    path: List[Tile]
+    chunks: Tuple[Tuple[int, int], ...]
+    versions: Tuple[int, ...]
+    positions: Dict[Tile, int] = field(default_factory=dict)
+    costs: List[float] = field(default_factory=list)  # 从起点走到每个位置的累计代价
+
+
+@dataclass
+class FlowField:
+    """以root为根的最短路树
+
+    reverse=False：从root出发到各格（热门起点）；reverse=True：各格到root（热门终点）
+    parents[t] 为树上靠近root的下一格，costs[t] 为到root的代价
+    """
+    root: Tile
+    reverse: bool
+    max_distance: float
+    parents: Dict[Tile, Optional[Tile]]
+    costs: Dict[Tile, float]
+    chunks: Tuple[Tuple[int, int], ...]
+    versions: Tuple[int, ...]
+
+    def path_to(self, tile: Tile) -> Optional[List[Tile]]:
+        """沿父指针取路径（起点在前）；tile不在树上返回None"""
+        if tile not in self.parents:
+            return None
+        path = [tile]
+        parent = self.parents[tile]
+        while parent is not None:
+            path.append(parent)
+            parent = self.parents[parent]
+        if not self.reverse:
+            path.reverse()
+        return path
+
+
+class PathCache:
+    """路径LRU缓存 + 子路径索引 + 热门起终点计数"""
+
+    def __init__(self, chunk_manager, max_paths: int = 1024, flow_threshold: int = 8,
+                 max_flow_fields: int = 8):
+        self.chunk_manager = chunk_manager
+        self.max_paths = max_paths
+        self.flow_threshold = flow_threshold  # 同一起点/终点未命中多少次后建立流场
+        self.max_flow_fields = max_flow_fields
+
+        self.paths: Dict[PathKey, CachedPath] = OrderedDict()
+        # 格子 -> 经过它的缓存路径键（用于子路径复用）
+        self.through: Dict[Tile, List[PathKey]] = {}
+        self.flow_fields: Dict[Tuple[Tile, bool, float], FlowField] = OrderedDict()
+        self.popularity: Counter = Counter()
+
+        self.hits = 0
+        self.subpath_hits = 0
+        self.flow_hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    # ------------------------------------------------------------------
+    # 版本校验
+    # ------------------------------------------------------------------
+    def snapshot(self, chunks: Tuple[Tuple[int, int], ...]) -> Tuple[int, ...]:
+        """各区块的版本号（不会生成或读入区块）"""
+        version = self.chunk_manager.chunk_version
+        return tuple(version(cx, cy) for cx, cy in chunks)
+
+    def _is_current(self, entry) -> bool:
+        return self.snapshot(entry.chunks) == entry.versions
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def lookup(self, start: Tile, end: Tile, max_distance: float) -> Optional[List[Tile]]:
+        """返回路径副本（[]表示已知不可达）；未命中返回None"""
+        key = (start, end, max_distance)
+        entry = self.paths.get(key)
+        if entry is not None:
+            if self._is_current(entry):
+                self.paths.move_to_end(key)
+                self.hits += 1
+                return list(entry.path)
+            self._remove(key)
+            self.invalidated += 1
+
+        path = self._lookup_subpath(start, end, max_distance)
+        if path is not None:
+            self.subpath_hits += 1
+            return path
+
+        path = self._lookup_flow(start, end, max_distance)
+        if path is not None:
+            self.flow_hits += 1
+            return path
+
+        self.misses += 1
+        return None
+
+    def _lookup_subpath(self, start: Tile, end: Tile, max_distance: float) -> Optional[List[Tile]]:
+        """起点和终点按顺序出现在某条缓存路径上时，截取其中一段
+
+        与搜索的剪枝一致：终点前一格的代价不超过max_distance时，搜索才能走到终点
+        """
+        for key in self.through.get(start, ()):
+            entry = self.paths.get(key)
+            if entry is None:
+                continue
+            i = entry.positions[start]
+            j = entry.positions.get(end)
+            if j is None or j <= i or entry.costs[j - 1] - entry.costs[i] > max_distance:
+                continue
+            if self._is_current(entry):
+                return entry.path[i:j + 1]
+        return None
+
+    def _lookup_flow(self, start: Tile, end: Tile, max_distance: float) -> Optional[List[Tile]]:
+        """热门起点的搜索树可以给出确定结果（含不可达），热门终点的流场只给出已覆盖的起点"""
+        forward = self._current_flow((start, False, max_distance))
+        if forward is not None:
+            path = forward.path_to(end)
+            return path if path is not None else []
+        backward = self._current_flow((end, True, max_distance))
+        if backward is not None:
+            return backward.path_to(start)
+        return None
+
+    def _current_flow(self, key) -> Optional[FlowField]:
+        flow = self.flow_fields.get(key)
+        if flow is None:
+            return None
+        if not self._is_current(flow):
+            del self.flow_fields[key]
+            self.invalidated += 1
+            return None
+        return flow
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def store(self, start: Tile, end: Tile, max_distance: float, path: List[Tile],
+              searched: Optional[Box] = None, costs: Optional[List[float]] = None) -> bool:
+        """缓存一次搜索结果，返回是否缓存
+
+        成功时依赖路径经过的区块；失败时依赖searched（搜索展开过的格子外接矩形），
+        没有给出或超过MAX_FAILURE_CHUNKS个区块时不缓存；
+        costs为路径上每个位置的累计代价，没有给出时这条路径不参与子路径复用
+        """
+        if path:
+            chunks = chunks_in_box(*tiles_box(path, pad=0))
+        else:
+            if searched is None or box_chunk_count(*searched) > MAX_FAILURE_CHUNKS:
+                return False
+            chunks = chunks_in_box(*searched)
+        key = (start, end, max_distance)
+        if key in self.paths:
+            self._remove(key)
+        entry = CachedPath(list(path), chunks, self.snapshot(chunks),
+                           {tile: i for i, tile in enumerate(path)}, list(costs or ()))
+        self.paths[key] = entry
+        if entry.costs:
+            for tile in path:
+                self.through.setdefault(tile, []).append(key)
+        while len(self.paths) > self.max_paths:
+            self._remove(next(iter(self.paths)))
+        return True
+
+    def _remove(self, key: PathKey):
+        entry = self.paths.pop(key)
+        if not entry.costs:
+            return  # 没有进入子路径索引
+        for tile in entry.path:
+            keys = self.through.get(tile)
+            if keys is not None:
+                keys.remove(key)
+                if not keys:
+                    del self.through[tile]
+
+    def note_miss(self, start: Tile, end: Tile, max_distance: float) -> Optional[Tuple[Tile, bool]]:
+        """记录一次真正的搜索；某个起点/终点足够热门时返回 (root, reverse) 供建立流场"""
+        self.popularity[(start, False, max_distance)] += 1
+        self.popularity[(end, True, max_distance)] += 1
+        if len(self.popularity) > 16 * self.max_paths:
+            self.popularity.clear()
+        for key in ((start, False, max_distance), (end, True, max_distance)):
+            if self.popularity[key] >= self.flow_threshold and key not in self.flow_fields:
+                del self.popularity[key]
+                return key[0], key[1]
+        return None
+
+    def add_flow_field(self, flow: FlowField):
+        key = (flow.root, flow.reverse, flow.max_distance)
+        self.flow_fields[key] = flow
+        self.flow_fields.move_to_end(key)
+        while len(self.flow_fields) > self.max_flow_fields:
+            self.flow_fields.popitem(last=False)
+
+    def clear(self):
+        self.paths.clear()
+        self.through.clear()
+        self.flow_fields.clear()
+        self.popularity.clear()
+
+    def get_stats(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'subpath_hits': self.subpath_hits,
+            'flow_hits': self.flow_hits,
+            'misses': self.misses,
+            'invalidated': self.invalidated,
+            'cached_paths': len(self.paths),
+            'flow_fields': len(self.flow_fields),
+        }
@@ -0,0 +1,154 @@
+"""
+Path Scheduler - 分时寻路调度
+寻路请求进入优先级队列，每帧只在CPU预算内推进搜索（A*可跨帧暂停/继续），
+完成后回调（通常是SmoothMovement.set_path）；帧时间不再随同时重新寻路的AI数量抖动。
+确定性模式下改用每帧固定的分片数作为预算，结果不受机器快慢影响；
+寻路器的background_jobs（如流场构建）以最低优先级排队，只用寻路请求剩下的预算
+"""
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Tuple
+
+# 优先级：数值越小越先处理
+PRIORITY_PLAYER = 0     # 玩家控制/镜头跟随的角色
+PRIORITY_CRITICAL = 1   # 体力告急的AI
+PRIORITY_NORMAL = 2
+PRIORITY_BACKGROUND = 3  # 寻路器的后台任务
+
+
+@dataclass(order=True)
+class PathRequest:
+    """一次寻路请求（依次尝试goals，直到找到长度>1的路径）"""
+    priority: int
+    seq: int
+    owner: Any = field(compare=False)
+    start: Tuple[float, float] = field(compare=False)
+    goals: List[Tuple[float, float]] = field(compare=False)
+    callback: Callable[[List[Tuple[int, int]]], None] = field(compare=False)
+    max_distance: int = field(compare=False, default=50)
+    job: Optional[Generator] = field(compare=False, default=None, repr=False)
+    cancelled: bool = field(compare=False, default=False)
+    submitted_at: float = field(compare=False, default=0.0)
+    slices: int = field(compare=False, default=0)
+
+
+class PathScheduler:
+    """按帧预算推进寻路请求"""
+
+    def __init__(self, pathfinder, budget_ms: float = 2.0, slice_budget: int = 0):
+        self.pathfinder = pathfinder
+        self.budget_ms = budget_ms
+        self.slice_budget = slice_budget  # >0时每帧最多推进这么多片，忽略budget_ms
+        self.queue: List[PathRequest] = []
+        self.pending: Dict[Any, PathRequest] = {}  # owner -> 最新请求
+        self._seq = itertools.count()
+        self.frame = 0
+
+        self.completed = 0
+        self.cancelled = 0
+        self.frames_over_budget = 0
+        self.last_frame_ms = 0.0
+        self.max_wait_frames = 0
+
+    def submit(self, owner, start: Tuple[float, float], goals: Sequence[Tuple[float, float]],
+               callback: Callable[[List[Tuple[int, int]]], None],
+               priority: int = PRIORITY_NORMAL, max_distance: int = 50) -> PathRequest:
+        """提交请求；同一owner的旧请求被取消"""
+        self.cancel(owner)
+        request = PathRequest(priority, next(self._seq), owner, start, list(goals),
+                              callback, max_distance, submitted_at=self.frame)
+        request.job = self._run(request)
+        heapq.heappush(self.queue, request)
+        self.pending[owner] = request
+        return request
+
+    def cancel(self, owner) -> bool:
+        """取消owner尚未完成的请求（不回调）"""
+        request = self.pending.pop(owner, None)
+        if request is None:
+            return False
+        request.cancelled = True
+        request.job.close()
+        self.cancelled += 1
+        return True
+
+    def is_pending(self, owner) -> bool:
+        return owner in self.pending
+
+    def _take_background_jobs(self):
+        """把寻路器新排队的后台任务放进队列（任务本身作为owner，完成时不回调）"""
+        jobs = getattr(self.pathfinder, 'background_jobs', None)
+        while jobs:
+            job = jobs.popleft()
+            request = PathRequest(PRIORITY_BACKGROUND, next(self._seq), job, (0.0, 0.0), [],
+                                  lambda _: None, job=job, submitted_at=self.frame)
+            heapq.heappush(self.queue, request)
+            self.pending[job] = request
+
+    def _run(self, request: PathRequest) -> Generator[None, None, List[Tuple[int, int]]]:
+        """请求的分片执行体：依次尝试各个目标"""
+        steps = getattr(self.pathfinder, 'find_path_steps', None)
+        sx, sy = request.start
+        for gx, gy in request.goals:
+            if steps is not None:
+                path = yield from steps(sx, sy, gx, gy, request.max_distance)
+            else:
+                # 不支持分片的寻路器整段执行
+                path = self.pathfinder.find_path(sx, sy, gx, gy, request.max_distance)
+                yield
+            if path and len(path) > 1:
+                return path
+        return []
+
+    def update(self) -> int:
+        """每帧调用：在预算内按优先级推进请求，返回完成数量（每帧至少推进一片）"""
+        self.frame += 1
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000.0
+        completed = 0
+        slices = 0
+
+        while self.queue or getattr(self.pathfinder, 'background_jobs', None):
+            self._take_background_jobs()
+            request = self.queue[0]
+            if request.cancelled:
+                heapq.heappop(self.queue)
+                continue
+            try:
+                next(request.job)
+                request.slices += 1
+            except StopIteration as done:
+                heapq.heappop(self.queue)
+                del self.pending[request.owner]
+                request.callback(done.value)
+                if request.priority != PRIORITY_BACKGROUND:
+                    self.max_wait_frames = max(self.max_wait_frames,
+                                               self.frame - request.submitted_at)
+                    completed += 1
+            slices += 1
+            if self.slice_budget > 0:
+                if slices >= self.slice_budget:
+                    break
+            elif time.perf_counter() >= deadline:
+                break
+
+        self.last_frame_ms = (time.perf_counter() - start) * 1000
+        if self.last_frame_ms > self.budget_ms * 1.5:
+            self.frames_over_budget += 1
+        self.completed += completed
+        return completed
+
+    def get_stats(self) -> Dict:
+        return {
+            'queued': sum(1 for r in self.pending.values() if r.priority != PRIORITY_BACKGROUND),
+            'background': (sum(1 for r in self.pending.values() if r.priority == PRIORITY_BACKGROUND)
+                           + len(getattr(self.pathfinder, 'background_jobs', ()))),
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'frames_over_budget': self.frames_over_budget,
+            'last_frame_ms': self.last_frame_ms,
+            'max_wait_frames': self.max_wait_frames,
+        }
@@ -0,0 +1,321 @@
+"""
+Path Workers - 多进程寻路
+每个工作进程持有自己的ChunkManager（按同一种子生成地形，只读），
+主进程把被修改过的区块广播给所有进程，把寻路请求分批发给各进程，
+每帧收取结果并在主线程回调；接口与PathScheduler一致，可直接替换
+"""
+
+import itertools
+import multiprocessing as mp
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.chunk_manager import CHUNK_SIZE, Chunk, ChunkManager, generate_terrain
+from core.path_scheduler import PRIORITY_NORMAL
+
+# 发给工作进程的消息
+_MSG_CHUNK = 'chunk'
+_MSG_BATCH = 'batch'
+_MSG_PRELOAD = 'preload'
+_MSG_STOP = 'stop'
+
+# 工作进程可用的寻路算法（与headless.py --pathfinder同名）
+WORKER_PATHFINDERS = ('flat', 'jps', 'hpa')
+
+# 请求所在的进程崩溃后最多重发几次，超过则以空路径回调（避免一个请求连续搞垮所有进程）
+MAX_RETRIES = 1
+
+
+def _build_pathfinder(name: str, chunk_manager, use_cache: bool):
+    """按名字构建工作进程内的寻路器（与主进程的选择一致）"""
+    if name == 'hpa':
+        from core.hierarchical_pathfinder import HierarchicalPathfinder
+        return HierarchicalPathfinder(chunk_manager)
+    from core.collision_pathfinder import CollisionPathfinder
+    return CollisionPathfinder(chunk_manager, use_cache=use_cache,
+                               mode='jps' if name == 'jps' else 'astar')
+
+
+def _worker_main(worker_id: int, seed: int, vectorized: bool, max_resident: Optional[int],
+                 pathfinder_name: str, use_cache: bool, inbox, outbox):
+    """工作进程：收区块更新和寻路批次，返回 (请求id, 路径) 列表"""
+    chunk_manager = ChunkManager(seed=seed, vectorized=vectorized, max_resident=max_resident)
+    try:
+        pathfinder = _build_pathfinder(pathfinder_name, chunk_manager, use_cache)
+        while True:
+            message = inbox.get()
+            kind = message[0]
+            if kind == _MSG_STOP:
+                break
+            if kind == _MSG_CHUNK:
+                _, cx, cy, version, tile_types, variants = message
+                chunk_manager.replace_chunk(Chunk(cx, cy, tile_types, variants, version))
+            elif kind == _MSG_PRELOAD:
+                # 生成区块并算好靠近水掩码，之后的搜索不再为此付出时间
+                for cx, cy in message[1]:
+                    chunk_manager.get_chunk(cx, cy)
+                    chunk_manager.is_near_water(cx * CHUNK_SIZE, cy * CHUNK_SIZE)
+                outbox.put((worker_id, []))
+            elif kind == _MSG_BATCH:
+                results = []
+                for request_id, (sx, sy), goals, max_distance in message[1]:
+                    path: List[Tuple[int, int]] = []
+                    for gx, gy in goals:
+                        path = pathfinder.find_path(sx, sy, gx, gy, max_distance)
+                        if path and len(path) > 1:
+                            break
+                    results.append((request_id, path))
+                outbox.put((worker_id, results))
+    finally:
+        # 工作进程的区块也可能写盘，退出时删掉它自己的临时目录
+        chunk_manager.close()
+
+
+@dataclass
+class WorkerRequest:
+    """已提交、等待结果的请求"""
+    request_id: int
+    priority: int
+    owner: Any
+    start: Tuple[float, float]
+    goals: List[Tuple[float, float]]
+    callback: Callable[[List[Tuple[int, int]]], None]
+    max_distance: int = 50
+    sent: bool = field(default=False)
+    worker: Optional[int] = field(default=None)  # 已发给哪个进程
+    retries: int = field(default=0)
+
+
+class PathWorkerPool:
+    """多进程寻路池（submit/cancel/is_pending/update与PathScheduler相同）"""
+
+    def __init__(self, chunk_manager, workers: int = 2, batch_size: int = 16,
+                 max_in_flight: int = 4, use_cache: bool = True,
+                 worker_max_chunks: Optional[int] = 1024, pathfinder: str = 'flat'):
+        if pathfinder not in WORKER_PATHFINDERS:
+            raise ValueError(f"工作进程不支持的寻路算法: {pathfinder}")
+        self.chunk_manager = chunk_manager
+        self.pathfinder_name = pathfinder
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight  # 每个进程最多同时排队的批次
+        vectorized = chunk_manager.terrain_generator is generate_terrain
+
+        self.outbox = mp.Queue()
+        self.inboxes = []
+        self.processes = []
+        for worker_id in range(workers):
+            inbox = mp.Queue()
+            process = mp.Process(target=_worker_main, daemon=True,
+                                 args=(worker_id, chunk_manager.seed, vectorized,
+                                       worker_max_chunks, pathfinder, use_cache,
+                                       inbox, self.outbox))
+            process.start()
+            self.inboxes.append(inbox)
+            self.processes.append(process)
+        self.in_flight = [0] * workers
+        self.alive = [True] * workers
+
+        self._ids = itertools.count()
+        self.requests: Dict[int, WorkerRequest] = {}
+        self.pending: Dict[Any, int] = {}  # owner -> 最新请求id
+        self.sent_versions: Dict[Tuple[int, int], int] = {}
+        # 自上次广播以来改过的区块：已有的修改（常驻或已写盘）+ 之后set_tile/replace_chunk通知的
+        self.dirty = {coord for coord, chunk in chunk_manager.chunks.items() if chunk.version}
+        self.dirty.update(chunk_manager.store.saved)
+        chunk_manager.edit_listeners.append(self.dirty.add)
+
+        self.completed = 0
+        self.cancelled = 0
+        self.batches = 0
+        self.chunks_broadcast = 0
+        self.failed = 0
+        self.dead_workers = 0
+
+    # ------------------------------------------------------------------
+    # 请求
+    # ------------------------------------------------------------------
+    def submit(self, owner, start: Tuple[float, float], goals: Sequence[Tuple[float, float]],
+               callback: Callable[[List[Tuple[int, int]]], None],
+               priority: int = PRIORITY_NORMAL, max_distance: int = 50) -> WorkerRequest:
+        self.cancel(owner)
+        request = WorkerRequest(next(self._ids), priority, owner, start, list(goals),
+                                callback, max_distance)
+        self.requests[request.request_id] = request
+        self.pending[owner] = request.request_id
+        return request
+
+    def cancel(self, owner) -> bool:
+        """取消owner的请求；已发出的结果回来后丢弃"""
+        request_id = self.pending.pop(owner, None)
+        if request_id is None:
+            return False
+        request = self.requests[request_id]
+        if request.sent:
+            request.owner = None  # 结果回来时丢弃
+        else:
+            del self.requests[request_id]
+        self.cancelled += 1
+        return True
+
+    def is_pending(self, owner) -> bool:
+        return owner in self.pending
+
+    # ------------------------------------------------------------------
+    # 每帧
+    # ------------------------------------------------------------------
+    def sync_chunks(self) -> int:
+        """把自上次广播以来改过的区块（常驻或已写盘）广播给所有工作进程，只看dirty集合"""
+        if not self.dirty:
+            return 0
+        manager = self.chunk_manager
+        changed = []
+        for coord in self.dirty:
+            chunk = manager.chunks.get(coord)
+            if chunk is None:
+                saved = manager.store.load(*coord)
+                if saved is None:
+                    continue
+                chunk = Chunk(coord[0], coord[1], saved[1], saved[2], saved[0])
+            if self.sent_versions.get(coord) != chunk.version:
+                changed.append(chunk)
+        self.dirty.clear()
+
+        for chunk in changed:
+            message = (_MSG_CHUNK, chunk.cx, chunk.cy, chunk.version,
+                       chunk.tile_types, chunk.variants)
+            for inbox in self.inboxes:
+                inbox.put(message)
+            self.sent_versions[(chunk.cx, chunk.cy)] = chunk.version
+        self.chunks_broadcast += len(changed)
+        return len(changed)
+
+    def preload(self, chunk_coords: Sequence[Tuple[int, int]]):
+        """让每个工作进程都生成这些区块（含靠近水掩码），与主进程的缓存状态对齐"""
+        coords = list(chunk_coords)
+        for worker_id, inbox in enumerate(self.inboxes):
+            if self.alive[worker_id]:
+                inbox.put((_MSG_PRELOAD, coords))
+                self.in_flight[worker_id] += 1
+
+    def reap_dead_workers(self) -> int:
+        """发现已退出的工作进程：它手上的请求重新排队（超过重试次数则以空路径回调）
+
+        返回本次发现的死亡进程数；所有进程都死掉时剩余请求全部以空路径回调
+        """
+        dead = [worker_id for worker_id, process in enumerate(self.processes)
+                if self.alive[worker_id] and not process.is_alive()]
+        for worker_id in dead:
+            self.alive[worker_id] = False
+            self.in_flight[worker_id] = 0
+            self.dead_workers += 1
+            for request in list(self.requests.values()):
+                if not request.sent or request.worker != worker_id:
+                    continue
+                request.sent = False
+                request.worker = None
+                request.retries += 1
+                if request.owner is None:
+                    del self.requests[request.request_id]  # 已取消
+                elif request.retries > MAX_RETRIES:
+                    self._fail(request)
+        if dead and not any(self.alive):
+            for request in list(self.requests.values()):
+                if request.owner is None:
+                    del self.requests[request.request_id]
+                else:
+                    self._fail(request)
+        return len(dead)
+
+    def _fail(self, request: WorkerRequest):
+        """放弃请求：以空路径回调（与找不到路径相同）"""
+        del self.requests[request.request_id]
+        del self.pending[request.owner]
+        self.failed += 1
+        request.callback([])
+
+    def _dispatch(self):
+        """按优先级把未发送的请求分批发给最空闲的进程"""
+        workers = [worker_id for worker_id in range(len(self.inboxes)) if self.alive[worker_id]]
+        if not workers:
+            return
+        unsent = sorted((r for r in self.requests.values() if not r.sent),
+                        key=lambda r: (r.priority, r.request_id))
+        while unsent:
+            worker_id = min(workers, key=self.in_flight.__getitem__)
+            if self.in_flight[worker_id] >= self.max_in_flight:
+                break
+            batch, unsent = unsent[:self.batch_size], unsent[self.batch_size:]
+            for request in batch:
+                request.sent = True
+                request.worker = worker_id
+            self.inboxes[worker_id].put((_MSG_BATCH, [
+                (r.request_id, r.start, r.goals, r.max_distance) for r in batch]))
+            self.in_flight[worker_id] += 1
+            self.batches += 1
+
+    def collect(self, timeout: float = 0.0) -> int:
+        """收取已完成的批次并回调，返回完成数量；timeout>0时最多等待第一批这么久"""
+        completed = 0
+        while True:
+            try:
+                if timeout > 0:
+                    worker_id, results = self.outbox.get(timeout=timeout)
+                    timeout = 0.0
+                else:
+                    worker_id, results = self.outbox.get_nowait()
+            except queue.Empty:
+                break
+            self.in_flight[worker_id] = max(0, self.in_flight[worker_id] - 1)
+            for request_id, path in results:
+                request = self.requests.pop(request_id, None)
+                if request is None or request.owner is None:
+                    continue  # 已取消
+                del self.pending[request.owner]
+                completed += 1
+                request.callback(path)
+        self.completed += completed
+        return completed
+
+    def update(self) -> int:
+        """每帧调用：检查死亡进程、广播区块修改、发送新批次、收取结果"""
+        self.reap_dead_workers()
+        self.sync_chunks()
+        self._dispatch()
+        return self.collect()
+
+    def wait(self, timeout: float = 30.0) -> int:
+        """阻塞直到所有请求（和预加载）完成（基准测试用）"""
+        deadline = time.perf_counter() + timeout
+        completed = 0
+        while (self.requests or any(self.in_flight)) and time.perf_counter() < deadline:
+            self.reap_dead_workers()
+            self.sync_chunks()
+            self._dispatch()
+            completed += self.collect(timeout=0.05)
+        return completed
+
+    def get_stats(self) -> Dict:
+        return {
+            'workers': len(self.processes),
+            'queued': len(self.pending),
+            'completed': self.completed,
+            'cancelled': self.cancelled,
+            'batches': self.batches,
+            'chunks_broadcast': self.chunks_broadcast,
+            'failed': self.failed,
+            'dead_workers': self.dead_workers,
+        }
+
+    def shutdown(self):
+        """停止所有工作进程"""
+        if self.dirty.add in self.chunk_manager.edit_listeners:
+            self.chunk_manager.edit_listeners.remove(self.dirty.add)
+        for inbox in self.inboxes:
+            inbox.put((_MSG_STOP,))
+        for process in self.processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        self.processes.clear()
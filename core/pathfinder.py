@@ -5,50 +5,58 @@ Pathfinder - A* 路径寻找 + Bezier 平滑移动
 
 import heapq
 import math
+from array import array
 from typing import List, Tuple, Optional
-from dataclasses import dataclass
 import pygame
 
-@dataclass
-class Node:
-    """A*节点"""
-    x: int
-    y: int
-    g: float = 0
-    h: float = 0
-    parent: Optional['Node'] = None
-    
-    @property
-    def f(self) -> float:
-        return self.g + self.h
-        
-    def __lt__(self, other):
-        return self.f < other.f
-        
-    def __eq__(self, other):
-        return self.x == other.x and self.y == other.y
-        
-    def __hash__(self):
-        return hash((self.x, self.y))
+from core.jump_point import jps_search_grid
 
 
 class AStarPathfinder:
-    """A*路径寻找器"""
+    """A*路径寻找器
+
+    格子编号为 y * width + x；g值和父节点存在扁平数组里，
+    开放表是惰性删除的二叉堆（更优的g直接再压一次，弹出过期项时跳过）
+    """
     
-    def __init__(self, world_width: int, world_height: int):
+    NEIGHBORS = ((-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0),
+                 (-1, -1, 1.414), (-1, 1, 1.414), (1, -1, 1.414), (1, 1, 1.414))
+    
+    def __init__(self, world_width: int, world_height: int, mode: str = 'astar'):
+        if mode not in ('astar', 'jps'):
+            raise ValueError(f"未知寻路模式: {mode}")
         self.width = world_width
         self.height = world_height
         self.obstacles: set = set()
+        self.blocked = bytearray(world_width * world_height)  # 1=障碍，与obstacles同步
+        self.open_cells = self._padded_open()  # 带一圈障碍边框的可行走表，供跳点搜索
+        self.mode = mode  # 'astar'逐格展开 / 'jps'跳点搜索
+        self.last_expansions = 0
         
     def set_obstacles(self, obstacles: List[Tuple[int, int]]):
         """设置障碍物"""
         self.obstacles = set(obstacles)
+        self.blocked = bytearray(self.width * self.height)
+        for x, y in self.obstacles:
+            if 0 <= x < self.width and 0 <= y < self.height:
+                self.blocked[y * self.width + x] = 1
+        self.open_cells = self._padded_open()
+
+    def _padded_open(self) -> bytearray:
+        """可行走表（1=可走），四周加一圈0；行宽为width + 2"""
+        width, stride = self.width, self.width + 2
+        open_cells = bytearray(stride * (self.height + 2))
+        walkable = self.blocked.translate(bytes([1]) + bytes(255))
+        for y in range(self.height):
+            start = (y + 1) * stride + 1
+            open_cells[start:start + width] = walkable[y * width:(y + 1) * width]
+        return open_cells
         
     def is_walkable(self, x: int, y: int) -> bool:
         """检查是否可行走"""
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return False
-        return (x, y) not in self.obstacles
+        return not self.blocked[y * self.width + x]
         
     def heuristic(self, x1: int, y1: int, x2: int, y2: int) -> float:
         """启发式函数（对角线距离）"""
@@ -58,78 +66,85 @@ class AStarPathfinder:
         
     def find_path(self, start_x: float, start_y: float, 
                   end_x: float, end_y: float) -> List[Tuple[int, int]]:
-        """寻找路径"""
-        start = Node(int(start_x), int(start_y))
-        end = Node(int(end_x), int(end_y))
+        """寻找路径（起点不在地图内时返回空路径）"""
+        sx, sy = int(start_x), int(start_y)
+        ex, ey = int(end_x), int(end_y)
         
-        if not self.is_walkable(end.x, end.y):
-            end = self._find_nearest_walkable(end.x, end.y)
-            if end is None:
+        if not self.is_walkable(ex, ey):
+            nearest = self._find_nearest_walkable(ex, ey)
+            if nearest is None:
                 return []
-                
-        open_set = []
-        heapq.heappush(open_set, start)
-        closed_set: set = set()
-        open_dict: dict = {(start.x, start.y): start}
+            ex, ey = nearest
+        if not (0 <= sx < self.width and 0 <= sy < self.height):
+            return []
+            
+        if self.mode == 'jps':
+            stride = self.width + 2
+            cells, self.last_expansions = jps_search_grid(
+                self.open_cells, stride, (sy + 1) * stride + sx + 1, (ey + 1) * stride + ex + 1)
+            return [(i % stride - 1, i // stride - 1) for i in cells]
+            
+        width, height = self.width, self.height
+        blocked = self.blocked
+        heuristic = self.heuristic
+        start = sy * width + sx
+        goal = ey * width + ex
+        
+        g_score = [math.inf] * (width * height)
+        parent = array('i', [-1]) * (width * height)
+        closed = bytearray(width * height)
+        g_score[start] = 0.0
+        open_set = [(heuristic(sx, sy, ex, ey), start)]
+        expanded = 0
         
         while open_set:
-            current = heapq.heappop(open_set)
-            
-            if current.x == end.x and current.y == end.y:
-                return self._reconstruct_path(current)
-                
-            closed_set.add((current.x, current.y))
+            _, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue  # 过期项：该格已用更小的g展开过
+            if current == goal:
+                self.last_expansions = expanded
+                return self._reconstruct_path(parent, current)
+            closed[current] = 1
+            expanded += 1
             
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1),
-                          (-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                nx, ny = current.x + dx, current.y + dy
-                
-                if (nx, ny) in closed_set:
+            cy, cx = divmod(current, width)
+            g = g_score[current]
+            for dx, dy, move_cost in self.NEIGHBORS:
+                nx, ny = cx + dx, cy + dy
+                if nx < 0 or nx >= width or ny < 0 or ny >= height:
                     continue
-                    
-                if not self.is_walkable(nx, ny):
+                neighbor = ny * width + nx
+                if closed[neighbor] or blocked[neighbor]:
                     continue
+                # 不穿角：斜向移动要求两个相邻正交格都可行走
+                if dx and dy and (blocked[cy * width + nx] or blocked[ny * width + cx]):
+                    continue
+                new_g = g + move_cost
+                if new_g < g_score[neighbor]:
+                    g_score[neighbor] = new_g
+                    parent[neighbor] = current
+                    heapq.heappush(open_set, (new_g + heuristic(nx, ny, ex, ey), neighbor))
                     
-                if abs(dx) == 1 and abs(dy) == 1:
-                    if not self.is_walkable(current.x + dx, current.y) or \
-                       not self.is_walkable(current.x, current.y + dy):
-                        continue
-                        
-                move_cost = 1.414 if abs(dx) == 1 and abs(dy) == 1 else 1.0
-                new_g = current.g + move_cost
-                
-                neighbor = open_dict.get((nx, ny))
-                if neighbor is None:
-                    neighbor = Node(nx, ny)
-                    neighbor.g = new_g
-                    neighbor.h = self.heuristic(nx, ny, end.x, end.y)
-                    neighbor.parent = current
-                    heapq.heappush(open_set, neighbor)
-                    open_dict[(nx, ny)] = neighbor
-                elif new_g < neighbor.g:
-                    neighbor.g = new_g
-                    neighbor.parent = current
-                    heapq.heapify(open_set)
-                    
+        self.last_expansions = expanded
         return []
         
-    def _find_nearest_walkable(self, x: int, y: int) -> Optional[Node]:
+    def _find_nearest_walkable(self, x: int, y: int) -> Optional[Tuple[int, int]]:
         """找到最近的可行走点"""
         for radius in range(1, 10):
             for dx in range(-radius, radius + 1):
                 for dy in range(-radius, radius + 1):
                     nx, ny = x + dx, y + dy
                     if self.is_walkable(nx, ny):
-                        return Node(nx, ny)
+                        return (nx, ny)
         return None
         
-    def _reconstruct_path(self, end_node: Node) -> List[Tuple[int, int]]:
+    def _reconstruct_path(self, parent, current: int) -> List[Tuple[int, int]]:
         """重建路径"""
         path = []
-        current: Optional[Node] = end_node
-        while current:
-            path.append((current.x, current.y))
-            current = current.parent
+        while current != -1:
+            y, x = divmod(current, self.width)
+            path.append((x, y))
+            current = parent[current]
         return list(reversed(path))
 
 
@@ -0,0 +1,143 @@
+"""
+Frame Profiler - 按子系统的帧耗时分析
+Game.update/Game.render的每个阶段包在profiler.scope(名字)里：
+开启时记录每帧各阶段耗时（滚动窗口，供屏幕叠加层显示），可同时录制Chrome trace-event JSON
+（chrome://tracing 或 Perfetto 打开）；关闭时scope返回同一个空上下文，几乎没有开销
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Deque, Dict, List, Optional
+
+_NULL_SCOPE = nullcontext()
+
+
+class _Scope:
+    """一次计时（with块）"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'FrameProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """帧耗时分析器"""
+
+    def __init__(self, history: int = 120, max_trace_events: int = 200000):
+        self.enabled = False
+        self.history = history                  # 滚动窗口帧数
+        self.samples: Dict[str, Deque[float]] = {}  # 阶段 -> 最近history帧的耗时(ms)
+        self.frame_times: Deque[float] = deque(maxlen=history)
+        self._current: Dict[str, float] = {}     # 本帧各阶段累计耗时(ms)
+        self._frame_start: Optional[float] = None
+        self.frames = 0
+
+        # Chrome trace录制
+        self.tracing = False
+        self.trace_events: Deque[Dict] = deque(maxlen=max_trace_events)
+        self._epoch = time.perf_counter()
+        self._pid = os.getpid()
+
+    # ------------------------------------------------------------------
+    # 计时
+    # ------------------------------------------------------------------
+    def scope(self, name: str):
+        """with profiler.scope('render.world'): ...；未开启时返回空上下文"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def record(self, name: str, start: float, end: float):
+        self._current[name] = self._current.get(name, 0.0) + (end - start) * 1000
+        if self.tracing:
+            self._trace(name, start, end)
+
+    def _trace(self, name: str, start: float, end: float):
+        self.trace_events.append({
+            'name': name, 'cat': name.split('.', 1)[0], 'ph': 'X',
+            'ts': (start - self._epoch) * 1e6, 'dur': (end - start) * 1e6,
+            'pid': self._pid, 'tid': threading.get_ident(),
+        })
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """一帧结束：把本帧各阶段耗时放入滚动窗口（本帧没出现的阶段记0）"""
+        if not self.enabled or self._frame_start is None:
+            return
+        end = time.perf_counter()
+        self.frame_times.append((end - self._frame_start) * 1000)
+        if self.tracing:
+            self._trace('frame', self._frame_start, end)
+        for name in self._current:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.history)
+        for name, window in self.samples.items():
+            window.append(self._current.get(name, 0.0))
+        self._current.clear()
+        self._frame_start = None
+        self.frames += 1
+
+    # ------------------------------------------------------------------
+    # 开关
+    # ------------------------------------------------------------------
+    def toggle(self) -> bool:
+        self.set_enabled(not self.enabled)
+        return self.enabled
+
+    def set_enabled(self, enabled: bool):
+        """开关计时；录制trace期间始终计时"""
+        self.enabled = enabled or self.tracing
+        if not self.enabled:
+            self._current.clear()
+            self._frame_start = None
+
+    def start_trace(self):
+        """开始录制trace（同时开启计时）"""
+        self.enabled = True
+        self.trace_events.clear()
+        self.tracing = True
+
+    def stop_trace(self, path: str) -> int:
+        """停止录制并导出，返回事件数"""
+        self.tracing = False
+        return self.export_chrome_trace(path)
+
+    # ------------------------------------------------------------------
+    # 结果
+    # ------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """各阶段在滚动窗口内的平均/最大耗时(ms)，按平均耗时降序"""
+        stats = {}
+        for name, window in self.samples.items():
+            if window:
+                stats[name] = {'avg': sum(window) / len(window), 'max': max(window)}
+        if self.frame_times:
+            stats['frame'] = {'avg': sum(self.frame_times) / len(self.frame_times),
+                              'max': max(self.frame_times)}
+        return dict(sorted(stats.items(), key=lambda item: -item[1]['avg']))
+
+    def export_chrome_trace(self, path: str) -> int:
+        """写出Chrome trace-event格式（JSON对象格式），返回事件数"""
+        events: List[Dict] = list(self.trace_events)
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self._pid,
+                     'args': {'name': 'AnotherYou ECO'}}]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
@@ -0,0 +1,166 @@
+"""
+Spatial Hash - 均匀网格空间索引
+按世界坐标（格）把对象分到边长cell_size的桶里，对象移动时增量更新；
+点选、视野裁剪、邻近感知只查附近几个桶，与对象总数无关
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """对象 -> 位置 的均匀网格索引（对象需可哈希；桶内保持插入顺序，查询结果可复现）"""
+
+    def __init__(self, cell_size: float = 8.0):
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, Dict[Hashable, None]] = {}
+        self.positions: Dict[Hashable, Tuple[float, float]] = {}
+        self.cell_of: Dict[Hashable, Cell] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, obj) -> bool:
+        return obj in self.positions
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self.positions))
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    # ------------------------------------------------------------------
+    # 维护
+    # ------------------------------------------------------------------
+    def update(self, obj, x: float, y: float):
+        """插入或移动对象；只有跨桶时才改动桶"""
+        cell = self._cell(x, y)
+        old = self.cell_of.get(obj)
+        if old != cell:
+            if old is not None:
+                bucket = self.cells[old]
+                del bucket[obj]
+                if not bucket:
+                    del self.cells[old]
+            self.cells.setdefault(cell, {})[obj] = None
+            self.cell_of[obj] = cell
+        self.positions[obj] = (x, y)
+
+    def remove(self, obj) -> bool:
+        cell = self.cell_of.pop(obj, None)
+        if cell is None:
+            return False
+        del self.positions[obj]
+        bucket = self.cells[cell]
+        del bucket[obj]
+        if not bucket:
+            del self.cells[cell]
+        return True
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+        self.cell_of.clear()
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def query_rect(self, left: float, top: float, right: float, bottom: float) -> List:
+        """位于矩形 [left, right] x [top, bottom] 内的对象"""
+        cx0, cy0 = self._cell(left, top)
+        cx1, cy1 = self._cell(right, bottom)
+        found = []
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            # 矩形比已占用的桶还多（如缩到很小）：直接遍历已占用的桶
+            cells = [cell for cell in self.cells
+                     if cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1]
+        else:
+            cells = [(cx, cy) for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1)]
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if not bucket:
+                continue
+            for obj in bucket:
+                x, y = self.positions[obj]
+                if left <= x <= right and top <= y <= bottom:
+                    found.append(obj)
+        return found
+
+    def query_range(self, x: float, y: float, radius: float) -> List:
+        """与(x, y)距离不超过radius的对象"""
+        r2 = radius * radius
+        found = []
+        for obj in self.query_rect(x - radius, y - radius, x + radius, y + radius):
+            ox, oy = self.positions[obj]
+            if (ox - x) ** 2 + (oy - y) ** 2 <= r2:
+                found.append(obj)
+        return found
+
+    def nearest(self, x: float, y: float, k: int = 1,
+                max_radius: Optional[float] = None, exclude: Any = None) -> List:
+        """最近的k个对象（按距离升序），可限定最大距离并排除一个对象（通常是自己）
+
+        按切比雪夫环逐圈展开桶：第r圈之外的对象距离至少为 r * cell_size，
+        已找到k个不超过该距离的对象时即可停止
+        """
+        if k <= 0 or not self.positions:
+            return []
+        ccx, ccy = self._cell(x, y)
+        limit2 = math.inf if max_radius is None else max_radius * max_radius
+        max_ring = math.inf if max_radius is None else math.ceil(max_radius / self.cell_size)
+        best: List[Tuple[float, int, Any]] = []  # 大顶堆 (-距离², 序号, 对象)
+        seen = 0
+        ring = 0
+        while ring <= max_ring:
+            if (2 * ring + 1) ** 2 > 2 * len(self.cells):
+                # 索引稀疏：已查的桶数超过已占用桶数的两倍，剩下的直接扫已占用的桶
+                cells = [cell for cell in self.cells
+                         if max(abs(cell[0] - ccx), abs(cell[1] - ccy)) >= ring]
+                ring = max_ring
+            else:
+                cells = self._ring(ccx, ccy, ring)
+            for cell in cells:
+                bucket = self.cells.get(cell)
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    seen += 1
+                    if exclude is not None and obj == exclude:
+                        continue
+                    ox, oy = self.positions[obj]
+                    d2 = (ox - x) ** 2 + (oy - y) ** 2
+                    if d2 > limit2:
+                        continue
+                    entry = (-d2, -seen, obj)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif d2 < -best[0][0]:
+                        heapq.heapreplace(best, entry)
+            if seen >= len(self.positions):
+                break
+            reach = ring * self.cell_size
+            if len(best) == k and -best[0][0] <= reach * reach:
+                break
+            ring += 1
+        return [obj for _, _, obj in sorted(best, reverse=True)]
+
+    @staticmethod
+    def _ring(cx: int, cy: int, ring: int) -> List[Cell]:
+        if ring == 0:
+            return [(cx, cy)]
+        cells = [(cx + dx, cy - ring) for dx in range(-ring, ring + 1)]
+        cells += [(cx + dx, cy + ring) for dx in range(-ring, ring + 1)]
+        cells += [(cx - ring, cy + dy) for dy in range(-ring + 1, ring)]
+        cells += [(cx + ring, cy + dy) for dy in range(-ring + 1, ring)]
+        return cells
+
+    def get_stats(self) -> Dict:
+        sizes = [len(bucket) for bucket in self.cells.values()]
+        return {
+            'objects': len(self.positions),
+            'cells': len(self.cells),
+            'max_per_cell': max(sizes, default=0),
+        }
@@ -0,0 +1,225 @@
+"""
+AnotherYou ECO - 无头模拟模式
+不创建pygame窗口，以固定步长尽可能快地推进世界
+
+用法:
+    python headless.py --ticks 10000 --agents 1000
+    python headless.py --deterministic --hash-log run.txt   # 每步世界状态哈希，逐行可diff
+    python headless.py --deterministic --compare-log run.txt   # 与参考日志对比，报告第一个不同的步
+"""
+
+import argparse
+import functools
+import random
+import sys
+import time
+from typing import Dict, List
+
+from core.agent_state import AgentStateStore
+from core.chunk_manager import ChunkManager
+from core.chunk_prefetcher import ChunkPrefetcher
+from core.collision_pathfinder import CollisionPathfinder
+from core.determinism import (DETERMINISTIC_PATH_SLICES, RandomStreams, first_divergence,
+                              world_state_hash)
+from core.event_manager import Season
+from core.headless import NullAnimation
+from core.hierarchical_pathfinder import HierarchicalPathfinder
+from core.movement_system import MovementSystem
+from core.path_scheduler import PathScheduler
+from core.path_workers import PathWorkerPool
+from core.spatial_hash import SpatialHash
+from main import GameAgent, AGENT_CELL_SIZE, FPS, MAX_RESIDENT_CHUNKS, PATH_BUDGET_MS
+
+PATHFINDERS = {
+    'flat': CollisionPathfinder,        # 平面A*（max_distance=50）
+    'jps': functools.partial(CollisionPathfinder, mode='jps'),  # 平面跳点搜索
+    'hpa': HierarchicalPathfinder,      # 分层寻路，适合长距离
+}
+
+
+class HeadlessGame:
+    """无头世界：与Game相同的更新逻辑，但没有render"""
+
+    def __init__(self, agent_count: int = 15, seed: int = 42,
+                 tick_rate: int = FPS, speed: int = 1,
+                 max_chunks: int = MAX_RESIDENT_CHUNKS, pathfinder: str = 'flat',
+                 path_budget_ms: float = PATH_BUDGET_MS, path_workers: int = 0,
+                 deterministic: bool = False):
+        # 确定性模式：每个AI一个带种子的随机数流，寻路按分片数而不是毫秒计预算，
+        # 每步记录世界状态哈希；同一参数的两次运行逐步哈希相同
+        self.deterministic = deterministic
+        self.streams = RandomStreams(seed) if deterministic else None
+        self.state_hashes: List[str] = []
+        if deterministic and path_workers > 0:
+            raise ValueError("确定性模式不支持多进程寻路（完成顺序取决于进程调度）")
+        self.chunk_manager = ChunkManager(seed=seed, max_resident=max_chunks)
+        self.pathfinder = PATHFINDERS[pathfinder](self.chunk_manager)
+        # 有工作进程时多进程寻路；否则按预算分片，预算<=0时同步寻路（旧行为）
+        if path_workers > 0:
+            self.path_scheduler = PathWorkerPool(self.chunk_manager, workers=path_workers,
+                                                 pathfinder=pathfinder)
+        elif deterministic:
+            self.path_scheduler = PathScheduler(self.pathfinder, path_budget_ms,
+                                                slice_budget=DETERMINISTIC_PATH_SLICES)
+        elif path_budget_ms > 0:
+            self.path_scheduler = PathScheduler(self.pathfinder, path_budget_ms)
+        else:
+            self.path_scheduler = None
+        self.prefetcher = ChunkPrefetcher(self.chunk_manager)
+        self.animation = NullAnimation()
+
+        spawn_x, spawn_y = self.chunk_manager.find_spawn_point(50, 50)
+        self.agents: List[GameAgent] = []
+        self.agent_index = SpatialHash(AGENT_CELL_SIZE)
+        self.survival_store = AgentStateStore(max(64, agent_count))
+        self.movement_system = MovementSystem(max(64, agent_count))
+        for i in range(agent_count):
+            agent = GameAgent(f"agent_{i}", f"AI-{i}", float(spawn_x), float(spawn_y), i,
+                              headless=True, survival_store=self.survival_store,
+                              movement_system=self.movement_system,
+                              rng=self.streams.agent(f"agent_{i}") if deterministic else None)
+            agent.set_pathfinder(self.pathfinder, self.path_scheduler)
+            self.agents.append(agent)
+            self.agent_index.update(agent, agent.x, agent.y)
+
+        # 固定步长
+        self.dt = 1.0 / tick_rate
+        self.speed = speed
+        self.tick = 0
+
+        # 时间
+        self.game_time = 12.0
+        self.day = 1
+        self.season = Season.SPRING
+
+    def update(self, dt: float):
+        """推进一步（与Game.update一致，无玩家输入）"""
+        self.game_time += dt * self.speed / 60
+        if self.game_time >= 24:
+            self.game_time = 0
+            self.day += 1
+        hour = int(self.game_time)
+
+        self.prefetcher.update(dt, agents=self.agents)
+        self.animation.update(dt)
+
+        no_input: Dict = {}
+        self.survival_store.step(dt * self.speed, {}, hour)
+        for agent in self.agents:
+            agent.update(dt * self.speed, self.chunk_manager, self.animation,
+                         hour, False, no_input)
+
+        slots, positions, walkable = self.movement_system.step(dt * self.speed, self.chunk_manager)
+        owners = self.movement_system.owners
+        for slot, (x, y), ok in zip(slots.tolist(), positions.tolist(), walkable.tolist()):
+            owners[slot].finish_move(x, y, ok, dt * self.speed, self.animation)
+        for agent in self.agents:
+            self.agent_index.update(agent, agent.x, agent.y)
+        if self.path_scheduler is not None:
+            self.path_scheduler.update()
+        self.tick += 1
+        if self.deterministic:
+            self.state_hashes.append(self.state_hash())
+
+    def state_hash(self) -> str:
+        """当前世界状态的哈希"""
+        return world_state_hash(self.agents, self.game_time, self.day,
+                                self.survival_store, self.movement_system)
+
+    def run(self, ticks: int) -> Dict:
+        """以固定步长运行ticks步，不做任何等待"""
+        start = time.perf_counter()
+        for _ in range(ticks):
+            self.update(self.dt)
+        elapsed = time.perf_counter() - start
+        self.prefetcher.shutdown()
+        if isinstance(self.path_scheduler, PathWorkerPool):
+            self.path_scheduler.shutdown()
+        stats = self.get_stats(ticks, elapsed)
+        self.chunk_manager.close()
+        return stats
+
+    def get_stats(self, ticks: int, elapsed: float) -> Dict:
+        """运行统计"""
+        alive = self.survival_store.get_stats()['alive']
+        return {
+            'ticks': ticks,
+            'elapsed': elapsed,
+            'ticks_per_second': ticks / elapsed if elapsed > 0 else float('inf'),
+            'agents': len(self.agents),
+            'alive': alive,
+            'chunks': len(self.chunk_manager.chunks),
+            'chunk_stats': self.chunk_manager.get_stats(),
+            'day': self.day,
+            'game_time': self.game_time,
+            'state_hash': self.state_hash(),
+        }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AnotherYou ECO 无头模拟")
+    parser.add_argument('--ticks', type=int, default=3600, help="模拟步数")
+    parser.add_argument('--agents', type=int, default=15, help="AI数量")
+    parser.add_argument('--seed', type=int, default=42, help="世界种子")
+    parser.add_argument('--tick-rate', type=int, default=FPS, help="每秒游戏步数（决定固定dt）")
+    parser.add_argument('--speed', type=int, default=1, help="游戏速度倍率")
+    parser.add_argument('--max-chunks', type=int, default=MAX_RESIDENT_CHUNKS,
+                        help="常驻区块上限（LRU淘汰）")
+    parser.add_argument('--pathfinder', choices=sorted(PATHFINDERS), default='flat',
+                        help="寻路算法")
+    parser.add_argument('--path-budget', type=float, default=PATH_BUDGET_MS,
+                        help="每步寻路CPU预算（毫秒），0表示同步寻路")
+    parser.add_argument('--path-workers', type=int, default=0,
+                        help="寻路工作进程数（>0时启用多进程寻路）")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="确定性模式：带种子的随机数流 + 按分片计的寻路预算 + 每步状态哈希")
+    parser.add_argument('--hash-log', default=None,
+                        help="确定性模式下把每步的状态哈希写入该文件（每行一步）")
+    parser.add_argument('--compare-log', default=None,
+                        help="与该参考哈希日志逐步对比，报告第一个不同的步（隐含--deterministic）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+
+    game = HeadlessGame(agent_count=args.agents, seed=args.seed,
+                        tick_rate=args.tick_rate, speed=args.speed,
+                        max_chunks=args.max_chunks, pathfinder=args.pathfinder,
+                        path_budget_ms=args.path_budget, path_workers=args.path_workers,
+                        deterministic=(args.deterministic or args.hash_log is not None
+                                       or args.compare_log is not None))
+    print(f"🖥️ 无头模式: {args.agents} 个AI, {args.ticks} 步, dt={game.dt:.4f}s")
+    stats = game.run(args.ticks)
+
+    print("=" * 50)
+    print(f"⏱️ 用时: {stats['elapsed']:.2f}s  ({stats['ticks_per_second']:.1f} ticks/s)")
+    print(f"👥 存活: {stats['alive']}/{stats['agents']}")
+    chunk_stats = stats['chunk_stats']
+    print(f"🗺️ 区块: {stats['chunks']} 常驻 / 命中 {chunk_stats['hits']} 未命中 {chunk_stats['misses']}"
+          f" 重新生成 {chunk_stats['regenerations']} 写盘 {chunk_stats['spills']}")
+    print(f"📅 Day {stats['day']}, {int(stats['game_time']):02d}:{int((stats['game_time'] % 1) * 60):02d}")
+    print(f"🔒 状态哈希: {stats['state_hash']}")
+    if args.hash_log:
+        with open(args.hash_log, 'w') as f:
+            f.write('\n'.join(game.state_hashes) + '\n')
+        print(f"📝 逐步哈希已写入 {args.hash_log}")
+    if args.compare_log:
+        with open(args.compare_log) as f:
+            reference = f.read().split()
+        tick = first_divergence(reference, game.state_hashes)
+        stats['divergence'] = tick
+        if tick is None:
+            print(f"✅ 与 {args.compare_log} 逐步一致（{len(reference)} 步）")
+        elif tick >= min(len(reference), len(game.state_hashes)):
+            print(f"❌ 步数不同：参考 {len(reference)} 步，本次 {len(game.state_hashes)} 步")
+        else:
+            print(f"❌ 第 {tick} 步起与 {args.compare_log} 不同"
+                  f"（参考 {reference[tick]}，本次 {game.state_hashes[tick]}）")
+    return stats
+
+
+if __name__ == "__main__":
+    # 对比参考日志出现分歧时以非零状态退出，便于脚本里使用
+    sys.exit(1 if main().get('divergence') is not None else 0)
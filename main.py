@@ -7,6 +7,7 @@ import pygame
 import asyncio
 import random
 import math
+import time
 from typing import List, Dict
 
 import sys
@@ -16,18 +17,39 @@ from core.sprite_loader import SpriteSheet, CharacterSprite
 from core.quality_tileset import QualityTileset, TILE_SIZE
 from core.camera import GameCamera
 from core.animation import AnimationManager, EnvironmentEffects
-from core.chunk_manager import ChunkManager, CHUNK_SIZE
+from core.chunk_manager import ChunkManager
+from core.chunk_prefetcher import ChunkPrefetcher
+from core.chunk_renderer import ChunkSurfaceCache
+from core.culling import chunk_tile_rect
 from core.collision_pathfinder import CollisionPathfinder
+from core.agent_state import AgentStateStore
 from core.agent_survival import SurvivalSystem
 from core.pathfinder import SmoothMovement
+from core.movement_system import MovementSystem
+from core.path_scheduler import PathScheduler, PRIORITY_CRITICAL, PRIORITY_NORMAL, PRIORITY_PLAYER
+from core.path_workers import PathWorkerPool
 from core.event_manager import EventManager, Season
 from core.control_manager import ControlManager
+from core.determinism import DETERMINISTIC_PATH_SLICES, FixedTimestep, RandomStreams, world_state_hash
+from core.culling import visible_world_rect
+from core.spatial_hash import SpatialHash
+from core.headless import NullSprite, NullThoughtBubble
+from core.profiler import FrameProfiler
 from ui.modern_hud import ModernHUD
+from ui.profiler_overlay import ProfilerOverlay
+from ui.text_cache import CachedFont
 from ui.thought_bubble import ThoughtBubble
 
 SCREEN_WIDTH = 1400
 SCREEN_HEIGHT = 900
 FPS = 60
+MAX_RESIDENT_CHUNKS = 256  # 常驻区块上限（约7KB/块）
+PATH_BUDGET_MS = 2.0       # 每帧寻路CPU预算
+PATH_WORKERS = 0           # >0时用多进程寻路（500+个AI时）
+AGENT_CELL_SIZE = 8        # AI空间索引的桶边长（格）
+AGENT_DETAIL_ZOOM = 0.5    # 缩放低于此值时AI只画成小色块（不画精灵、昵称、气泡、能量条）
+WORLD_SEED = 42
+DETERMINISTIC = False      # 固定步长 + 带种子的随机数流（用于复现和对比性能）
 
 
 class GameAgent:
@@ -38,16 +60,27 @@ class GameAgent:
         (220, 180, 60), (180, 100, 200), (255, 140, 80),
     ]
     
-    def __init__(self, agent_id: str, name: str, x: float, y: float, color_idx: int):
+    def __init__(self, agent_id: str, name: str, x: float, y: float, color_idx: int,
+                 headless: bool = False, survival_store: AgentStateStore = None,
+                 movement_system: MovementSystem = None, rng: random.Random = None):
         self.id = agent_id
         self.name = name
         self.x = x
         self.y = y
-        
-        # 系统
-        self.survival = SurvivalSystem()
-        self.movement = SmoothMovement(speed=2.5)
-        self.thought_bubble = ThoughtBubble()
+        # 决策用的随机数流（确定性模式下每个AI一个带种子的流，否则用全局random）
+        self.rng = rng if rng is not None else random
+        
+        # 系统（有共享的状态数组时，生存状态由Game每帧统一向量化更新）
+        self.survival_store = survival_store
+        self.survival = survival_store.add() if survival_store is not None else SurvivalSystem()
+        # 有共享的移动系统时，路径推进由Game每帧统一向量化完成
+        self.movement_system = movement_system
+        if movement_system is not None:
+            self.movement = movement_system.add(self, speed=2.5)
+        else:
+            self.movement = SmoothMovement(speed=2.5)
+        # 无头模式不加载字体和精灵
+        self.thought_bubble = NullThoughtBubble() if headless else ThoughtBubble()
         
         # 内心独白
         self.thought_text = ""
@@ -59,14 +92,17 @@ class GameAgent:
         ]
         
         # 视觉
-        self.sprite = self._create_sprite(color_idx)
+        self.sprite = NullSprite() if headless else self._create_sprite(color_idx)
+        self.name_font = None if headless else CachedFont('microsoftyahei', 12, bold=True)
         self.is_player = False
         
-        # 路径寻找
+        # 路径寻找（有调度器时异步分帧寻路）
         self.pathfinder = None
+        self.path_scheduler = None
         
-    def set_pathfinder(self, pathfinder):
+    def set_pathfinder(self, pathfinder, scheduler=None):
         self.pathfinder = pathfinder
+        self.path_scheduler = scheduler
         
     def _create_sprite(self, color_idx: int):
         """创建高质量角色精灵（32x32带行走动画）"""
@@ -101,14 +137,15 @@ class GameAgent:
                is_player_control: bool, input_keys: Dict):
         """更新AI"""
         # 更新生存
-        weather = {}
-        self.survival.update(dt, weather, hour)
+        if self.survival_store is None:
+            weather = {}
+            self.survival.update(dt, weather, hour)
         
         # 内心独白
         self.thought_timer += dt
         if self.thought_timer > 6:  # 每6秒更新想法
             self.thought_timer = 0
-            self.thought_text = random.choice(self.thoughts_pool)
+            self.thought_text = self.rng.choice(self.thoughts_pool)
             
         self.thought_bubble.update(dt, self.thought_text)
         self.thought_bubble.set_visible(not is_player_control and self.thought_text)
@@ -143,7 +180,7 @@ class GameAgent:
                 self.x = new_x
                 self.y = new_y
                 self.sprite.update(dt, dx*10, dy*10)
-                if random.random() < 0.3:
+                if self.rng.random() < 0.3:
                     animation.add_dust(new_x * TILE_SIZE, new_y * TILE_SIZE)
             else:
                 # 碰到障碍物停止动画
@@ -168,25 +205,21 @@ class GameAgent:
             
         # 智能移动
         if self.movement.is_moving:
+            if self.movement_system is not None:
+                # 所有AI更新完后由MovementSystem一起推进，再回调finish_move
+                self.movement.request()
+                return
             new_x, new_y = self.movement.update(dt)
-            
-            if chunk_manager.is_walkable(new_x, new_y):
-                dx = new_x - self.x
-                dy = new_y - self.y
-                self.x = new_x
-                self.y = new_y
-                self.sprite.update(dt, dx*10, dy*10)
-                
-                if self.movement.is_moving and random.random() < 0.2:
-                    animation.add_dust(new_x * TILE_SIZE, new_y * TILE_SIZE)
-            else:
-                self.movement.is_moving = False
+            self.finish_move(new_x, new_y, chunk_manager.is_walkable(new_x, new_y), dt, animation)
         else:
             # 重新寻路（使用碰撞感知路径）
-            if self.pathfinder and random.random() < 0.02:
+            if self.path_scheduler is not None:
+                if not self.path_scheduler.is_pending(self) and self.rng.random() < 0.02:
+                    self._request_path(chunk_manager)
+            elif self.pathfinder and self.rng.random() < 0.02:
                 for _ in range(5):
-                    target_x = self.x + random.randint(-25, 25)
-                    target_y = self.y + random.randint(-25, 25)
+                    target_x = self.x + self.rng.randint(-25, 25)
+                    target_y = self.y + self.rng.randint(-25, 25)
                     
                     if chunk_manager.is_walkable(target_x, target_y):
                         path = self.pathfinder.find_path(self.x, self.y, target_x, target_y)
@@ -194,6 +227,45 @@ class GameAgent:
                             self.movement.set_path(path, (self.x, self.y))
                             break
                             
+    def finish_move(self, new_x: float, new_y: float, walkable: bool, dt: float, animation):
+        """应用推进后的位置：可行走则移动，否则停止当前路径"""
+        if walkable:
+            dx = new_x - self.x
+            dy = new_y - self.y
+            self.x = new_x
+            self.y = new_y
+            self.sprite.update(dt, dx*10, dy*10)
+            
+            if self.movement.is_moving and self.rng.random() < 0.2:
+                animation.add_dust(new_x * TILE_SIZE, new_y * TILE_SIZE)
+        else:
+            self.movement.is_moving = False
+            
+    def _request_path(self, chunk_manager):
+        """向调度器提交寻路（最多5个随机目标，依次尝试）"""
+        goals = []
+        for _ in range(5):
+            target_x = self.x + self.rng.randint(-25, 25)
+            target_y = self.y + self.rng.randint(-25, 25)
+            if chunk_manager.is_walkable(target_x, target_y):
+                goals.append((target_x, target_y))
+        if goals:
+            self.path_scheduler.submit(self, (self.x, self.y), goals, self._on_path_found,
+                                       self._path_priority())
+            
+    def _path_priority(self) -> int:
+        """玩家角色优先，其次是体力告急的AI"""
+        if self.is_player:
+            return PRIORITY_PLAYER
+        if self.survival.get_priority() in ('critical', 'low_energy'):
+            return PRIORITY_CRITICAL
+        return PRIORITY_NORMAL
+        
+    def _on_path_found(self, path):
+        """调度器回调：期间被玩家接管或已在移动则丢弃"""
+        if path and len(path) > 1 and not self.movement.is_moving:
+            self.movement.set_path(path, (self.x, self.y))
+            
     def render(self, screen, camera):
         """渲染AI"""
         sx, sy = camera.world_to_screen(self.x, self.y)
@@ -208,16 +280,10 @@ class GameAgent:
             # 内心独白气泡
             self.thought_bubble.render(screen, sx, sy)
             
-            # 昵称（带描边）
-            font = pygame.font.SysFont('microsoftyahei', 12, bold=True)
-            name_text = font.render(self.name, True, (255, 255, 255))
-            name_x = sx - name_text.get_width() // 2
-            
-            # 描边
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                outline = font.render(self.name, True, (0, 0, 0))
-                screen.blit(outline, (name_x + dx, sy - 32 + dy))
-            screen.blit(name_text, (name_x, sy - 32))
+            # 昵称（上下左右1像素描边，合成好的标签由文字缓存保存）
+            label = self.name_font.render_outlined(self.name, (255, 255, 255), (0, 0, 0), 1,
+                                                   diagonal=False)
+            screen.blit(label, (sx - label.get_width() // 2, sy - 33))
             
             # 精灵（高质量32x32）
             if not self.survival.is_dead:
@@ -244,27 +310,56 @@ class GameAgent:
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, seed: int = WORLD_SEED, deterministic: bool = DETERMINISTIC,
+                 agent_count: int = 15):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("AnotherYou ECO v0.9 - 高质量像素版")
         self.clock = pygame.time.Clock()
         
+        # 确定性模式：模拟按固定步长推进，AI和粒子各用带种子的随机数流，寻路按分片数计预算
+        self.deterministic = deterministic
+        self.streams = RandomStreams(seed) if deterministic else None
+        self.timestep = FixedTimestep(1.0 / FPS)
+        self.tick = 0
+        
         # 高质量瓦片集
         self.tileset = QualityTileset()
+        self.chunk_surfaces = ChunkSurfaceCache(self.tileset, TILE_SIZE)
         
         # 无限世界
-        self.chunk_manager = ChunkManager(seed=42)
+        self.chunk_manager = ChunkManager(seed=seed, max_resident=MAX_RESIDENT_CHUNKS)
+        # 后台预取（相机前方 + AI路径上的区块）
+        self.prefetcher = ChunkPrefetcher(self.chunk_manager)
         
-        # 碰撞感知路径寻找
+        # 碰撞感知路径寻找（按帧预算分片调度）
         self.pathfinder = CollisionPathfinder(self.chunk_manager)
+        if deterministic:
+            self.path_scheduler = PathScheduler(self.pathfinder, budget_ms=PATH_BUDGET_MS,
+                                                slice_budget=DETERMINISTIC_PATH_SLICES)
+        elif PATH_WORKERS > 0:
+            self.path_scheduler = PathWorkerPool(self.chunk_manager, workers=PATH_WORKERS)
+        else:
+            self.path_scheduler = PathScheduler(self.pathfinder, budget_ms=PATH_BUDGET_MS)
         
-        # AI们
+        # AI们（出生点取(50, 50)附近不被困住的可行走格）
+        spawn_x, spawn_y = self.chunk_manager.find_spawn_point(50, 50)
         self.agents: List[GameAgent] = []
-        for i in range(15):
-            agent = GameAgent(f"agent_{i}", f"AI-{i}", 50.0, 50.0, i)
-            agent.set_pathfinder(self.pathfinder)
+        # AI位置的空间索引（点选、渲染裁剪、邻近查询），每帧随移动增量更新
+        self.agent_index = SpatialHash(AGENT_CELL_SIZE)
+        self._agent_markers: Dict[int, Dict[str, pygame.Surface]] = {}  # 边长 -> 各状态的色块
+        # 所有AI的生存状态（结构数组，每帧一次向量化更新）
+        self.survival_store = AgentStateStore()
+        # 所有AI的平滑路径（扁平数组，每帧一次向量化推进）
+        self.movement_system = MovementSystem()
+        for i in range(agent_count):
+            agent = GameAgent(f"agent_{i}", f"AI-{i}", float(spawn_x), float(spawn_y), i,
+                              survival_store=self.survival_store,
+                              movement_system=self.movement_system,
+                              rng=self.streams.agent(f"agent_{i}") if deterministic else None)
+            agent.set_pathfinder(self.pathfinder, self.path_scheduler)
             self.agents.append(agent)
+            self.agent_index.update(agent, agent.x, agent.y)
             
         # 玩家
         self.player_agent = self.agents[0]
@@ -278,8 +373,12 @@ class Game:
         self.camera = GameCamera(1000, 1000, TILE_SIZE)
         self.camera.set_target(self.player_agent)
         self.control_manager.set_camera(self.camera)
-        self.animation = AnimationManager()
+        self.animation = AnimationManager(self.streams.get('animation') if deterministic else None)
         self.hud = ModernHUD(SCREEN_WIDTH, SCREEN_HEIGHT)
+        # 帧耗时分析（F3叠加层，F4开始/停止录制Chrome trace）
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        self.show_profiler = False
         
         # 时间
         self.game_time = 12.0
@@ -314,6 +413,12 @@ class Game:
                     # 空格键切换控制
                     is_player = self.control_manager.toggle_player_mode()
                     print(f"🎮 {'玩家' if is_player else 'AI'}控制")
+                elif event.key == pygame.K_F3:
+                    # 只切换显示；F4录制期间计时保持开启
+                    self.show_profiler = not self.show_profiler
+                    self.profiler.set_enabled(self.show_profiler)
+                elif event.key == pygame.K_F4:
+                    self._toggle_trace()
                 elif event.key == pygame.K_F12:
                     self.camera.toggle_god_mode()
                     print(f"👁️ 上帝模式: {'开启' if self.camera.god_mode else '关闭'}")
@@ -327,9 +432,11 @@ class Game:
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # 左键点击AI
                     clicked_agent = self.control_manager.handle_mouse_click(
-                        event.pos, self.agents, self.camera
+                        event.pos, self.agents, self.camera, self.agent_index
                     )
                     if clicked_agent:
+                        self.player_agent.is_player = False
+                        clicked_agent.is_player = True
                         self.player_agent = clicked_agent
                         self.control_manager.set_player_agent(clicked_agent)
                         self.camera.set_target(clicked_agent)
@@ -357,34 +464,88 @@ class Game:
                 
         return is_player, move_keys
         
+    def _toggle_trace(self):
+        """F4：开始录制，再按一次导出到frame_trace_<时间>.json"""
+        if not self.profiler.tracing:
+            self.profiler.start_trace()
+            print("⏺️ 开始录制帧trace")
+            return
+        path = time.strftime('frame_trace_%Y%m%d_%H%M%S.json')
+        count = self.profiler.stop_trace(path)
+        self.profiler.set_enabled(self.show_profiler)
+        print(f"💾 帧trace已导出: {path} ({count} 个事件，可用chrome://tracing打开)")
+        
     def render_world(self, screen):
         """渲染世界（chunk系统 + 高质量瓦片）"""
         # 更新加载的区块
         self.chunk_manager.update_loaded_chunks(self.camera.x / TILE_SIZE, 
                                                 self.camera.y / TILE_SIZE)
         
-        # 获取需要渲染的区块
+        # 获取与视野相交的区块（精确裁剪，考虑缩放）
+        screen_w, screen_h = screen.get_size()
+        zoom = self.camera.zoom
         chunks = self.chunk_manager.get_render_chunks(
-            self.camera.x, self.camera.y, screen.get_width(), screen.get_height()
+            self.camera.x, self.camera.y, screen_w, screen_h, zoom, TILE_SIZE
         )
         
-        # 渲染每个区块
+        # 渲染每个区块（预渲染Surface；缩小时按LOD使用低细节图）
         for chunk in chunks:
-            chunk_pixel_x = chunk.cx * CHUNK_SIZE * TILE_SIZE - int(self.camera.x)
-            chunk_pixel_y = chunk.cy * CHUNK_SIZE * TILE_SIZE - int(self.camera.y)
-            
-            for y, row in enumerate(chunk.tiles):
-                for x, (tile_type, variant) in enumerate(row):
-                    pixel_x = chunk_pixel_x + x * TILE_SIZE
-                    pixel_y = chunk_pixel_y + y * TILE_SIZE
-                    
-                    # 只渲染屏幕内的瓦片
-                    if -TILE_SIZE < pixel_x < screen.get_width() + TILE_SIZE and \
-                       -TILE_SIZE < pixel_y < screen.get_height() + TILE_SIZE:
-                        
-                        tile_image = self.tileset.get_tile(tile_type, variant)
-                        screen.blit(tile_image, (pixel_x, pixel_y))
+            tx, ty, tw, th = chunk_tile_rect(chunk.cx, chunk.cy, self.camera.x, self.camera.y,
+                                             screen_w, screen_h, zoom, TILE_SIZE)
+            area = pygame.Rect(tx * TILE_SIZE, ty * TILE_SIZE, tw * TILE_SIZE, th * TILE_SIZE)
+            self.chunk_surfaces.draw(screen, chunk, self.camera.x, self.camera.y, area, zoom)
                             
+    def visible_agents(self, margin: int = 0) -> List[GameAgent]:
+        """视野内（外扩margin屏幕像素）的AI"""
+        screen_w, screen_h = self.screen.get_size()
+        zoom = self.camera.zoom
+        left, top, right, bottom = visible_world_rect(self.camera.x, self.camera.y,
+                                                      screen_w, screen_h, zoom)
+        pad = margin / zoom
+        agents = self.agent_index.query_rect((left - pad) / TILE_SIZE, (top - pad) / TILE_SIZE,
+                                             (right + pad) / TILE_SIZE, (bottom + pad) / TILE_SIZE)
+        agents.sort(key=lambda agent: agent.y)
+        return agents
+        
+    def render_agent_markers(self, screen):
+        """缩小视图：每个AI画一个按能量着色的小方块，一次blits提交"""
+        size = max(2, round(TILE_SIZE * self.camera.zoom))
+        markers = self._agent_markers.get(size)
+        if markers is None:
+            markers = {}
+            for key, color in (('player', (255, 215, 0)), ('high', (100, 255, 100)),
+                               ('mid', (255, 220, 80)), ('low', (255, 80, 80)),
+                               ('dead', (110, 110, 110))):
+                marker = pygame.Surface((size, size))
+                marker.fill((0, 0, 0))
+                marker.fill(color, (1, 1, size - 2, size - 2) if size > 2 else None)
+                markers[key] = marker
+            self._agent_markers[size] = markers
+
+        world_to_screen = self.camera.world_to_screen
+        half = size // 2
+        batch = []
+        for agent in self.visible_agents(margin=size):
+            energy = agent.survival.energy
+            if agent.is_player:
+                key = 'player'
+            elif agent.survival.is_dead:
+                key = 'dead'
+            else:
+                key = 'high' if energy > 60 else 'mid' if energy > 30 else 'low'
+            sx, sy = world_to_screen(agent.x, agent.y)
+            batch.append((markers[key], (sx - half, sy - half)))
+        screen.blits(batch, doreturn=False)
+
+    def step_movement(self, dt: float):
+        """一次推进本帧所有在走路的AI，批量检查可行走，并更新空间索引"""
+        slots, positions, walkable = self.movement_system.step(dt, self.chunk_manager)
+        owners = self.movement_system.owners
+        for slot, (x, y), ok in zip(slots.tolist(), positions.tolist(), walkable.tolist()):
+            owners[slot].finish_move(x, y, ok, dt, self.animation)
+        for agent in self.agents:
+            self.agent_index.update(agent, agent.x, agent.y)
+            
     def update(self, dt: float, is_player: bool, input_keys: Dict):
         if self.paused:
             return
@@ -397,31 +558,61 @@ class Game:
         hour = int(self.game_time)
         
         # 更新系统
-        self.camera.update(self.screen.get_width(), self.screen.get_height())
-        self.animation.update(dt)
+        profiler = self.profiler
+        with profiler.scope('update.camera'):
+            self.camera.update(self.screen.get_width(), self.screen.get_height())
+        with profiler.scope('update.prefetch'):
+            self.prefetcher.update(dt, self.camera, self.agents, self.screen.get_size())
+        with profiler.scope('update.animation'):
+            self.animation.update(dt)
         self.hud.update(dt)
         
-        # 更新AI
-        for agent in self.agents:
-            is_this_player = (agent == self.player_agent and is_player)
-            agent.update(dt * self.speed, self.chunk_manager, self.animation,
-                        hour, is_this_player, input_keys)
+        # 更新AI（生存状态先统一更新）
+        with profiler.scope('update.survival'):
+            self.survival_store.step(dt * self.speed, {}, hour)
+        with profiler.scope('update.agents'):
+            for agent in self.agents:
+                is_this_player = (agent == self.player_agent and is_player)
+                agent.update(dt * self.speed, self.chunk_manager, self.animation,
+                            hour, is_this_player, input_keys)
+        with profiler.scope('update.movement'):
+            self.step_movement(dt * self.speed)
+        
+        # 在预算内推进寻路请求
+        with profiler.scope('update.pathfinding'):
+            self.path_scheduler.update()
+        self.tick += 1
+        
+    def state_hash(self) -> str:
+        """当前世界状态的哈希（确定性模式下同一种子、同一步数相同）"""
+        return world_state_hash(self.agents, self.game_time, self.day,
+                                self.survival_store, self.movement_system)
             
     def render(self):
+        profiler = self.profiler
         self.screen.fill((20, 25, 20))
         
         # 渲染世界（高质量chunk）
-        self.render_world(self.screen)
-        
-        # 渲染AI
-        for agent in self.agents:
-            agent.render(self.screen, self.camera)
+        with profiler.scope('render.world'):
+            self.render_world(self.screen)
+        
+        # 渲染AI（只取视野内的，按y排序让下方的角色盖住上方的）
+        with profiler.scope('render.agents'):
+            if self.camera.zoom >= AGENT_DETAIL_ZOOM:
+                for agent in self.visible_agents(margin=50):
+                    agent.render(self.screen, self.camera)
+            else:
+                self.render_agent_markers(self.screen)
             
         # 粒子
-        self.animation.render(self.screen, self.camera.x, self.camera.y, TILE_SIZE)
+        with profiler.scope('render.particles'):
+            self.animation.render(self.screen, self.camera.x, self.camera.y, TILE_SIZE,
+                                  self.camera.zoom)
         
         # 日夜
-        EnvironmentEffects.render_day_night_overlay(self.screen, int(self.game_time), 0)
+        with profiler.scope('render.day_night'):
+            EnvironmentEffects.render_day_night_overlay(self.screen, int(self.game_time),
+                                                        int((self.game_time % 1) * 60), smooth=True)
         
         # HUD
         game_state = {
@@ -448,17 +639,33 @@ class Game:
             'world_height': 1000,
         }
         
-        self.hud.render(self.screen, game_state)
-        pygame.display.flip()
+        with profiler.scope('render.hud'):
+            self.hud.render(self.screen, game_state)
+        if self.show_profiler:
+            self.profiler_overlay.render(self.screen)
+        with profiler.scope('render.flip'):
+            pygame.display.flip()
         
     async def run(self):
         while self.running:
             dt = self.clock.tick(FPS) / 1000.0
-            is_player, input_keys = self.handle_input()
-            self.update(dt, is_player, input_keys)
+            self.profiler.begin_frame()
+            with self.profiler.scope('input'):
+                is_player, input_keys = self.handle_input()
+            if self.deterministic:
+                # 固定步长：按真实耗时决定本帧跑几步，每步dt相同
+                for _ in range(self.timestep.advance(dt)):
+                    self.update(self.timestep.dt, is_player, input_keys)
+            else:
+                self.update(dt, is_player, input_keys)
             self.render()
+            self.profiler.end_frame()
             await asyncio.sleep(0)
             
+        self.prefetcher.shutdown()
+        if isinstance(self.path_scheduler, PathWorkerPool):
+            self.path_scheduler.shutdown()
+        self.chunk_manager.close()
         pygame.quit()
 
 
@@ -0,0 +1,57 @@
+"""
+AgentStateStore.step（向量化）与SurvivalSystem.update（逐个）结果逐位一致
+
+用法:
+    python -m pytest tests/test_agent_state.py
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.agent_state import AgentStateStore
+from core.agent_survival import SurvivalSystem
+
+
+def test_step_matches_survival_update():
+    rng = random.Random(5)
+    store = AgentStateStore(8)  # 故意小于AI数，覆盖扩容
+    scalars, views = [], []
+    for _ in range(200):
+        scalar = SurvivalSystem()
+        view = store.add()
+        # 覆盖饥饿>80、能量接近0（会死）、睡眠和已死亡的行
+        scalar.energy = view.energy = rng.choice([rng.uniform(0, 100), rng.uniform(0, 0.5)])
+        scalar.hunger = view.hunger = rng.choice([rng.uniform(0, 100), rng.uniform(79, 81)])
+        scalar.is_sleeping = view.is_sleeping = rng.random() < 0.4
+        scalar.is_dead = view.is_dead = rng.random() < 0.05
+        scalars.append(scalar)
+        views.append(view)
+    # 释放的行不参与更新
+    removed = views.pop(17)
+    scalars.pop(17)
+    store.remove(removed)
+    frozen = (removed.energy, removed.hunger)
+
+    for frame in range(300):
+        dt = rng.choice([1 / 60, 1 / 30, 0.5, 3.0])
+        hour = frame % 24
+        weather = rng.choice([{}, {'energy_drain': 1.5}, {'energy_drain': 0.7}])
+        for scalar in scalars:
+            scalar.update(dt, weather, hour)
+        store.step(dt, weather, hour)
+        if frame % 50 == 0:
+            # 中途切换睡眠状态，与游戏中的行为一样
+            for scalar, view in zip(scalars, views):
+                if rng.random() < 0.3:
+                    scalar.is_sleeping = view.is_sleeping = not scalar.is_sleeping
+
+    for scalar, view in zip(scalars, views):
+        assert view.energy == scalar.energy
+        assert view.hunger == scalar.hunger
+        assert view.is_dead == scalar.is_dead
+        assert view.get_priority() == scalar.get_priority()
+    assert (removed.energy, removed.hunger) == frozen
+    assert any(s.is_dead for s in scalars) and not all(s.is_dead for s in scalars)
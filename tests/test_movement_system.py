@@ -0,0 +1,69 @@
+"""
+MovementSystem.advance（向量化）与SmoothMovement.update（逐个）结果逐位一致
+
+用法:
+    python -m pytest tests/test_movement_system.py
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core.movement_system import MovementSystem, smooth_path
+from core.pathfinder import SmoothMovement
+
+
+def random_path(rng, start, length):
+    path = [start]
+    for _ in range(length - 1):
+        x, y = path[-1]
+        path.append((x + rng.choice((-1, 0, 1)), y + rng.choice((-1, 0, 1))))
+    return path
+
+
+def test_smooth_path_matches():
+    rng = random.Random(1)
+    for length in (2, 3, 4, 10, 40):
+        path = random_path(rng, (rng.randint(-50, 50), rng.randint(-50, 50)), length)
+        start = (path[0][0] + rng.random(), path[0][1] + rng.random())
+        scalar = SmoothMovement()
+        scalar.set_path(path, start)
+        assert np.array_equal(smooth_path(path, start), np.array(scalar.path))
+
+
+def test_advance_matches_smooth_movement_update():
+    rng = random.Random(2)
+    system = MovementSystem(capacity=4, point_capacity=64)  # 覆盖扩容和路径压缩
+    scalars, slots = [], []
+    for i in range(100):
+        speed = rng.uniform(1.0, 6.0)
+        scalar = SmoothMovement(speed)
+        slot = system.add(owner=i, speed=speed).slot
+        scalars.append(scalar)
+        slots.append(slot)
+
+    positions = {slot: (rng.uniform(-20, 20), rng.uniform(-20, 20)) for slot in slots}
+    for frame in range(400):
+        # 随时给停下的AI新路径（含只有一两个点的路径和重复点）
+        for slot, scalar in zip(slots, scalars):
+            if not scalar.is_moving and rng.random() < 0.2:
+                x, y = positions[slot]
+                path = random_path(rng, (int(x), int(y)), rng.choice((1, 2, 3, 8, 20)))
+                scalar.set_path(path, positions[slot])
+                system.set_path(slot, path, positions[slot])
+        dt = rng.choice((1 / 60, 1 / 30, 0.2))
+        # 每帧只推进一部分AI，与游戏中一样
+        active = [slot for slot in slots if rng.random() < 0.8]
+        moved = system.advance(np.array(active, dtype=np.int64), dt)
+        for slot, (x, y) in zip(active, moved.tolist()):
+            expected = scalars[slot].update(dt)
+            assert (x, y) == expected
+            positions[slot] = expected
+            assert bool(system.moving[slot]) == scalars[slot].is_moving
+            if scalars[slot].path:
+                assert int(system.index[slot]) == scalars[slot].current_index
+    assert system.compactions > 0
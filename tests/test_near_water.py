@@ -0,0 +1,39 @@
+"""
+靠近水掩码只读内存中（或磁盘上）的邻居区块：计算时不生成区块，邻居放入后重算
+
+用法:
+    python -m pytest tests/test_near_water.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_manager import CHUNK_SIZE, ChunkManager
+
+
+def near_water_mask(chunk_manager, cx, cy):
+    return [chunk_manager.is_near_water(cx * CHUNK_SIZE + x, cy * CHUNK_SIZE + y)
+            for y in range(CHUNK_SIZE) for x in range(CHUNK_SIZE)]
+
+
+def test_near_water_query_generates_no_neighbours():
+    chunk_manager = ChunkManager(seed=42)
+    chunk_manager.get_chunk(0, 0)
+    generated = chunk_manager.stats.generated
+    chunk_manager.is_near_water(0, 0)
+    assert chunk_manager.stats.generated == generated
+    assert list(chunk_manager.chunks) == [(0, 0)]
+
+
+def test_provisional_mask_rebuilt_when_neighbours_arrive():
+    full = ChunkManager(seed=42)
+    full.update_loaded_chunks(CHUNK_SIZE // 2, CHUNK_SIZE // 2)
+    expected = near_water_mask(full, 0, 0)
+
+    lazy = ChunkManager(seed=42)
+    lazy.get_chunk(0, 0)
+    near_water_mask(lazy, 0, 0)
+    lazy.update_loaded_chunks(CHUNK_SIZE // 2, CHUNK_SIZE // 2)
+    assert near_water_mask(lazy, 0, 0) == expected
@@ -0,0 +1,70 @@
+"""
+ParticleEngine.update的swap-remove恰好保留存活粒子：与旧的逐对象实现（每帧过滤重建列表）对比
+
+用法:
+    python -m pytest tests/test_particle_engine.py
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core.particle_engine import ParticleEngine
+
+
+class LegacyParticle:
+    """旧实现的粒子对象（数值用float32，与引擎的数组精度相同）"""
+
+    def __init__(self, x, y, vx, vy, life, tag):
+        self.x, self.y = np.float32(x), np.float32(y)
+        self.vx, self.vy = np.float32(vx), np.float32(vy)
+        self.life = np.float32(life)
+        self.tag = tag
+
+
+def test_swap_remove_keeps_exactly_the_live_particles():
+    rng = random.Random(24)
+    engine = ParticleEngine(max_particles=500)
+    color = engine.color_id((200, 200, 200))
+    legacy = []
+    tag = 0
+
+    for frame in range(400):
+        # 每帧随机生成一批（寿命长短混杂，偶尔超过上限被丢弃）
+        batch = rng.randint(0, 40)
+        xs = [rng.uniform(-100, 100) for _ in range(batch)]
+        ys = [rng.uniform(-100, 100) for _ in range(batch)]
+        vxs = [rng.uniform(-3, 3) for _ in range(batch)]
+        vys = [rng.uniform(-3, 3) for _ in range(batch)]
+        # 寿命恰好等于dt的粒子在一步后life正好为0，也算死亡
+        lives = [rng.choice((rng.uniform(0.01, 0.2), rng.uniform(0.5, 5), 0.1))
+                 for _ in range(batch)]
+        # 用max_life给每个粒子一个唯一编号（float32可精确表示的整数）
+        tags = list(range(tag, tag + batch))
+        added = engine.emit(np.array(xs), np.array(ys), np.array(vxs), np.array(vys),
+                            np.array(lives), np.array(tags, dtype=np.float32), 2, color)
+        legacy.extend(LegacyParticle(*args) for args in
+                      zip(xs[:added], ys[:added], vxs[:added], vys[:added], lives[:added], tags))
+        tag += batch
+
+        dt = rng.choice((1 / 60, 1 / 30, 0.1))
+        engine.update(dt)
+        for p in legacy:
+            p.x += p.vx * dt
+            p.y += p.vy * dt
+            p.life -= dt
+        legacy = [p for p in legacy if p.life > 0]
+
+        n = engine.count
+        assert n == len(legacy)
+        order = np.argsort(engine.max_life[:n])
+        expected = sorted(legacy, key=lambda p: p.tag)
+        assert engine.max_life[:n][order].tolist() == [float(p.tag) for p in expected]
+        assert np.array_equal(engine.life[:n][order], [p.life for p in expected])
+        assert np.array_equal(engine.pos[:n][order], [(p.x, p.y) for p in expected])
+        assert np.array_equal(engine.vel[:n][order], [(p.vx, p.vy) for p in expected])
+    assert engine.dropped > 0
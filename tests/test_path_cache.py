@@ -0,0 +1,99 @@
+"""
+PathCache失败结果的依赖范围：只取搜索实际展开过的区块，校验时不生成区块
+
+用法:
+    python -m pytest tests/test_path_cache.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_manager import ChunkManager
+from core.collision_pathfinder import CollisionPathfinder
+from core.path_cache import MAX_FAILURE_CHUNKS
+
+
+def walled_in_start(chunk_manager, radius=3):
+    """出生点四周围一圈山，从里面出发的寻路必然失败（出生点周围9宫格已加载，与游戏中一致）"""
+    sx, sy = chunk_manager.find_spawn_point(50, 50)
+    chunk_manager.update_loaded_chunks(sx, sy)
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            if max(abs(dx), abs(dy)) == radius:
+                chunk_manager.set_tile(sx + dx, sy + dy, 'mountain')
+    return sx, sy
+
+
+def far_walkable(chunk_manager, x, y):
+    while not chunk_manager.is_walkable(x, y):
+        x += 1
+    return x, y
+
+
+def test_failed_long_range_query_generates_no_chunks():
+    chunk_manager = ChunkManager(seed=42)
+    pathfinder = CollisionPathfinder(chunk_manager)
+    sx, sy = walled_in_start(chunk_manager)
+    gx, gy = far_walkable(chunk_manager, sx + 200, sy)
+    generated = chunk_manager.stats.generated
+
+    assert pathfinder.find_path(sx, sy, gx, gy, max_distance=10 ** 6) == []
+    assert chunk_manager.stats.generated == generated
+
+    # 失败结果已缓存，依赖的区块数很少；再查一次命中缓存，同样不生成区块
+    entry = pathfinder.cache.paths[((sx, sy), (gx, gy), 10 ** 6)]
+    assert len(entry.chunks) <= MAX_FAILURE_CHUNKS
+    assert pathfinder.find_path(sx, sy, gx, gy, max_distance=10 ** 6) == []
+    assert pathfinder.cache.hits == 1
+    assert chunk_manager.stats.generated == generated
+
+
+def test_failed_query_invalidated_when_searched_area_changes():
+    chunk_manager = ChunkManager(seed=42)
+    pathfinder = CollisionPathfinder(chunk_manager)
+    sx, sy = walled_in_start(chunk_manager)
+    gx, gy = far_walkable(chunk_manager, sx + 200, sy)
+    pathfinder.find_path(sx, sy, gx, gy, max_distance=10 ** 6)
+
+    chunk_manager.set_tile(sx + 3, sy, 'grass')
+    assert pathfinder.cache.lookup((sx, sy), (gx, gy), 10 ** 6) is None
+    assert pathfinder.cache.invalidated == 1
+
+
+def test_subpath_reuse_respects_max_distance():
+    chunk_manager = ChunkManager(seed=42)
+    pathfinder = CollisionPathfinder(chunk_manager)
+    sx, sy = chunk_manager.find_spawn_point(50, 50)
+    gx, gy = far_walkable(chunk_manager, sx + 40, sy)
+    path = pathfinder.find_path(sx, sy, gx, gy, max_distance=10 ** 6)
+    assert len(path) > 20
+    costs = pathfinder._path_costs(path)
+
+    # 沿缓存路径的一段：代价足够时复用子段，max_distance更小时必须重新搜索
+    a, b = path[2], path[20]
+    assert pathfinder.cache.lookup(a, b, costs[19] - costs[2]) == path[2:21]
+    assert pathfinder.cache.lookup(a, b, costs[19] - costs[2] - 0.01) is None
+
+
+def test_flow_field_built_as_background_job():
+    from core.path_scheduler import PathScheduler
+
+    chunk_manager = ChunkManager(seed=42)
+    pathfinder = CollisionPathfinder(chunk_manager)
+    pathfinder.cache.flow_threshold = 1
+    scheduler = PathScheduler(pathfinder, slice_budget=1)
+    sx, sy = chunk_manager.find_spawn_point(50, 50)
+    gx, gy = far_walkable(chunk_manager, sx + 6, sy)
+    results = []
+    scheduler.submit('a', (sx, sy), [(gx, gy)], results.append)
+
+    # 请求完成时流场还没开始建，之后用空闲分片建好
+    while not results:
+        scheduler.update()
+    assert results[0] and not pathfinder.cache.flow_fields
+    assert scheduler.get_stats()['background'] == 1
+    while scheduler.get_stats()['background']:
+        scheduler.update()
+    assert len(pathfinder.cache.flow_fields) == 1
@@ -0,0 +1,73 @@
+"""
+PathWorkerPool的死亡进程检测：崩溃进程手上的请求重新排队，进程全部死掉时以空路径回调
+
+用法:
+    python -m pytest tests/test_path_workers.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunk_manager import ChunkManager
+from core.path_workers import PathWorkerPool
+
+
+def kill(process):
+    process.terminate()
+    process.join(timeout=5.0)
+
+
+def submit_all(pool, count=6):
+    results = {}
+    for i in range(count):
+        pool.submit(i, (i, 0), [(i + 5, 3)], lambda path, i=i: results.__setitem__(i, path))
+    return results
+
+
+def test_requests_of_a_dead_worker_are_requeued():
+    pool = PathWorkerPool(ChunkManager(seed=42), workers=2, batch_size=2, use_cache=False)
+    try:
+        results = submit_all(pool)
+        pool._dispatch()
+        assert any(request.worker == 0 for request in pool.requests.values())
+        kill(pool.processes[0])
+
+        pool.wait(timeout=60)
+        assert pool.dead_workers == 1
+        assert pool.failed == 0
+        assert sorted(results) == list(range(6))
+        assert all(len(path) > 1 for path in results.values())
+    finally:
+        pool.shutdown()
+
+
+def test_all_workers_dead_fails_pending_requests():
+    pool = PathWorkerPool(ChunkManager(seed=42), workers=1, use_cache=False)
+    try:
+        kill(pool.processes[0])
+        results = submit_all(pool)
+        pool.update()
+        assert results == {i: [] for i in range(6)}
+        assert pool.failed == 6
+        assert not pool.pending
+    finally:
+        pool.shutdown()
+
+
+def test_only_edited_chunks_are_broadcast():
+    chunk_manager = ChunkManager(seed=42)
+    chunk_manager.update_loaded_chunks(0, 0)
+    pool = PathWorkerPool(chunk_manager, workers=1, use_cache=False)
+    try:
+        assert pool.sync_chunks() == 0
+        chunk_manager.set_tile(3, 3, 'mountain')
+        chunk_manager.set_tile(4, 3, 'mountain')
+        assert pool.dirty == {(0, 0)}
+        assert pool.sync_chunks() == 1
+        assert not pool.dirty
+        assert pool.sync_chunks() == 0
+    finally:
+        pool.shutdown()
+    assert not chunk_manager.edit_listeners
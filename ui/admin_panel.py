@@ -49,11 +49,12 @@ class AdminPanel:
         # 转换到世界坐标
         world_x, world_y = self.camera.screen_to_world(screen_x, screen_y, screen_width, screen_height)
         
-        # 查找点击位置的AI
-        for agent in self.world.agents.values():
-            if abs(agent.x - world_x) <= 1 and abs(agent.y - world_y) <= 1:
-                self.selected_agent = agent
-                return
+        # 查找点击位置1格内最近的AI（空间索引只查附近的桶），跳过已移除或死亡的
+        hits = self.world.agent_index.nearest(world_x, world_y, 1, max_radius=1)
+        agent = self.world.agents.get(hits[0]) if hits else None
+        if agent is not None and agent.alive:
+            self.selected_agent = agent
+            return
                 
         # 点击空白处，显示地形信息
         self.selected_agent = None
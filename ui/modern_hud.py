@@ -7,6 +7,8 @@ import pygame
 import math
 from typing import Dict
 
+from ui.text_cache import CachedFont
+
 class ModernHUD:
     """现代风格HUD"""
     
@@ -14,11 +16,11 @@ class ModernHUD:
         self.screen_width = screen_width
         self.screen_height = screen_height
         
-        # 字体
-        self.font_small = pygame.font.SysFont('microsoftyahei', 11)
-        self.font = pygame.font.SysFont('microsoftyahei', 13, bold=True)
-        self.font_large = pygame.font.SysFont('microsoftyahei', 16, bold=True)
-        self.font_title = pygame.font.SysFont('microsoftyahei', 20, bold=True)
+        # 字体（文字Surface经共享缓存，数值不变时不重新渲染）
+        self.font_small = CachedFont('microsoftyahei', 11)
+        self.font = CachedFont('microsoftyahei', 13, bold=True)
+        self.font_large = CachedFont('microsoftyahei', 16, bold=True)
+        self.font_title = CachedFont('microsoftyahei', 20, bold=True)
         
         # 颜色主题
         self.theme = {
@@ -0,0 +1,67 @@
+"""
+Profiler Overlay - 帧耗时叠加层
+右上角显示FrameProfiler滚动窗口内各阶段的平均/最大耗时，条形长度按16.7ms（60FPS一帧）归一
+阶段名经共享文字缓存；每帧都在变的数值直接用同一个Font渲染，不占缓存；半透明底板按高度缓存
+"""
+
+from typing import Dict
+
+import pygame
+
+from core.profiler import FrameProfiler
+from ui.text_cache import CachedFont
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class ProfilerOverlay:
+    """帧耗时叠加层"""
+
+    def __init__(self, profiler: FrameProfiler, width: int = 380):
+        self.profiler = profiler
+        self.width = width
+        self.font = CachedFont('microsoftyahei', 12)
+        self.line_height = 16
+        self._panels: Dict[int, pygame.Surface] = {}  # 高度 -> 底板
+
+    def render(self, screen: pygame.Surface):
+        stats = self.profiler.get_stats()
+        if not stats:
+            return
+        height = (len(stats) + 1) * self.line_height + 10
+        # 右上角时间面板下方
+        x = screen.get_width() - self.width - 10
+        y = 110
+
+        panel = self._panels.get(height)
+        if panel is None:
+            panel = pygame.Surface((self.width, height), pygame.SRCALPHA)
+            panel.fill((0, 0, 0, 170))
+            self._panels[height] = panel
+        screen.blit(panel, (x, y))
+
+        screen.blit(self.font.render("帧耗时 (ms, 平均/最大)", True, (255, 215, 0)), (x + 6, y + 5))
+        if self.profiler.tracing:
+            recording = self.font.font.render(f"REC 录制中 {len(self.profiler.trace_events)}",
+                                              True, (255, 80, 80))
+            screen.blit(recording, (x + self.width - 6 - recording.get_width(), y + 5))
+
+        bar_x = x + 240
+        bar_w = self.width - 250
+        for i, (name, value) in enumerate(stats.items()):
+            line_y = y + 5 + (i + 1) * self.line_height
+            color = (255, 255, 255) if name == 'frame' else (200, 210, 220)
+            screen.blit(self.font.render(name, True, color), (x + 6, line_y))
+            # 数值右对齐到条形左侧
+            numbers = self.font.font.render(f"{value['avg']:.2f} / {value['max']:.2f}", True, color)
+            screen.blit(numbers, (bar_x - 8 - numbers.get_width(), line_y))
+
+            fill = min(1.0, value['avg'] / FRAME_BUDGET_MS)
+            if fill > 0.5:
+                bar_color = (255, 80, 80)
+            elif fill > 0.2:
+                bar_color = (255, 220, 80)
+            else:
+                bar_color = (100, 255, 100)
+            pygame.draw.rect(screen, (50, 50, 60), (bar_x, line_y + 4, bar_w, 6))
+            pygame.draw.rect(screen, bar_color, (bar_x, line_y + 4, int(bar_w * fill), 6))
@@ -0,0 +1,134 @@
+"""
+Text Cache - 字体与文字Surface缓存
+每个(字体, 字号, 粗体, 斜体)只创建一个Font；渲染好的文字（含描边合成后的结果）按
+(字体, 文字, 颜色, 描边) 缓存在LRU里，同一文字每帧只需一次blit
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+DEFAULT_FACE = 'microsoftyahei'
+
+FontKey = Tuple[str, int, bool, bool]
+Color = Tuple[int, ...]
+
+
+class TextCache:
+    """Font实例 + 文字Surface的LRU缓存
+
+    返回的Surface由缓存共享，调用方只能blit，不要在上面绘制或set_alpha
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.fonts: Dict[FontKey, pygame.font.Font] = {}
+        self.max_entries = max_entries
+        self.surfaces: Dict[tuple, pygame.Surface] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_font(self, key: FontKey) -> pygame.font.Font:
+        font = self.fonts.get(key)
+        if font is None:
+            face, size, bold, italic = key
+            font = pygame.font.SysFont(face, size, bold=bold, italic=italic)
+            self.fonts[key] = font
+        return font
+
+    def render(self, key: FontKey, text: str, color: Color, antialias: bool = True,
+               outline_color: Optional[Color] = None, outline_width: int = 1,
+               diagonal: bool = True) -> pygame.Surface:
+        """渲染文字（有outline_color时合成描边，文字位于(outline_width, outline_width)）
+
+        diagonal=False时只向上下左右四个方向描边
+        """
+        cache_key = (key, text, tuple(color), antialias, outline_color and tuple(outline_color),
+                     outline_width, diagonal)
+        surface = self.surfaces.get(cache_key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(cache_key)
+            return surface
+
+        self.misses += 1
+        font = self.get_font(key)
+        surface = font.render(text, antialias, color)
+        if outline_color is not None:
+            surface = self._compose_outline(font, text, surface, antialias, outline_color,
+                                            outline_width, diagonal)
+        self.surfaces[cache_key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    @staticmethod
+    def _compose_outline(font, text, text_surf, antialias, outline_color, width, diagonal):
+        """把描边文字按偏移画到透明Surface上，再盖上主文字"""
+        w, h = text_surf.get_size()
+        composed = pygame.Surface((w + width * 2, h + width * 2), pygame.SRCALPHA)
+        outline = font.render(text, antialias, outline_color)
+        for dx in range(-width, width + 1):
+            for dy in range(-width, width + 1):
+                if (dx or dy) and (diagonal or not (dx and dy)):
+                    composed.blit(outline, (width + dx, width + dy))
+        composed.blit(text_surf, (width, width))
+        return composed
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'fonts': len(self.fonts),
+            'surfaces': len(self.surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+_shared_cache: Optional[TextCache] = None
+
+
+def get_text_cache() -> TextCache:
+    """全局共享的文字缓存（第一次使用时创建，此时pygame.font须已初始化）"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TextCache()
+    return _shared_cache
+
+
+class CachedFont:
+    """与pygame.font.Font的render接口相同，但经过共享的TextCache"""
+
+    def __init__(self, face: str = DEFAULT_FACE, size: int = 12, bold: bool = False,
+                 italic: bool = False, cache: TextCache = None):
+        self.key: FontKey = (face, size, bold, italic)
+        self.cache = cache or get_text_cache()
+        self.font = self.cache.get_font(self.key)
+
+    def render(self, text: str, antialias: bool, color: Color,
+               background: Optional[Color] = None) -> pygame.Surface:
+        if background is not None:
+            return self.font.render(text, antialias, color, background)
+        return self.cache.render(self.key, text, color, antialias)
+
+    def render_outlined(self, text: str, color: Color, outline_color: Color = (0, 0, 0),
+                        width: int = 1, diagonal: bool = True) -> pygame.Surface:
+        """带描边的文字（整块缓存），宽高比原文字各多2*width"""
+        return self.cache.render(self.key, text, color, True, outline_color, width, diagonal)
+
+    def size(self, text: str) -> Tuple[int, int]:
+        return self.font.size(text)
+
+    def get_height(self) -> int:
+        return self.font.get_height()
+
+    def get_linesize(self) -> int:
+        return self.font.get_linesize()
@@ -1,18 +1,21 @@
 """
 Thought Bubble - AI内心独白气泡（清晰版）
 大号字体 + 白色描边 + 深色背景
+整个气泡（背景、边框、文字）按当前文字合成一次，淡入淡出只改Surface的alpha
 """
 
 import pygame
 import math
 import time
 
+from ui.text_cache import CachedFont
+
 class ThoughtBubble:
     """AI内心独白气泡 - 清晰易读版"""
     
     def __init__(self):
         # 大号字体
-        self.font = pygame.font.SysFont('microsoftyahei', 18, bold=True)
+        self.font = CachedFont('microsoftyahei', 18, bold=True)
         self.text = ""
         self.color = (60, 60, 70, 220)  # 深色半透明背景
         self.alpha = 0
@@ -20,6 +23,11 @@ class ThoughtBubble:
         self.float_offset = 0
         self.last_update = time.time()
         
+        # 合成好的气泡（文字改变时才重建）
+        self._bubble: pygame.Surface = None
+        self._bubble_text = None
+        self.rebuilds = 0
+        
     def update(self, dt: float, thought_text: str):
         """更新气泡"""
         self.text = thought_text
@@ -41,11 +49,25 @@ class ThoughtBubble:
         if self.alpha <= 0 or not self.text:
             return
             
+        bubble = self._get_bubble()
+        bubble.set_alpha(int(self.alpha))
+        
         # 气泡位置：AI头顶上方50像素，带浮动
-        bubble_y = y - 55 + self.float_offset
+        bubble_x = x - bubble.get_width() // 2
+        bubble_y = y - 55 + self.float_offset - bubble.get_height()
+        screen.blit(bubble, (bubble_x, bubble_y))
+        
+    def _get_bubble(self) -> pygame.Surface:
+        if self._bubble is None or self._bubble_text != self.text:
+            self._bubble = self._compose_bubble(self.text)
+            self._bubble_text = self.text
+            self.rebuilds += 1
+        return self._bubble
         
+    def _compose_bubble(self, text: str) -> pygame.Surface:
+        """以完全不透明（alpha=255）时的样子合成整个气泡"""
         # 渲染文字（带描边）
-        text_surf = self._render_text_with_outline(self.text, (255, 255, 255), (0, 0, 0), 2)
+        text_surf = self._render_text_with_outline(text, (255, 255, 255), (0, 0, 0), 2)
         text_w = text_surf.get_width()
         text_h = text_surf.get_height()
         
@@ -54,49 +76,27 @@ class ThoughtBubble:
         padding_y = 8
         bubble_w = text_w + padding_x * 2
         bubble_h = text_h + padding_y * 2
-        bubble_x = x - bubble_w // 2
-        bubble_y = bubble_y - bubble_h
         
-        # 绘制气泡背景（深色半透明）
-        bg_color = (40, 40, 50, int(220 * self.alpha / 255))
+        # 气泡背景（深色半透明）
         bubble_surf = pygame.Surface((bubble_w, bubble_h), pygame.SRCALPHA)
-        pygame.draw.rect(bubble_surf, bg_color, (0, 0, bubble_w, bubble_h), border_radius=10)
+        pygame.draw.rect(bubble_surf, (40, 40, 50, 220), (0, 0, bubble_w, bubble_h), border_radius=10)
         
         # 气泡边框
-        border_color = (100, 100, 120, int(150 * self.alpha / 255))
+        border_color = (100, 100, 120, 150)
         pygame.draw.rect(bubble_surf, border_color, (0, 0, bubble_w, bubble_h), width=2, border_radius=10)
         
         # 小尾巴
-        tail_color = (40, 40, 50, int(220 * self.alpha / 255))
         tail_points = [
             (bubble_w // 2 - 8, bubble_h),
             (bubble_w // 2 + 8, bubble_h),
             (bubble_w // 2, bubble_h + 10)
         ]
-        pygame.draw.polygon(bubble_surf, tail_color, tail_points)
+        pygame.draw.polygon(bubble_surf, (40, 40, 50, 220), tail_points)
         pygame.draw.polygon(bubble_surf, border_color, tail_points, width=1)
         
-        # 绘制
-        screen.blit(bubble_surf, (bubble_x, bubble_y))
-        screen.blit(text_surf, (bubble_x + padding_x, bubble_y + padding_y))
+        bubble_surf.blit(text_surf, (padding_x, padding_y))
+        return bubble_surf
         
     def _render_text_with_outline(self, text: str, text_color: tuple, outline_color: tuple, outline_width: int) -> pygame.Surface:
-        """渲染带描边的文字"""
-        # 主文字
-        text_surf = self.font.render(text, True, text_color)
-        
-        # 创建带描边的表面
-        w, h = text_surf.get_size()
-        outline_surf = pygame.Surface((w + outline_width * 2, h + outline_width * 2), pygame.SRCALPHA)
-        
-        # 绘制描边（8个方向）
-        outline_text = self.font.render(text, True, outline_color)
-        for dx in range(-outline_width, outline_width + 1):
-            for dy in range(-outline_width, outline_width + 1):
-                if dx != 0 or dy != 0:
-                    outline_surf.blit(outline_text, (outline_width + dx, outline_width + dy))
-        
-        # 绘制主文字
-        outline_surf.blit(text_surf, (outline_width, outline_width))
-        
-        return outline_surf
+        """渲染带描边的文字（8个方向，合成结果由共享文字缓存保存）"""
+        return self.font.render_outlined(text, text_color, outline_color, outline_width)
@@ -13,6 +13,7 @@ from dataclasses import dataclass
 import sys
 sys.path.insert(0, '/root/.openclaw/workspace/another-you-eco')
 from main_v3 import PureWorld, PureAgent, PhysicalObject, PHYSICS
+from core.spatial_hash import SpatialHash
 
 # Pygame配置
 SCREEN_WIDTH = 1400
@@ -69,6 +70,10 @@ class Camera:
         screen_x = int(world_x * 20 * self.zoom - self.x)
         screen_y = int(world_y * 20 * self.zoom - self.y)
         return screen_x, screen_y
+        
+    def screen_to_world(self, screen_x: int, screen_y: int) -> Tuple[float, float]:
+        """屏幕坐标转世界坐标"""
+        return ((screen_x + self.x) / (20 * self.zoom), (screen_y + self.y) / (20 * self.zoom))
 
 
 class Visualizer:
@@ -93,6 +98,10 @@ class Visualizer:
         # 轨迹记录
         self.trails: Dict[str, List[Tuple[int, int]]] = {}
         
+        # AI位置索引（按id），点选时只查附近的桶；只收录存活的AI
+        self.agent_index = SpatialHash(8.0)
+        self.sync_agent_index()
+        
         # 统计
         self.stats_history = []
         
@@ -149,15 +158,35 @@ class Visualizer:
             
         return True
     
+    def add_agent(self, agent):
+        """加入AI并登记位置（世界自带add_agent时交给它，如LivingWorld）"""
+        add = getattr(self.world, 'add_agent', None)
+        if add is not None:
+            add(agent)
+        else:
+            self.world.agents[agent.id] = agent
+        self.agent_index.update(agent.id, agent.x, agent.y)
+        
+    def sync_agent_index(self):
+        """让索引与world.agents一致：存活的更新位置，死亡或已移除的从索引中去掉"""
+        agents = self.world.agents
+        for agent_id in list(self.agent_index.cell_of):
+            agent = agents.get(agent_id)
+            if agent is None or not agent.alive:
+                self.agent_index.remove(agent_id)
+        for agent in agents.values():
+            if agent.alive:
+                self.agent_index.update(agent.id, agent.x, agent.y)
+        
     def _select_agent_at(self, screen_x: int, screen_y: int):
         """选择点击位置的AI"""
-        for agent in self.world.agents.values():
-            ax, ay = self.camera.world_to_screen(agent.x, agent.y)
-            dist = ((ax - screen_x)**2 + (ay - screen_y)**2) ** 0.5
-            if dist < 15:
-                self.selected_agent = agent
-                self.camera.follow(agent)
-                return
+        world_x, world_y = self.camera.screen_to_world(screen_x, screen_y)
+        hits = self.agent_index.nearest(world_x, world_y, 1, max_radius=15 / (20 * self.camera.zoom))
+        agent = self.world.agents.get(hits[0]) if hits else None
+        if agent is not None:
+            self.selected_agent = agent
+            self.camera.follow(agent)
+            return
         self.selected_agent = None
         
     def update(self):
@@ -166,6 +195,7 @@ class Visualizer:
             # 更新世界多次（根据速度）
             for _ in range(self.speed):
                 self.world.update()
+                self.sync_agent_index()
                 
                 # 记录轨迹
                 for agent in self.world.agents.values():
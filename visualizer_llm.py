@@ -12,6 +12,7 @@ from typing import Dict, List, Tuple
 import sys
 sys.path.insert(0, '/root/.openclaw/workspace/another-you-eco')
 from main_v3_llm import PureWorld, PureAgent, PHYSICS
+from core.spatial_hash import SpatialHash
 
 # Pygame配置
 SCREEN_WIDTH = 1400
@@ -63,6 +64,30 @@ class LLMVisualizer:
         # 轨迹
         self.trails: Dict[str, List[Tuple[int, int]]] = {}
         
+        # AI位置索引（按id），点选时只查附近的桶；只收录存活的AI
+        self.agent_index = SpatialHash(8.0)
+        self.sync_agent_index()
+        
+    def add_agent(self, agent):
+        """加入AI并登记位置（世界自带add_agent时交给它，如LivingWorld）"""
+        add = getattr(self.world, 'add_agent', None)
+        if add is not None:
+            add(agent)
+        else:
+            self.world.agents[agent.id] = agent
+        self.agent_index.update(agent.id, agent.x, agent.y)
+        
+    def sync_agent_index(self):
+        """让索引与world.agents一致：存活的更新位置，死亡或已移除的从索引中去掉"""
+        agents = self.world.agents
+        for agent_id in list(self.agent_index.cell_of):
+            agent = agents.get(agent_id)
+            if agent is None or not agent.alive:
+                self.agent_index.remove(agent_id)
+        for agent in agents.values():
+            if agent.alive:
+                self.agent_index.update(agent.id, agent.x, agent.y)
+        
     def world_to_screen(self, wx: int, wy: int) -> Tuple[int, int]:
         """世界坐标转屏幕坐标"""
         sx = int(wx * 20 * self.camera['zoom'] - self.camera['x'])
@@ -93,13 +118,12 @@ class LLMVisualizer:
         return True
     
     def _select_agent(self, mx: int, my: int):
-        """选择AI"""
-        for agent in self.world.agents.values():
-            ax, ay = self.world_to_screen(agent.x, agent.y)
-            if (ax - mx) ** 2 + (ay - my) ** 2 < 400:
-                self.selected_agent = agent
-                return
-        self.selected_agent = None
+        """选择AI（点击位置20像素内最近的一个）"""
+        scale = 20 * self.camera['zoom']
+        world_x = (mx + self.camera['x']) / scale
+        world_y = (my + self.camera['y']) / scale
+        hits = self.agent_index.nearest(world_x, world_y, 1, max_radius=20 / scale)
+        self.selected_agent = self.world.agents.get(hits[0]) if hits else None
         
     async def update(self):
         """更新"""
@@ -119,6 +143,7 @@ class LLMVisualizer:
                         if len(self.trails[agent.id]) > 50:
                             self.trails[agent.id].pop(0)
                             
+                self.sync_agent_index()
                 self.world.tick += 1
                 
     def render(self):
@@ -263,13 +288,12 @@ class LLMVisualizer:
 
 async def main():
     world = PureWorld()
+    visualizer = LLMVisualizer(world)
     
     # 创建几个AI
     for i in range(3):
-        agent = PureAgent(f"llm_agent_{i}", world)
-        world.agents[agent.id] = agent
+        visualizer.add_agent(PureAgent(f"llm_agent_{i}", world))
     
-    visualizer = LLMVisualizer(world)
     await visualizer.run()
 
 